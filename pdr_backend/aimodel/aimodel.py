@@ -4,6 +4,7 @@ from enforce_typing import enforce_types
 import numpy as np
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.inspection import permutation_importance
+from xgboost import XGBClassifier, XGBRegressor
 
 
 class Aimodel:
@@ -20,9 +21,16 @@ class Aimodel:
         self._sk_regrs = sk_regrs  # list of sklearn regressor model
         self._y_thr = y_thr  # threshold value for True vs False
         self._sk_classif = sk_classif  # sklearn classifier model
-        self._imps_tup = None  # tuple of (imps_avg, imps_stddev)
+        self._imps_tup: Optional[tuple] = None  # tuple of (imps_avg, imps_stddev)
+        self._imps_inputs: Optional[dict] = None  # for lazy calc of _imps_tup
         self._ycont_offset = 0.0  # offset to the output of regression
 
+    def __getstate__(self):
+        # pending importance inputs hold training data. Don't pickle them
+        state = self.__dict__.copy()
+        state["_imps_inputs"] = None
+        return state
+
     @property
     def do_regr(self) -> bool:
         return self._sk_regrs is not None
@@ -58,22 +66,47 @@ class Aimodel:
         @return
           yptrue - 1d array of [sample_i]: prob_of_being_true -- model outputs
         """
+        yptrue, _ = self._predict_ptrue_ycont(X)
+        return yptrue
+
+    @enforce_types
+    def predict_ptrue_ycont(self, X: np.ndarray) -> tuple:
+        """
+        @description
+          Batch prediction of both classifier & regressor outputs, for many
+          samples at once. Inputs are scaled once, and regressors run once.
+          Use this to score many rows with an unchanged model, eg the
+          walk-forward test rows between retrains in the sim.
+
+        @arguments
+          X -- 2d array of [sample_i, var_i]:cont_value -- model inputs
+
+        @return
+          yptrue - 1d array of [sample_i]: prob_of_being_true -- model outputs
+          ycont -- 1d array of [sample_i]:cont_value -- regressor outputs.
+            None if not do_regr
+        """
+        return self._predict_ptrue_ycont(X)
+
+    def _predict_ptrue_ycont(self, X: np.ndarray) -> tuple:
+        """Like predict_ptrue_ycont(), without type-checking overhead"""
+        ycont = None
         if self.do_regr:
             Ycont = self._predict_Ycont(X)
             assert self._y_thr is not None
             yptrue = np.mean(Ycont > self._y_thr, axis=1)
+            ycont = np.mean(Ycont, axis=1)
         else:
-            X = self._scaler.transform(X)
+            X_tr = self._scaler.transform(X)
             if hasattr(self._sk_classif, "_predict_proba_lr"):
-                T = self._sk_classif._predict_proba_lr(X)  # required for LinearSVC()
+                T = self._sk_classif._predict_proba_lr(X_tr)  # for LinearSVC()
             else:
-                T = self._sk_classif.predict_proba(X)  # [sample_i][class_i]
-            N = T.shape[0]
+                T = self._sk_classif.predict_proba(X_tr)  # [sample_i][class_i]
             class_i = 1  # this is the class for "True"
-            yptrue = np.array([T[i, class_i] for i in range(N)])
+            yptrue = T[:, class_i]
 
         assert len(yptrue) == X.shape[0]
-        return yptrue
+        return yptrue, ycont
 
     @enforce_types
     def predict_ycont(self, X):
@@ -93,7 +126,6 @@ class Aimodel:
         assert len(ycont) == X.shape[0]
         return ycont
 
-    @enforce_types
     def _predict_Ycont(self, X):
         """
         @description
@@ -118,41 +150,98 @@ class Aimodel:
     def set_ycont_offset(self, ycont_offset: float):
         self._ycont_offset = ycont_offset
 
+    @property
+    def has_importance_per_var(self) -> bool:
+        """Can importance_per_var() be called? (Computed or pending)"""
+        return self._imps_tup is not None or self._imps_inputs is not None
+
     @enforce_types
     def importance_per_var(self, include_stddev: bool = False):
         """
         @description
-          Report relative importance of each input variable
+          Report relative importance of each input variable.
+          Computed lazily on first call, then cached for this model.
 
         @return
           imps_avg - 1d array of [var_i]: rel_importance_float
           (optional) imps_stddev -- array [var_i]: rel_stddev_float
         """
-        assert self._imps_tup is not None
+        if self._imps_tup is None:
+            assert self._imps_inputs is not None, "must set importances first"
+            self._imps_tup = self._calc_importance_per_var(**self._imps_inputs)
+            self._imps_inputs = None  # free memory
+
         if include_stddev:
             return self._imps_tup
         return self._imps_tup[0]
 
+    # pylint: disable=too-many-positional-arguments
     @enforce_types
-    def set_importance_per_var(self, X: np.ndarray, y: np.ndarray):
+    def set_importance_per_var(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        method: str = "Auto",
+        n_repeats: int = 10,
+        max_samples: int = 1000,
+        seed: Optional[int] = None,
+    ):
         """
+        @description
+          Register the inputs to compute importances from. The (possibly
+          expensive) computation is deferred until importance_per_var().
+          Only a random subsample of max_samples rows of X & y is kept.
+
         @arguments
           X -- 2d array of [sample_i, var_i]:cont_value -- model inputs
           y -- 1d array of [sample_i]:value -- model outputs,
             where value is bool for classif (ytrue), or float for regr (ycont)
+          method -- "Auto" or "Permutation". See AimodelSS.calc_imps_method
+          n_repeats -- # repeats, for permutation importances
+          max_samples -- max # samples per repeat, for permutation importances
+          seed -- random seed, for permutation importances
 
         @return
-          <<sets self._imps_tup>>
+          <<sets self._imps_inputs, or self._imps_tup if y is constant>>
         """
-        assert not self._imps_tup, "have already set importances"
-        self._imps_tup = self._calc_importance_per_var(X, y)
+        assert not self.has_importance_per_var, "have already set importances"
+        if min(y) == max(y):  # constant: all vars equally (un)important
+            n = X.shape[1]
+            flat = np.ones(n, dtype=float) / n
+            self._imps_tup = (flat, flat.copy())
+            return
 
+        N = X.shape[0]
+        if N > max_samples:
+            rng = np.random.default_rng(seed)
+            I = np.sort(rng.choice(N, max_samples, replace=False))
+            X, y = X[I, :], y[I]
+
+        self._imps_inputs = {
+            "X": X,
+            "y": y,
+            "method": method,
+            "n_repeats": n_repeats,
+            "max_samples": max_samples,
+            "seed": seed,
+        }
+
+    # pylint: disable=too-many-positional-arguments,too-many-statements
     @enforce_types
-    def _calc_importance_per_var(self, X, y) -> tuple:
+    def _calc_importance_per_var(
+        self,
+        X,
+        y,
+        method: str = "Auto",
+        n_repeats: int = 10,
+        max_samples: int = 1000,
+        seed: Optional[int] = None,
+    ) -> tuple:
         """
         @arguments
           X -- 2d array of [sample_i, var_i]:cont_value -- model inputs
           y -- 1d array of [sample_i]:value -- model outputs
+          method, n_repeats, max_samples, seed -- see set_importance_per_var()
 
         @return
           imps_avg -- 1d array of [var_i]: rel_importance_float
@@ -183,7 +272,8 @@ class Aimodel:
             else:
                 models = [self._sk_classif]
 
-        if all(hasattr(model, "coef_") for model in models):
+        use_native = method == "Auto"
+        if use_native and all(hasattr(model, "coef_") for model in models):
             if self.do_regr:
                 assert self._sk_regrs is not None, "should have _sk_regrs"
                 coefs = np.mean([np.abs(regr.coef_) for regr in self._sk_regrs], axis=0)
@@ -197,13 +287,28 @@ class Aimodel:
 
             imps_avg = coefs / np.sum(coefs)
             imps_stddev = np.zeros_like(imps_avg)
+
+        elif use_native and all(
+            isinstance(m, (XGBClassifier, XGBRegressor)) for m in models
+        ):
+            # native xgboost importances: avg gain per split, for each var
+            gains = np.array([m.feature_importances_ for m in models], dtype=float)
+            _sum = np.sum(np.mean(gains, axis=0))
+            if _sum <= 0.0:  # no splits, so all vars have negligible importance
+                return flat_imps_avg, flat_imps_stddev
+
+            imps_avg = np.mean(gains, axis=0) / _sum
+            imps_stddev = np.std(gains, axis=0) / _sum
+
         else:
             imps_bunch = permutation_importance(
                 skm,
                 X,
                 y,
                 scoring=scoring,
-                n_repeats=30,  # magic number
+                n_repeats=n_repeats,
+                max_samples=min(max_samples, X.shape[0]),
+                random_state=seed,
             )
             imps_avg = imps_bunch.importances_mean
 
@@ -0,0 +1,217 @@
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import List, Optional, Tuple
+
+from enforce_typing import enforce_types
+import numpy as np
+
+from pdr_backend.aimodel.aimodel import Aimodel
+from pdr_backend.ppss.aimodel_ss import AimodelSS
+
+logger = logging.getLogger("aimodel_cache")
+
+# aimodel_ss fields that don't influence the fitted model
+_NON_FIT_KEYS = [
+    "cache_dir",
+    "cache_max_mb",
+    "calc_imps",
+    "calc_imps_method",
+    "calc_imps_n_repeats",
+    "calc_imps_max_samples",
+    "train_every_n_epochs",
+]
+
+
+class AimodelCache:
+    """
+    On-disk store of fitted Aimodels (scaler + estimators), keyed by a
+    fingerprint of the training inputs. Least-recently-used entries are
+    evicted once the total size exceeds max_bytes.
+
+    Safe for many threads & processes sharing one cache_dir: writes are
+    atomic, and a file that another process evicted counts as a miss.
+
+    Only identical inputs hit. So a predictoor bot that restarts in the
+    same epoch skips its cold retrain; but once a new candle has closed,
+    X has changed and the model is fit afresh anyway.
+    """
+
+    @enforce_types
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._approx_total_bytes: Optional[int] = None  # avoids rescans per save
+
+    @staticmethod
+    @enforce_types
+    def fingerprint(
+        aimodel_ss: AimodelSS,
+        X: np.ndarray,
+        ytrue: Optional[np.ndarray],
+        ycont: Optional[np.ndarray],
+        y_thr: Optional[float],
+    ) -> str:
+        """
+        @description
+          Cheap hash of everything that determines a fitted model:
+          the raw array buffers, the aimodel_ss fields, and the seed.
+
+        @return
+          key -- hex str
+        """
+        h = hashlib.blake2b(digest_size=20)
+        for arr in [X, ytrue, ycont]:
+            if arr is None:
+                h.update(b"None")
+                continue
+            arr = np.ascontiguousarray(arr)
+            h.update(f"{arr.dtype.str}{arr.shape}".encode())
+            h.update(arr.data)
+        h.update(repr(y_thr).encode())
+
+        d = {k: v for k, v in aimodel_ss.d.items() if k not in _NON_FIT_KEYS}
+        h.update(repr(sorted(d.items())).encode())
+        h.update(repr(aimodel_ss.seed).encode())
+        return h.hexdigest()
+
+    @enforce_types
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    @enforce_types
+    def load(self, key: str) -> Optional[Aimodel]:
+        """Return the cached model for this key, or None if a miss"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                record = pickle.load(f)
+            model = _record_to_model(record)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # eg truncated file from a killed process
+            logger.warning("Could not load cached model %s: %s", path, e)
+            _remove(path)
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used, for LRU
+        except FileNotFoundError:  # evicted by another process meanwhile
+            pass
+        return model
+
+    @enforce_types
+    def save(self, key: str, model: Aimodel):
+        """Store the model for this key, then evict LRU entries if needed"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # unique tmp file, so concurrent saves of the same key don't collide
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(
+                    _model_to_record(model), f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, path)  # atomic, so readers never see partials
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        if self._approx_total_bytes is None:
+            self._approx_total_bytes = self.total_bytes
+        else:
+            self._approx_total_bytes += _getsize(path)
+        if self._approx_total_bytes > self.max_bytes:
+            self.prune(self.max_bytes)
+
+    @enforce_types
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """
+        @return
+          entries -- list of (key, n_bytes, last_used_s), oldest first
+        """
+        if not os.path.exists(self.cache_dir):
+            return []
+
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".pkl"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, filename))
+            except FileNotFoundError:  # evicted by another process meanwhile
+                continue
+            entries.append((filename[: -len(".pkl")], st.st_size, st.st_mtime))
+        return sorted(entries, key=lambda e: e[2])
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(n_bytes for _, n_bytes, _ in self.entries())
+
+    @enforce_types
+    def prune(self, max_bytes: int) -> int:
+        """
+        @description
+          Evict least-recently-used entries until total size <= max_bytes
+
+        @return
+          n_evicted -- number of entries removed
+        """
+        entries = self.entries()
+        total = sum(n_bytes for _, n_bytes, _ in entries)
+        n_evicted = 0
+        for key, n_bytes, _ in entries:
+            if total <= max_bytes:
+                break
+            _remove(self._path(key))  # ok if another process beat us to it
+            total -= n_bytes
+            n_evicted += 1
+        self._approx_total_bytes = total
+
+        if n_evicted:
+            logger.info("Evicted %d cached models from %s", n_evicted, self.cache_dir)
+        return n_evicted
+
+
+def _model_to_record(model: Aimodel) -> dict:
+    """Just the fitted parts of a model: scaler & estimators. No data"""
+    # pylint: disable=protected-access
+    return {
+        "scaler": model._scaler,
+        "sk_regrs": model._sk_regrs,
+        "y_thr": model._y_thr,
+        "sk_classif": model._sk_classif,
+        "ycont_offset": model._ycont_offset,
+    }
+
+
+def _record_to_model(record: dict) -> Aimodel:
+    model = Aimodel(
+        record["scaler"], record["sk_regrs"], record["y_thr"], record["sk_classif"]
+    )
+    model.set_ycont_offset(float(record["ycont_offset"]))
+    return model
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _getsize(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+@lru_cache(maxsize=None)
+def get_aimodel_cache(cache_dir: str, max_bytes: int) -> AimodelCache:
+    """Process-wide AimodelCache per (cache_dir, max_bytes)"""
+    return AimodelCache(cache_dir, max_bytes)
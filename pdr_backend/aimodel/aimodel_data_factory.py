@@ -234,6 +234,18 @@ class AimodelDataFactory:
 
         return (cur_high, cur_low)
 
+    def get_highlows(
+        self, mergedohlcv_df: pl.DataFrame, feed: ArgFeed, testshifts: np.ndarray
+    ) -> tuple:
+        """Like get_highlow(), for many testshifts at once. Returns arrays"""
+        rows = len(mergedohlcv_df) - 2 - testshifts
+        high_col = f"{feed.exchange}:{feed.pair}:high"
+        low_col = f"{feed.exchange}:{feed.pair}:low"
+        cur_highs = mergedohlcv_df[high_col].to_numpy()[rows]
+        cur_lows = mergedohlcv_df[low_col].to_numpy()[rows]
+
+        return (cur_highs, cur_lows)
+
 
 @enforce_types
 def hist_col_name(feed: ArgFeed) -> str:
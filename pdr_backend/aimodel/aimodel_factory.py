@@ -24,6 +24,7 @@ from sklearn.svm import LinearSVC
 from xgboost import XGBClassifier, XGBRegressor
 
 from pdr_backend.aimodel.aimodel import Aimodel
+from pdr_backend.aimodel.aimodel_cache import AimodelCache, get_aimodel_cache
 from pdr_backend.ppss.aimodel_ss import AimodelSS
 
 logger = logging.getLogger("aimodel_factory")
@@ -59,12 +60,56 @@ class AimodelFactory:
         @return
           model -- Aimodel
         """
+        # reuse a model fit on identical inputs, if cached
+        cache, key = self._cache, None
+        if cache is not None:
+            key = AimodelCache.fingerprint(self.ss, X, ytrue, ycont, y_thr)
+            model = cache.load(key)
+            if model is not None:
+                logger.debug("Reuse cached model %s", key)
+                self._set_importances_of_cached(model, X, ytrue, ycont)
+                return model
+
         # regressor, wrapped by classifier
         if self.ss.do_regr:
-            return self._build_wrapped_regr(X, ycont, y_thr, show_warnings)  # type: ignore
+            model = self._build_wrapped_regr(X, ycont, y_thr, show_warnings)  # type: ignore
 
         # direct classifier
-        return self._build_direct_classif(X, ytrue, show_warnings)  # type: ignore
+        else:
+            model = self._build_direct_classif(X, ytrue, show_warnings)  # type: ignore
+
+        if cache is not None:
+            assert key is not None
+            cache.save(key, model)
+
+        return model
+
+    def _set_importances_of_cached(self, model: Aimodel, X, ytrue, ycont):
+        """Cached models hold no training data. Register it, for importances"""
+        ss = self.ss
+        if not ss.calc_imps:
+            return
+        if ss.do_regr:
+            X_imps, y_imps = X, ycont
+        else:
+            # the classifier was fit (& its importances taken) on scaled X
+            X_imps = model._scaler.transform(X)  # pylint: disable=protected-access
+            y_imps = ytrue
+        model.set_importance_per_var(
+            X_imps,
+            y_imps,
+            ss.calc_imps_method,
+            ss.calc_imps_n_repeats,
+            ss.calc_imps_max_samples,
+            ss.seed,
+        )
+
+    @property
+    def _cache(self) -> Optional[AimodelCache]:
+        if self.ss.cache_dir is None:
+            return None
+        max_bytes = int(self.ss.cache_max_mb * 1e6)
+        return get_aimodel_cache(self.ss.cache_dir, max_bytes)
 
     def _build_wrapped_regr(
         self,
@@ -126,9 +171,16 @@ class AimodelFactory:
             ycont_offset = current_yval - current_yvalhat
             model.set_ycont_offset(ycont_offset)
 
-        # variable importances
+        # variable importances. Lazy: only computed when first read
         if self.ss.calc_imps:
-            model.set_importance_per_var(X, ycont)
+            model.set_importance_per_var(
+                X,
+                ycont,
+                ss.calc_imps_method,
+                ss.calc_imps_n_repeats,
+                ss.calc_imps_max_samples,
+                ss.seed,
+            )
 
         # return
         return model
@@ -217,9 +269,16 @@ class AimodelFactory:
         # model
         model = Aimodel(scaler, None, None, sk_classif)
 
-        # variable importances
+        # variable importances. Lazy: only computed when first read
         if self.ss.calc_imps:
-            model.set_importance_per_var(X, ytrue)
+            model.set_importance_per_var(
+                X,
+                ytrue,
+                ss.calc_imps_method,
+                ss.calc_imps_n_repeats,
+                ss.calc_imps_max_samples,
+                ss.seed,
+            )
 
         # return
         return model
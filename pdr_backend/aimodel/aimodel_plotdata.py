@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from enforce_typing import enforce_types
 import numpy as np
@@ -21,6 +21,7 @@ class AimodelPlotdata:
         colnames: List[str],
         slicing_x: np.ndarray,
         sweep_vars: Optional[List[int]] = None,
+        resolution: int = 200,
     ):
         """
         @arguments
@@ -34,6 +35,7 @@ class AimodelPlotdata:
           sweep_vars -- list with [sweepvar_i] or [sweepvar_i, sweepvar_j]
             -- If 1 entry, do line plot (1 var), where y-axis is response
             -- If 2 entries, do contour plot (2 vars), where z-axis is response
+          resolution -- # mesh points per swept var, for the model response
         """
 
         # preconditions
@@ -44,6 +46,7 @@ class AimodelPlotdata:
         if ycont_train is not None:
             assert ycont_train.shape[0] == N, (ycont_train.shape[0], N)
         assert sweep_vars is None or len(sweep_vars) in [1, 2]
+        assert resolution >= 2
 
         # set values
         self.model = model
@@ -54,6 +57,10 @@ class AimodelPlotdata:
         self.colnames = colnames
         self.slicing_x = slicing_x
         self.sweep_vars = sweep_vars
+        self.resolution = resolution
+
+        # computed lazily, per choice of swept vars. See self.response
+        self._responses: Dict[Tuple[int, ...], AimodelResponse] = {}
 
     @property
     @enforce_types
@@ -72,3 +79,109 @@ class AimodelPlotdata:
             return 1
 
         return len(self.sweep_vars)
+
+    @property
+    def chosen_I(self) -> List[int]:
+        """
+        Indices of the vars that the response plot sweeps:
+        1 var for a line plot, 2 vars for a contour plot
+        """
+        if self.n == 1:
+            return [0]
+
+        if self.n_sweep == 1:
+            if self.sweep_vars is not None and len(self.sweep_vars) >= 1:
+                return [self.sweep_vars[0]]
+            imps = self.model.importance_per_var()
+            return [int(np.argsort(imps)[::-1][0])]
+
+        assert self.n >= 2
+        if self.n == 2:
+            return [0, 1]
+        if self.sweep_vars is not None and len(self.sweep_vars) >= 2:
+            return list(self.sweep_vars)[:2]
+        imps = self.model.importance_per_var()
+        return [int(i) for i in np.argsort(imps)[::-1][:2]]
+
+    @property
+    def response(self) -> "AimodelResponse":
+        """
+        Model response across the mesh of the chosen vars.
+        Computed once per choice of vars, then cached
+        """
+        key = tuple(self.chosen_I)
+        if key not in self._responses:
+            self._responses[key] = AimodelResponse(self)
+        return self._responses[key]
+
+    def reuse_response(self, prev: Optional["AimodelPlotdata"]) -> bool:
+        """
+        @description
+          Adopt prev's cached responses, where they'd be identical. That's
+          when the model and training data are unchanged, and the resolution
+          and slicing values of non-swept vars are the same.
+
+        @return
+          reused -- True if any were reused
+        """
+        if prev is None or not prev._responses:
+            return False
+        if prev.model is not self.model or prev.resolution != self.resolution:
+            return False
+        if prev.X_train is not self.X_train and not np.array_equal(
+            prev.X_train, self.X_train
+        ):
+            return False
+        if not np.array_equal(prev.ytrue_train, self.ytrue_train):
+            return False
+
+        reused = False
+        for key, response in prev._responses.items():
+            other_I = [i for i in range(self.n) if i not in key]
+            if np.array_equal(prev.slicing_x[other_I], self.slicing_x[other_I]):
+                self._responses[key] = response
+                reused = True
+        return reused
+
+
+class AimodelResponse:
+    """
+    Model response evaluated over a uniform mesh of the swept var(s), in
+    one batched predict call. Every other var i is held at slicing_x[i].
+    Plotting reads these precomputed arrays.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    @enforce_types
+    def __init__(self, d: AimodelPlotdata):
+        self.chosen_I: List[int] = d.chosen_I
+        X = d.X_train
+        res = d.resolution
+
+        # mesh over the chosen var(s), within the range of training data
+        chosen_X = X[:, self.chosen_I]
+        self.mesh_x0 = np.linspace(min(chosen_X[:, 0]), max(chosen_X[:, 0]), res)
+        self.mesh_x1: Optional[np.ndarray] = None
+        if len(self.chosen_I) == 1:
+            mesh_chosen_X = np.reshape(self.mesh_x0, (res, 1))
+        else:
+            self.mesh_x1 = np.linspace(min(chosen_X[:, 1]), max(chosen_X[:, 1]), res)
+            dim0, dim1 = np.meshgrid(self.mesh_x0, self.mesh_x1)
+            mesh_chosen_X = np.column_stack([dim0.ravel(), dim1.ravel()])
+
+        # every other var i has value slicing_x[i]
+        mesh_N = mesh_chosen_X.shape[0]
+        mesh_X = np.repeat(np.reshape(d.slicing_x, (1, d.n)), mesh_N, axis=0)
+        mesh_X[:, self.chosen_I] = mesh_chosen_X
+
+        # model response: one batched call across the whole mesh
+        mesh_yptrue, mesh_ycont = d.model.predict_ptrue_ycont(mesh_X)
+        if self.mesh_x1 is not None:  # 2d response: [x1_i, x0_i]
+            mesh_yptrue = np.reshape(mesh_yptrue, (res, res))
+            if mesh_ycont is not None:
+                mesh_ycont = np.reshape(mesh_ycont, (res, res))
+        self.mesh_yptrue: np.ndarray = mesh_yptrue
+        self.mesh_ycont: Optional[np.ndarray] = mesh_ycont
+
+        # model classification of the training data
+        self.ytrue_hat_train: np.ndarray = d.model.predict_true(X)
@@ -41,56 +41,34 @@ def _plot_lineplot_1var(aimodel_plotdata: AimodelPlotdata):
     assert d.n_sweep == 1
     X, ytrue, ycont, y_thr = d.X_train, d.ytrue_train, d.ycont_train, d.y_thr
 
-    # take 1 var
-    nvars = X.shape[1]
-    sweep_vars = aimodel_plotdata.sweep_vars
-    assert nvars > 0
-    if nvars == 1:
-        chosen_i = 0
-    elif sweep_vars is not None and len(sweep_vars) >= 1:
-        chosen_i = sweep_vars[0]
-    else:
-        imps = d.model.importance_per_var()
-        chosen_i = np.argsort(imps)[::-1][0]  # type:ignore[assignment]
+    # precomputed model response, across mesh of the chosen var
+    r = d.response
+    chosen_i = r.chosen_I[0]
+    mesh_chosen_x = r.mesh_x0
 
     # base data
     x = X[:, chosen_i]
     colname = d.colnames[chosen_i]
     N = len(x)
 
-    # calc mesh_X = uniform grid on chosen_i,
-    #  and every other dimension i has value slicing_x[i]
-    mesh_chosen_x = np.linspace(min(x), max(x), 200)
-    slicing_X = np.reshape(d.slicing_x, (1, nvars))  # [0][var_i]
-    mesh_N = len(mesh_chosen_x)
-    mesh_X = np.repeat(slicing_X, mesh_N, axis=0)  # [sample_i][var_i]
-    mesh_X[:, chosen_i] = mesh_chosen_x
-
-    # calc model classifier response
-    mesh_yptrue_hat = d.model.predict_ptrue(mesh_X)
-    ytrue_hat = d.model.predict_true(X)
-
-    # calc model regressor response
-    mesh_ycont_hat = None
-    if d.model.do_regr:
-        mesh_ycont_hat = d.model.predict_ycont(mesh_X)
-
     # build up "fig"...
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-    # orange vertical bars: where classifier was wrong
-    correct = ytrue_hat == ytrue
+    # orange vertical bars: where classifier was wrong. One trace for all
+    correct = r.ytrue_hat_train == ytrue
     wrong = np.invert(correct)
-    for i, xi in enumerate(x[wrong]):
-        label = "classif: wrong" if i == 0 else None
+    x_wrong = x[wrong]
+    if len(x_wrong) > 0:
+        n_wrong = len(x_wrong)
+        bars_x = np.column_stack([x_wrong, x_wrong, [None] * n_wrong]).ravel()
+        bars_y = np.tile([0.0, 1.0, None], n_wrong)
         fig.add_trace(
             go.Scatter(
-                x=[xi, xi],
-                y=[0.0, 1.0],
+                x=bars_x,
+                y=bars_y,
                 mode="lines",
                 line={"color": "orange", "width": 1},
-                name=label,
-                showlegend=bool(label),
+                name="classif: wrong",
             )
         )
 
@@ -98,7 +76,7 @@ def _plot_lineplot_1var(aimodel_plotdata: AimodelPlotdata):
     fig.add_trace(
         go.Scatter(
             x=mesh_chosen_x,
-            y=mesh_yptrue_hat,
+            y=r.mesh_yptrue,
             mode="lines",
             line={"color": "blue"},
             name="classif: model prob(true)",
@@ -134,13 +112,13 @@ def _plot_lineplot_1var(aimodel_plotdata: AimodelPlotdata):
 
     # line plot: regressor response, training data
     if d.model.do_regr:
-        assert mesh_ycont_hat is not None
+        assert r.mesh_ycont is not None
         assert y_thr is not None
         assert ycont is not None
         fig.add_trace(
             go.Scatter(
                 x=mesh_chosen_x,
-                y=mesh_ycont_hat,
+                y=r.mesh_ycont,
                 mode="lines",
                 line={"color": "black"},
                 name="regr: model yhat",
@@ -185,44 +163,18 @@ def _plot_contour(aimodel_plotdata: AimodelPlotdata):
     @arguments
       aimodel_plotdata --
     """
-    # pylint: disable=too-many-statements
     # aimodel data
     d = aimodel_plotdata
-    X = d.X_train
-    nvars = d.n
-    assert nvars >= 2
-
-    # take 2 vars
-    nvars = X.shape[1]
-    sweep_vars = aimodel_plotdata.sweep_vars
-    assert nvars > 1
-    if nvars == 1:
-        chosen_I = [0, 0]
-    elif nvars == 2:
-        chosen_I = [0, 1]
-    elif sweep_vars is not None and len(sweep_vars) >= 2:
-        chosen_I = list(sweep_vars)[:2]
-    else:
-        imps = d.model.importance_per_var()
-        chosen_I = np.argsort(imps)[::-1][:2]  # type:ignore[assignment]
-    chosen_X = X[:, chosen_I]
-    chosen_colnames = [d.colnames[i] for i in chosen_I]
+    assert d.n >= 2
+
+    # precomputed model response, across mesh of the 2 chosen vars
+    r = d.response
+    assert r.mesh_x1 is not None
+    chosen_colnames = [d.colnames[i] for i in r.chosen_I]
 
     # calc min/max
-    x0_min, x0_max = min(chosen_X[:, 0]), max(chosen_X[:, 0])
-    x1_min, x1_max = min(chosen_X[:, 1]), max(chosen_X[:, 1])
-
-    # calc mesh_X = uniform grid across two most important dimensions,
-    #  and every other dimension i has value slicing_x[i]
-    feature_x = np.linspace(x0_min, x0_max, 200)
-    feature_y = np.linspace(x1_min, x1_max, 200)
-    dim0, dim1 = np.meshgrid(feature_x, feature_y)
-    mesh_0, mesh_1 = dim0.ravel(), dim1.ravel()
-    mesh_chosen_X = np.array([mesh_0, mesh_1]).T  # [sample_i][chosen_var_i]
-    slicing_X = np.reshape(d.slicing_x, (1, nvars))  # [0][var_i]
-    mesh_N = mesh_chosen_X.shape[0]
-    mesh_X = np.repeat(slicing_X, mesh_N, axis=0)  # [sample_i][var_i]
-    mesh_X[:, chosen_I] = mesh_chosen_X
+    x0_min, x0_max = r.mesh_x0[0], r.mesh_x0[-1]
+    x1_min, x1_max = r.mesh_x1[0], r.mesh_x1[-1]
 
     # make subplots
     s1 = "classif: contours = model prob(true)"
@@ -235,15 +187,14 @@ def _plot_contour(aimodel_plotdata: AimodelPlotdata):
         fig = make_subplots(rows=1, cols=1, subplot_titles=s1)
 
     # subplot at row 1: classifier response
-    Z = d.model.predict_ptrue(mesh_X)
     colorscale = "RdBu"  # red=False, blue=True, white=between
-    _add_contour_subplot(d, chosen_I, dim0, dim1, Z, colorscale, fig, row=1)
+    _add_contour_subplot(d, r.mesh_yptrue, colorscale, fig, row=1)
 
     # subplot at row 2: regressor response
     if d.model.do_regr:
-        Z = d.model.predict_ycont(mesh_X)
+        assert r.mesh_ycont is not None
         colorscale = "Greys"
-        _add_contour_subplot(d, chosen_I, dim0, dim1, Z, colorscale, fig, row=2)
+        _add_contour_subplot(d, r.mesh_ycont, colorscale, fig, row=2)
 
     # global: axes ranges
     fig.update_xaxes(range=[x0_min, x0_max])
@@ -258,19 +209,17 @@ def _plot_contour(aimodel_plotdata: AimodelPlotdata):
 
 
 @enforce_types
-# pylint: disable=too-many-positional-arguments
-def _add_contour_subplot(d, chosen_I, dim0, dim1, Z, colorscale, fig, row):
+def _add_contour_subplot(d, Z, colorscale, fig, row):
     """In-place update 'fig' at specified subplot row"""
-    Z = Z.reshape(dim1.shape)
+    r = d.response
 
     # base data
     X = d.X_train
     ytrue = d.ytrue_train
-    chosen_X = X[:, chosen_I]
+    chosen_X = X[:, r.chosen_I]
 
     # calc other data for plots
-    ytrue_hat = d.model.predict_true(X)
-    correct = ytrue_hat == ytrue
+    correct = r.ytrue_hat_train == ytrue
     wrong = np.invert(correct)
     yfalse = np.invert(ytrue)
 
@@ -278,8 +227,8 @@ def _add_contour_subplot(d, chosen_I, dim0, dim1, Z, colorscale, fig, row):
     fig.add_trace(
         go.Contour(
             z=Z,
-            x=dim0[0],
-            y=dim1[:, 0],
+            x=r.mesh_x0,
+            y=r.mesh_x1,
             showscale=False,
             line_width=0,
             ncontours=25,
@@ -0,0 +1,181 @@
+import os
+import pickle
+from unittest.mock import patch
+
+from enforce_typing import enforce_types
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from pdr_backend.aimodel.aimodel_cache import AimodelCache
+from pdr_backend.aimodel.aimodel_factory import AimodelFactory
+from pdr_backend.ppss.aimodel_ss import AimodelSS, aimodel_ss_test_dict
+
+
+@enforce_types
+def _data(N: int = 100):
+    X = np.random.uniform(-10.0, +10.0, (N, 2))
+    ycont = 3.0 + 1.0 * X[:, 0] + 2.0 * X[:, 1]
+    y_thr = 2.0
+    ytrue = ycont > y_thr
+    return X, ytrue, ycont, y_thr
+
+
+@enforce_types
+def test_aimodel_cache_fingerprint():
+    ss = AimodelSS(aimodel_ss_test_dict())
+    X, ytrue, ycont, y_thr = _data()
+    key = AimodelCache.fingerprint(ss, X, ytrue, ycont, y_thr)
+
+    # same inputs -> same key, even if a copy
+    assert AimodelCache.fingerprint(ss, X.copy(), ytrue, ycont, y_thr) == key
+
+    # change in data -> different key
+    X2 = X.copy()
+    X2[0, 0] += 1e-9
+    assert AimodelCache.fingerprint(ss, X2, ytrue, ycont, y_thr) != key
+    assert AimodelCache.fingerprint(ss, X, ytrue, None, y_thr) != key
+    assert AimodelCache.fingerprint(ss, X, ytrue, ycont, 3.0) != key
+
+    # change in model settings -> different key
+    d = aimodel_ss_test_dict(approach="ClassifXgboost")
+    assert AimodelCache.fingerprint(AimodelSS(d), X, ytrue, ycont, y_thr) != key
+
+    d = aimodel_ss_test_dict()
+    d["seed"] = 42
+    assert AimodelCache.fingerprint(AimodelSS(d), X, ytrue, ycont, y_thr) != key
+
+    # change in settings that don't affect fit -> same key
+    d = aimodel_ss_test_dict(train_every_n_epochs=5)
+    d["calc_imps"] = False
+    d["cache_dir"] = "foo"
+    assert AimodelCache.fingerprint(AimodelSS(d), X, ytrue, ycont, y_thr) == key
+
+
+@enforce_types
+def test_aimodel_cache_save_load_prune(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), "aimodel_cache")
+    cache = AimodelCache(cache_dir, max_bytes=10**9)
+    assert cache.entries() == []
+    assert cache.load("foo") is None
+
+    ss = AimodelSS(aimodel_ss_test_dict())
+    X, ytrue, ycont, y_thr = _data()
+    model = AimodelFactory(ss).build(X, ytrue, ycont, y_thr, show_warnings=False)
+
+    # save & load
+    for i in range(3):
+        cache.save(f"key{i}", model)
+        os.utime(cache._path(f"key{i}"), (i, i))  # key0 = least recently used
+    assert [e[0] for e in cache.entries()] == ["key0", "key1", "key2"]
+    n_bytes = cache.entries()[0][1]
+    assert cache.total_bytes == 3 * n_bytes
+
+    model2 = cache.load("key0")
+    assert model2 is not None
+    assert_array_equal(model2.predict_ptrue(X), model.predict_ptrue(X))
+    assert [e[0] for e in cache.entries()] == ["key1", "key2", "key0"]
+
+    # prune: evict least recently used
+    assert cache.prune(2 * n_bytes) == 1
+    assert [e[0] for e in cache.entries()] == ["key2", "key0"]
+    assert cache.prune(0) == 2
+    assert cache.entries() == []
+
+    # corrupt file = miss
+    with open(cache._path("bad"), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.load("bad") is None
+    assert cache.entries() == []
+
+
+@enforce_types
+def test_aimodel_cache_lru_eviction_on_save(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), "aimodel_cache")
+    ss = AimodelSS(aimodel_ss_test_dict())
+    X, ytrue, ycont, y_thr = _data()
+    model = AimodelFactory(ss).build(X, ytrue, ycont, y_thr, show_warnings=False)
+
+    cache = AimodelCache(cache_dir, max_bytes=10**9)
+    cache.save("key0", model)
+    n_bytes = cache.total_bytes
+
+    cache = AimodelCache(cache_dir, max_bytes=2 * n_bytes)
+    for i in range(1, 5):
+        cache.save(f"key{i}", model)
+        os.utime(cache._path(f"key{i}"), (i, i))
+    assert len(cache.entries()) == 2
+    assert cache.total_bytes <= 2 * n_bytes
+
+
+@enforce_types
+def test_aimodel_factory_uses_cache(tmpdir):
+    d = aimodel_ss_test_dict()
+    d["cache_dir"] = os.path.join(str(tmpdir), "aimodel_cache")
+    ss = AimodelSS(d)
+    factory = AimodelFactory(ss)
+    X, ytrue, ycont, y_thr = _data()
+
+    model = factory.build(X, ytrue, ycont, y_thr, show_warnings=False)
+    assert len(os.listdir(ss.cache_dir)) == 1
+
+    # hit: a restarted process gets an equivalent model, without a retrain
+    model2 = AimodelFactory(ss).build(X, ytrue, ycont, y_thr, show_warnings=False)
+    assert model2 is not model
+    assert_array_equal(model2.predict_ptrue(X), model.predict_ptrue(X))
+    assert model2.has_importance_per_var
+    assert len(os.listdir(ss.cache_dir)) == 1
+
+    # miss: different data
+    X2 = X + 1.0
+    _ = factory.build(X2, ytrue, ycont, y_thr, show_warnings=False)
+    assert len(os.listdir(ss.cache_dir)) == 2
+
+
+@enforce_types
+def test_aimodel_cache_stores_compact_record(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), "aimodel_cache")
+    cache = AimodelCache(cache_dir, max_bytes=10**9)
+    ss = AimodelSS(aimodel_ss_test_dict())
+    X, ytrue, ycont, y_thr = _data(N=2000)
+    model = AimodelFactory(ss).build(X, ytrue, ycont, y_thr, show_warnings=False)
+    assert model.has_importance_per_var  # pending: holds training data
+
+    cache.save("key0", model)
+    with open(cache._path("key0"), "rb") as f:
+        record = pickle.load(f)
+    assert sorted(record.keys()) == sorted(
+        ["scaler", "sk_regrs", "y_thr", "sk_classif", "ycont_offset"]
+    )
+    assert os.listdir(cache_dir) == ["key0.pkl"]  # no leftover tmp files
+
+    model2 = cache.load("key0")
+    assert not model2.has_importance_per_var
+    assert_array_equal(model2.predict_ptrue(X), model.predict_ptrue(X))
+
+
+@enforce_types
+def test_aimodel_cache_concurrent_eviction(tmpdir):
+    # another process can evict files while we list, load or prune
+    cache_dir = os.path.join(str(tmpdir), "aimodel_cache")
+    cache = AimodelCache(cache_dir, max_bytes=10**9)
+    ss = AimodelSS(aimodel_ss_test_dict())
+    X, ytrue, ycont, y_thr = _data()
+    model = AimodelFactory(ss).build(X, ytrue, ycont, y_thr, show_warnings=False)
+    for i in range(3):
+        cache.save(f"key{i}", model)
+
+    real_stat = os.stat
+
+    def _stat(path, *args, **kwargs):
+        if path.endswith("key1.pkl"):
+            raise FileNotFoundError(path)
+        return real_stat(path, *args, **kwargs)
+
+    with patch("os.stat", _stat):
+        assert sorted(e[0] for e in cache.entries()) == ["key0", "key2"]
+
+    entries = cache.entries()
+    os.remove(cache._path(entries[0][0]))
+    with patch.object(cache, "entries", return_value=entries):
+        assert cache.prune(0) == 3  # already-gone file doesn't raise
+    assert cache.load("key0") is None
@@ -1,5 +1,6 @@
 from unittest.mock import Mock
 import os
+import pickle
 import numpy as np
 
 from enforce_typing import enforce_types
@@ -8,6 +9,7 @@ from plotly.graph_objs._figure import Figure
 import pytest
 from pytest import approx
 
+from pdr_backend.aimodel.aimodel import Aimodel
 from pdr_backend.aimodel.aimodel_factory import AimodelFactory
 from pdr_backend.aimodel.aimodel_plotdata import AimodelPlotdata
 from pdr_backend.aimodel.aimodel_plotter import (
@@ -451,3 +453,162 @@ def _test_aimodel__regr_0error(d: dict, curprice_xval):
     assert isinstance(figure, Figure)
     if SHOW_PLOT:
         figure.show()
+
+
+@enforce_types
+@pytest.mark.parametrize(
+    "approach,calc_imps_method",
+    [
+        ("ClassifLinearRidge", "Auto"),
+        ("ClassifLinearRidge", "Permutation"),
+        ("ClassifXgboost", "Auto"),
+        ("RegrXgboost", "Auto"),
+        ("RegrXgboost", "Permutation"),
+    ],
+)
+def test_aimodel_varimps_lazy(approach: str, calc_imps_method: str):
+    d = aimodel_ss_test_dict(approach=approach)
+    d["calc_imps_method"] = calc_imps_method
+    d["calc_imps_n_repeats"] = 3
+    d["calc_imps_max_samples"] = 200
+    ss = AimodelSS(d)
+    factory = AimodelFactory(ss)
+
+    # data
+    N = 500
+    X = np.random.uniform(-10.0, +10.0, (N, 2))
+    ycont = 3.0 + 1.0 * X[:, 0] + 4.0 * X[:, 1]
+    y_thr = 2.0
+    ytrue = ycont > y_thr
+
+    # build model. Importances should be pending, not yet computed
+    model = factory.build(X, ytrue, ycont, y_thr, show_warnings=False)
+    assert model.has_importance_per_var
+    assert model._imps_tup is None
+
+    # first read computes them
+    imps_avg, imps_stddev = model.importance_per_var(include_stddev=True)
+    assert model._imps_tup is not None
+    assert model._imps_inputs is None
+    assert sum(imps_avg) == approx(1.0, 0.01)
+    assert imps_avg[1] > imps_avg[0]
+    assert min(imps_stddev) >= 0.0
+
+    # next read is from cache
+    imps_tup = model._imps_tup
+    model.importance_per_var()
+    assert model._imps_tup is imps_tup
+
+
+@enforce_types
+def test_aimodel_varimps_inputs_compact():
+    d = aimodel_ss_test_dict(approach="ClassifLinearRidge")
+    d["calc_imps_method"] = "Permutation"
+    d["calc_imps_max_samples"] = 50
+    ss = AimodelSS(d)
+    factory = AimodelFactory(ss)
+
+    N = 500
+    X = np.random.uniform(-10.0, +10.0, (N, 2))
+    ytrue = X[:, 0] > 0.0
+    model = factory.build(X, ytrue, show_warnings=False)
+
+    # only a subsample of the training data is kept, for lazy importances
+    assert model._imps_inputs["X"].shape == (50, 2)
+    assert model._imps_inputs["y"].shape == (50,)
+
+    # and it's not pickled
+    model2 = pickle.loads(pickle.dumps(model))
+    assert model2._imps_inputs is None
+    assert_array_equal(model2.predict_ptrue(X), model.predict_ptrue(X))
+
+    # constant y: flat importances right away, no inputs kept
+    model = Aimodel(None, None, None, None)
+    model.set_importance_per_var(X, np.full(N, True))
+    assert model._imps_inputs is None
+    assert_array_equal(model.importance_per_var(), [0.5, 0.5])
+
+
+@enforce_types
+def test_aimodel_varimps_disabled():
+    d = aimodel_ss_test_dict(approach="ClassifLinearRidge")
+    d["calc_imps"] = False
+    ss = AimodelSS(d)
+    factory = AimodelFactory(ss)
+
+    N = 100
+    X = np.random.uniform(-10.0, +10.0, (N, 2))
+    ytrue = X[:, 0] > 0.0
+    model = factory.build(X, ytrue, show_warnings=False)
+    assert not model.has_importance_per_var
+    with pytest.raises(AssertionError):
+        model.importance_per_var()
+
+
+@enforce_types
+def test_aimodel_response_cached():
+    ss = AimodelSS(aimodel_ss_test_dict(approach="RegrLinearRidge"))
+    factory = AimodelFactory(ss)
+
+    N = 200
+    X = np.random.uniform(-10.0, +10.0, (N, 3))
+    ycont = 1.0 * X[:, 0] + 2.0 * X[:, 1] + 3.0 * X[:, 2]
+    y_thr = 0.0
+    ytrue = ycont > y_thr
+    model = factory.build(X, ytrue, ycont, y_thr, show_warnings=False)
+
+    colnames = ["x0", "x1", "x2"]
+    slicing_x = np.array([0.1, 0.2, 0.3])
+    d = AimodelPlotdata(
+        model, X, ytrue, ycont, y_thr, colnames, slicing_x, [0, 1], resolution=20
+    )
+
+    # 2 vars: one batched predict across the whole mesh, [x1_i, x0_i]
+    r = d.response
+    assert r.chosen_I == [0, 1]
+    assert r.mesh_yptrue.shape == r.mesh_ycont.shape == (20, 20)
+    mesh_x = np.array([r.mesh_x0[3], r.mesh_x1[5], 0.3])
+    assert r.mesh_ycont[5, 3] == approx(model.predict_ycont(mesh_x[None, :])[0])
+    assert_array_equal(r.ytrue_hat_train, model.predict_true(X))
+
+    # plotting doesn't recompute; nor does a second access
+    model.predict_ptrue_ycont = Mock(side_effect=AssertionError)
+    assert d.response is r
+    assert isinstance(plot_aimodel_response(d), Figure)
+
+    # new plotdata for same model: reused if non-swept vars' slice is same
+    d2 = AimodelPlotdata(
+        model,
+        X,
+        ytrue,
+        ycont,
+        y_thr,
+        colnames,
+        np.array([5.0, 5.0, 0.3]),
+        [0, 1],
+        resolution=20,
+    )
+    assert d2.reuse_response(d)
+    assert d2.response is r
+
+    d3 = AimodelPlotdata(
+        model,
+        X,
+        ytrue,
+        ycont,
+        y_thr,
+        colnames,
+        np.array([0.1, 0.2, 9.0]),
+        [0, 1],
+        resolution=20,
+    )
+    assert not d3.reuse_response(d)
+
+    # other swept vars: computed separately, then cached too
+    del model.predict_ptrue_ycont
+    d.sweep_vars = [2]
+    r2 = d.response
+    assert r2.chosen_I == [2]
+    assert r2.mesh_yptrue.shape == (20,)
+    d.sweep_vars = [0, 1]
+    assert d.response is r
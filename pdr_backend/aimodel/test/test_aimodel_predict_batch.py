@@ -0,0 +1,101 @@
+import logging
+import time
+from unittest.mock import Mock
+
+from enforce_typing import enforce_types
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import pytest
+
+from pdr_backend.aimodel.aimodel_factory import AimodelFactory
+from pdr_backend.ppss.aimodel_ss import AimodelSS, aimodel_ss_test_dict
+
+logger = logging.getLogger("aimodel_predict_batch")
+
+
+@enforce_types
+@pytest.mark.parametrize(
+    "approach", ["ClassifLinearRidge", "ClassifXgboost", "RegrLinearRidge"]
+)
+def test_aimodel_predict_batch(approach: str):
+    """Batch predict = single-row predicts, in one pass over the estimators"""
+    # pylint: disable=protected-access
+    ss = AimodelSS(aimodel_ss_test_dict(approach=approach))
+    factory = AimodelFactory(ss)
+
+    N, n_test = 500, 50
+    X = np.random.uniform(-10.0, +10.0, (N + n_test, 4))
+    ycont = 3.0 + 1.0 * X[:, 0] + 2.0 * X[:, 1] - 1.0 * X[:, 2]
+    y_thr = 2.0
+    ytrue = ycont > y_thr
+    model = factory.build(X[:N], ytrue[:N], ycont[:N], y_thr, show_warnings=False)
+    X_test = X[N:]
+
+    # one row at a time, like a walk-forward sim loop
+    yptrue_rows = np.array(
+        [model.predict_ptrue(X_test[i : i + 1])[0] for i in range(n_test)]
+    )
+
+    # all rows at once. Count calls into the scaler & estimators
+    model._scaler.transform = Mock(wraps=model._scaler.transform)
+    if model.do_regr:
+        assert model._sk_regrs is not None
+        estimators = model._sk_regrs
+        method = "predict"
+    else:
+        estimators = [model._sk_classif]
+        if hasattr(model._sk_classif, "_predict_proba_lr"):
+            method = "_predict_proba_lr"
+        else:
+            method = "predict_proba"
+    for est in estimators:
+        setattr(est, method, Mock(wraps=getattr(est, method)))
+
+    yptrue_batch, ycont_batch = model.predict_ptrue_ycont(X_test)
+
+    # one call each, for the whole batch
+    assert model._scaler.transform.call_count == 1
+    for est in estimators:
+        assert getattr(est, method).call_count == 1
+
+    # same results
+    assert_array_almost_equal(yptrue_rows, yptrue_batch)
+    if model.do_regr:
+        assert_array_almost_equal(ycont_batch, model.predict_ycont(X_test))
+    else:
+        assert ycont_batch is None
+
+
+@enforce_types
+@pytest.mark.parametrize(
+    "approach", ["ClassifLinearRidge", "ClassifXgboost", "RegrLinearRidge"]
+)
+def test_aimodel_predict_latency(approach: str):
+    """Micro-benchmark: single-row predict latency, vs one batch call.
+    Only logs the timings: wall-clock time isn't asserted, as CI varies"""
+    ss = AimodelSS(aimodel_ss_test_dict(approach=approach))
+    factory = AimodelFactory(ss)
+
+    N, n_test = 500, 200
+    X = np.random.uniform(-10.0, +10.0, (N + n_test, 4))
+    ycont = 3.0 + 1.0 * X[:, 0] + 2.0 * X[:, 1] - 1.0 * X[:, 2]
+    y_thr = 2.0
+    ytrue = ycont > y_thr
+    model = factory.build(X[:N], ytrue[:N], ycont[:N], y_thr, show_warnings=False)
+    X_test = X[N:]
+
+    t0 = time.perf_counter()
+    for i in range(n_test):
+        model.predict_ptrue(X_test[i : i + 1])
+    t_rows = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.predict_ptrue_ycont(X_test)
+    t_batch = time.perf_counter() - t0
+
+    logger.info(
+        "%s: single-row predict_ptrue = %.3f ms/row; batch = %.4f ms/row",
+        approach,
+        t_rows / n_test * 1e3,
+        t_batch / n_test * 1e3,
+    )
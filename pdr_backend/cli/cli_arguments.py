@@ -42,6 +42,7 @@ Transactions are signed with envvar 'PRIVATE_KEY`.
 HELP_OTHER_TOOLS = """
 Power tools:
   pdr multisim PPSS_FILE
+  pdr aimodel_cache info|prune|clear PPSS_FILE [--MAX_MB MAX_MB]
   pdr arima_plots PPSS_FILE [--debug_mode False]
   pdr deployer (for >1 predictoor bots)
   pdr ohlcv PPSS_FILE NETWORK
@@ -619,6 +620,26 @@ class SimPlotsArgParser(CustomArgParser):
         )
 
 
+class AimodelCacheArgParser(CustomArgParser, PPSS_Mixin):
+    # pylint: disable=unused-argument
+    def __init__(self, description: str, command_name: str):
+        super().__init__(description=description)
+        self.add_argument("command", choices=[command_name])
+        self.add_argument(
+            "ACTION",
+            type=str,
+            choices=["info", "prune", "clear"],
+            help="info|prune|clear",
+        )
+        self.add_argument_PPSS()
+        self.add_argument(
+            "--MAX_MB",
+            type=float,
+            help="For prune: evict LRU models beyond this. Default: cache_max_mb",
+            required=False,
+        )
+
+
 class ArimaPlotsArgParser(CustomArgParser, PPSS_Mixin, DEBUG_Mixin):
     # pylint: disable=unused-argument
     def __init__(self, description: str, command_name: str):
@@ -654,6 +675,9 @@ defined_parsers = {
     "do_claim_ROSE": ClaimRoseArgParser("Claim ROSE", "claim_ROSE"),
     # power tools
     "do_multisim": MultisimArgParser("Run >1 simulations", "multisim"),
+    "do_aimodel_cache": AimodelCacheArgParser(
+        "Inspect or prune the cache of fitted models", "aimodel_cache"
+    ),
     "do_deployer": DeployerArgPaser(),
     "do_lake": LakeArgParser("Run the lake tool", "lake"),
     "do_ohlcv": OHLCVArgParser("Run the ohlcv tool", "ohlcv"),
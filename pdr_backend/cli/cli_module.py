@@ -1,8 +1,10 @@
 import logging
 import sys
+from datetime import datetime
 
 from enforce_typing import enforce_types
 
+from pdr_backend.aimodel.aimodel_cache import AimodelCache
 from pdr_backend.analytics.check_network import check_network_main
 from pdr_backend.analytics.get_predictions_info import (
     get_predictions_info_main,
@@ -162,6 +164,37 @@ def do_multisim(args, nested_args=None):
     multisim_engine.run()
 
 
+@enforce_types
+def do_aimodel_cache(args, nested_args=None):
+    ppss = PPSS(
+        yaml_filename=args.PPSS_FILE,
+        network="development",
+        nested_override_args=nested_args,
+    )
+    aimodel_ss = ppss.predictoor_ss.aimodel_ss
+    if aimodel_ss.cache_dir is None:
+        print("No aimodel_ss.cache_dir set, so there's no cache")
+        return
+
+    max_mb = aimodel_ss.cache_max_mb
+    cache = AimodelCache(aimodel_ss.cache_dir, int(max_mb * 1e6))
+    if args.ACTION == "prune":
+        if args.MAX_MB is not None:
+            max_mb = args.MAX_MB
+        n_evicted = cache.prune(int(max_mb * 1e6))
+        print(f"Evicted {n_evicted} models, to get <= {max_mb} MB")
+    elif args.ACTION == "clear":
+        n_evicted = cache.prune(0)
+        print(f"Evicted {n_evicted} models")
+
+    entries = cache.entries()
+    print(f"Cache dir: {aimodel_ss.cache_dir}")
+    print(f"{len(entries)} models, {cache.total_bytes / 1e6:.2f} / {max_mb} MB")
+    for key, n_bytes, last_used_s in entries[::-1]:
+        last_used = datetime.fromtimestamp(last_used_s).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"  {key}  {n_bytes / 1e3:10.1f} KB  last used {last_used}")
+
+
 @enforce_types
 # pylint: disable=unused-argument
 def do_deployer(args, nested_args=None):
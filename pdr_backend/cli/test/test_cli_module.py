@@ -16,6 +16,7 @@ from pdr_backend.cli.cli_module import (
     do_claim_ROSE,
     # power tools
     do_multisim,
+    do_aimodel_cache,
     do_ohlcv,
     # utilities
     do_get_predictoors_info,
@@ -301,6 +302,32 @@ def test_do_multisim(monkeypatch):
     mock_f.assert_called()
 
 
+@enforce_types
+def test_do_aimodel_cache(tmpdir, capsys):
+    cache_dir = os.path.join(str(tmpdir), "aimodel_cache")
+    nested_args = {"predictoor_ss": {"aimodel_ss": {"cache_dir": cache_dir}}}
+    os.makedirs(cache_dir)
+    for i in range(3):
+        with open(os.path.join(cache_dir, f"key{i}.pkl"), "wb") as f:
+            f.write(b"x" * 1000)
+
+    class MockArgs(Namespace, _PPSS):
+        ACTION = "info"
+        MAX_MB = None
+
+    args = MockArgs()
+    do_aimodel_cache(args, nested_args)
+    assert "3 models" in capsys.readouterr().out
+
+    args.ACTION, args.MAX_MB = "prune", 0.002
+    do_aimodel_cache(args, nested_args)
+    assert "Evicted 1 models" in capsys.readouterr().out
+
+    args.ACTION = "clear"
+    do_aimodel_cache(args, nested_args)
+    assert "0 models" in capsys.readouterr().out
+
+
 @enforce_types
 def test_do_ohlcv(monkeypatch):
     mock_f = Mock()
@@ -1,8 +1,21 @@
+import threading
 from abc import ABC
+from typing import Any, Dict, Tuple
 
 from enforce_typing import enforce_types
 from sapphirepy import wrapper
 
+# process-level memo of contract fields that never change once deployed
+# (rpc_url, contract_address, fn_name) : value
+_IMMUTABLES: Dict[Tuple[str, str, str], Any] = {}
+_IMMUTABLES_LOCK = threading.Lock()
+
+
+def clear_immutables_cache():
+    """Forget all memoized immutable contract fields. Eg for tests"""
+    with _IMMUTABLES_LOCK:
+        _IMMUTABLES.clear()
+
 
 @enforce_types
 class BaseContract(ABC):
@@ -29,6 +42,25 @@ class BaseContract(ABC):
     def name(self):
         return self.contract_name
 
+    def get_immutable(self, fn_name: str) -> Any:
+        """
+        @description
+          Call view function fn_name (no args) of this contract, once per
+          process. Only for fields that can't change after deployment.
+
+        @return
+          value -- like contract_instance.functions.<fn_name>().call()
+        """
+        key = (str(self.config.rpc_url), self.contract_address, fn_name)
+        with _IMMUTABLES_LOCK:
+            if key in _IMMUTABLES:
+                return _IMMUTABLES[key]
+
+        value = getattr(self.contract_instance.functions, fn_name)().call()
+        with _IMMUTABLES_LOCK:
+            _IMMUTABLES[key] = value
+        return value
+
     # pylint: disable=too-many-positional-arguments
     def send_encrypted_tx(
         self,
@@ -151,7 +151,7 @@ class FeedContract(BaseContract):  # pylint: disable=too-many-public-methods
 
     def get_stake_token(self):
         """Returns the token used for staking & purchases. Eg OCEAN."""
-        return self.contract_instance.functions.stakeToken().call()
+        return self.get_immutable("stakeToken")
 
     def get_price(self) -> Wei:
         """
@@ -189,7 +189,7 @@ class FeedContract(BaseContract):  # pylint: disable=too-many-public-methods
 
     def get_secondsPerEpoch(self) -> int:
         """How many seconds are in each epoch? (According to contract)"""
-        return self.contract_instance.functions.secondsPerEpoch().call()
+        return self.get_immutable("secondsPerEpoch")
 
     def get_agg_predval(self, timestamp: UnixTimeS) -> Tuple[Eth, Eth]:
         """
@@ -372,6 +372,65 @@ class FeedContract(BaseContract):  # pylint: disable=too-many-public-methods
         return self.contract_instance.functions.getERC721Address().call()
 
 
+# =========================================================================
+# batched reads, across many feeds
+
+
+@enforce_types
+def get_current_epochs(multicall, feed_contracts: list) -> List[int]:
+    """
+    @description
+      get_current_epoch() of each feed contract, in one eth_call.
+      Without Multicall3: one contract at a time, as usual.
+
+    @arguments
+      multicall -- Multicall
+      feed_contracts -- list of FeedContract
+    """
+    if multicall.address is None:
+        return [c.get_current_epoch() for c in feed_contracts]
+
+    # secondsPerEpoch is immutable, so it's memoized; only curEpoch is read
+    fns = [c.contract_instance.functions.curEpoch() for c in feed_contracts]
+    tss = multicall.call(fns)
+    return [int(ts / c.get_secondsPerEpoch()) for ts, c in zip(tss, feed_contracts)]
+
+
+@enforce_types
+def get_prices(multicall, feed_contracts: list) -> List[Wei]:
+    """
+    @description
+      get_price() of each feed contract, in two eth_calls: one for the
+      exchanges, one for the prices. Without Multicall3: one contract
+      at a time, as usual.
+
+    @arguments
+      multicall -- Multicall
+      feed_contracts -- list of FeedContract
+    """
+    if multicall.address is None:
+        return [c.get_price() for c in feed_contracts]
+
+    exchanges_per_feed = multicall.call(
+        [c.contract_instance.functions.getFixedRates() for c in feed_contracts]
+    )
+
+    fixed_rates: Dict[str, FixedRate] = {}  # exchange_addr : FixedRate
+    fns = []
+    for c, exchanges in zip(feed_contracts, exchanges_per_feed):
+        if not exchanges:
+            raise ValueError(f"No exchanges available for {c.contract_address}")
+        (exchange_addr, exchangeId) = exchanges[0]
+        if exchange_addr not in fixed_rates:
+            fixed_rates[exchange_addr] = FixedRate(c.web3_pp, exchange_addr)
+        fns.append(
+            fixed_rates[exchange_addr].contract_instance.functions.calcBaseInGivenOutDT(
+                exchangeId, Eth(1).to_wei().amt_wei, 0
+            )
+        )
+    return [Wei(tup[0]) for tup in multicall.call(fns)]
+
+
 # =========================================================================
 # utilities for testing
 
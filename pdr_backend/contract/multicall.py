@@ -0,0 +1,127 @@
+import logging
+from typing import Any, List, Optional
+
+from enforce_typing import enforce_types
+from web3._utils.abi import get_abi_output_types
+
+logger = logging.getLogger("multicall")
+
+# Multicall3 is deployed at this address on most chains, incl. Sapphire
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# the parts of Multicall3's ABI that we use
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"internalType": "uint256", "name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+class Multicall:
+    """
+    Read many contract view functions in one eth_call, via Multicall3.
+
+    Uses web3_pp.multicall_address. If that's None, eg on development
+    chains, it falls back to one eth_call per function.
+    """
+
+    @enforce_types
+    def __init__(self, web3_pp, batch_size: int = 100):
+        """
+        @arguments
+          web3_pp -- Web3PP
+          batch_size -- max # functions per eth_call
+        """
+        self.web3_pp = web3_pp
+        self.batch_size = batch_size
+        self.n_rpc_calls = 0  # eth_calls made by call()
+
+    @property
+    def w3(self):
+        return self.web3_pp.web3_config.w3
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.web3_pp.multicall_address
+
+    @property
+    def contract(self):
+        """Multicall3 contract. On the fallback, to build its functions only"""
+        address = self.w3.to_checksum_address(self.address or MULTICALL3_ADDRESS)
+        return self.w3.eth.contract(address=address, abi=MULTICALL3_ABI)
+
+    @enforce_types
+    def eth_balance_fn(self, account: str):
+        """Contract function that reads account's native token (ROSE) balance"""
+        return self.contract.functions.getEthBalance(account)
+
+    @enforce_types
+    def call(self, fns: list) -> List[Any]:
+        """
+        @description
+          Call each view function, in as few eth_calls as possible.
+
+        @arguments
+          fns -- list of web3 contract functions with args set,
+            eg [token.contract_instance.functions.balanceOf(addr), ...]
+
+        @return
+          results -- list of results, like fn.call() would return for each
+        """
+        if self.address is None:
+            return [self._call_one(fn) for fn in fns]
+
+        results: List[Any] = []
+        for i in range(0, len(fns), self.batch_size):
+            results += self._aggregate(fns[i : i + self.batch_size])
+        return results
+
+    def _call_one(self, fn) -> Any:
+        self.n_rpc_calls += 1
+        if fn.fn_name == "getEthBalance" and fn.address == self.contract.address:
+            return self.w3.eth.get_balance(fn.args[0])
+        return fn.call()
+
+    def _aggregate(self, fns: list) -> List[Any]:
+        """One eth_call for fns. Reverts if any of fns does"""
+        calls = [(fn.address, False, fn._encode_transaction_data()) for fn in fns]
+        self.n_rpc_calls += 1
+        outputs = self.contract.functions.aggregate3(calls).call()
+
+        results = []
+        for fn, (_, return_data) in zip(fns, outputs):
+            vals = self.w3.codec.decode(get_abi_output_types(fn.abi), return_data)
+            results.append(vals[0] if len(vals) == 1 else list(vals))
+        return results
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from enforce_typing import enforce_types
 
@@ -64,6 +64,7 @@ class PredSubmitterMgr(BaseContract):
         feed_addrs: List[str],
         epoch: UnixTimeS,
         wait_for_receipt: bool = True,
+        call_params: Optional[dict] = None,
     ):
         """
         @description
@@ -75,6 +76,7 @@ class PredSubmitterMgr(BaseContract):
           feed_addrs -- addresses of tje feeds for predictions
           epoch -- epoch start time for the predictions
           wait_for_receipt -- if True, waits for the tx receipt
+          call_params -- tx params, eg with "nonce". Default: tx_call_params()
 
         @return
           tx -- tx hash if wait_for_receipt is False, else the tx receipt
@@ -82,11 +84,15 @@ class PredSubmitterMgr(BaseContract):
         stakes_up_wei = [s.amt_wei for s in stakes_up]
         stakes_down_wei = [s.amt_wei for s in stakes_down]
         if self.config.is_sapphire:
+            nonce = call_params.get("nonce", 0) if call_params else 0
             _, tx = self.send_encrypted_tx(
-                "submit", [stakes_up_wei, stakes_down_wei, feed_addrs, epoch]
+                "submit",
+                [stakes_up_wei, stakes_down_wei, feed_addrs, epoch],
+                nonce=nonce,
             )
         else:
-            call_params = self.web3_pp.tx_call_params()
+            if call_params is None:
+                call_params = self.web3_pp.tx_call_params()
             tx = self.contract_instance.functions.submit(
                 stakes_up_wei, stakes_down_wei, feed_addrs, epoch
             ).transact(call_params)
@@ -100,6 +106,7 @@ class PredSubmitterMgr(BaseContract):
         epochs: List[UnixTimeS],
         feed_addrs: List[str],
         wait_for_receipt: bool = True,
+        call_params: Optional[dict] = None,
     ):
         """
         @description
@@ -110,11 +117,13 @@ class PredSubmitterMgr(BaseContract):
           epochs -- epoch timestamps for the predictions to claim payouts for
           feed_addrs -- addresses of the feeds for which to claim payouts
           wait_for_receipt -- if True, waits for the tx receipt
+          call_params -- tx params, eg with "nonce". Default: tx_call_params()
 
         @return
           tx -- tx hash if wait_for_receipt is False, else the tx receipt.
         """
-        call_params = self.web3_pp.tx_call_params()
+        if call_params is None:
+            call_params = self.web3_pp.tx_call_params()
         tx = self.contract_instance.functions.getPayout(epochs, feed_addrs).transact(
             call_params
         )
@@ -165,6 +174,7 @@ class PredSubmitterMgr(BaseContract):
         self,
         feed_addrs: List[str],
         wait_for_receipt: bool = True,
+        call_params: Optional[dict] = None,
     ):
         """
         @description
@@ -173,11 +183,13 @@ class PredSubmitterMgr(BaseContract):
         @arguments
           feed_addrs -- addresses of the feeds to approve tokens for
           wait_for_receipt -- if True, waits for the tx receipt
+          call_params -- tx params, eg with "nonce". Default: tx_call_params()
 
         @return
           tx -- tx hash if wait_for_receipt is False, else the tx receipt
         """
-        call_params = self.web3_pp.tx_call_params()
+        if call_params is None:
+            call_params = self.web3_pp.tx_call_params()
         tx = self.contract_instance.functions.approveOcean(feed_addrs).transact(
             call_params
         )
@@ -0,0 +1,87 @@
+import json
+from collections import Counter
+
+from enforce_typing import enforce_types
+from eth_abi import encode
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from pdr_backend.contract.base_contract import clear_immutables_cache
+from pdr_backend.ppss.web3_pp import mock_web3_pp
+from pdr_backend.util.contract import load_contract_abi
+from pdr_backend.util.web3_config import Web3Config
+
+_OCEAN_ADDR = "0x" + "0a" * 20
+_FEED_ADDRS = ["0x" + "f1" * 20, "0x" + "f2" * 20]
+
+
+class _StubProvider(BaseProvider):
+    """Local stub RPC: answers eth_call for feed contracts; counts them"""
+
+    def __init__(self):
+        super().__init__()
+        self.n_requests: Counter = Counter()  # contract fn name : # eth_calls
+        self.selectors = {
+            Web3.keccak(text=f"{name}()")[:4].hex(): name
+            for name in ["stakeToken", "secondsPerEpoch", "curEpoch"]
+        }
+
+    def make_request(self, method, params):
+        if method != "eth_call":  # eg eth_chainId, from web3's validation
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(23294)}
+
+        data = params[0]["data"]
+        data = data if data.startswith("0x") else "0x" + data
+        name = self.selectors[data[:10]]
+        self.n_requests[name] += 1
+        if name == "stakeToken":
+            result = encode(["address"], [_OCEAN_ADDR])
+        elif name == "secondsPerEpoch":
+            result = encode(["uint256"], [300])
+        else:
+            result = encode(["uint256"], [1500])
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x" + result.hex()}
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+@enforce_types
+def test_contract_cache_rpc_counts(tmp_path):
+    """Contract metadata goes to the chain at startup only"""
+    clear_immutables_cache()
+    address_file = tmp_path / "address.json"
+    address_file.write_text(json.dumps({"development": {"Ocean": _OCEAN_ADDR}}))
+
+    web3_pp = mock_web3_pp("development")
+    web3_pp.dn["address_file"] = str(address_file)
+    provider = _StubProvider()
+    web3_config = Web3Config("http://stub.rpc")
+    web3_config.w3 = Web3(provider)
+    web3_pp.set_web3_config(web3_config)
+
+    def _step():
+        contracts = web3_pp.get_contracts(_FEED_ADDRS)
+        tokens = [web3_pp.OCEAN_Token, web3_pp.NativeToken]
+        epochs = [c.get_current_epoch() for c in contracts.values()]
+        assert epochs == [5, 5]
+        return list(contracts.values()) + tokens
+
+    # startup: stakeToken & secondsPerEpoch once per feed
+    objs = _step()
+    assert provider.n_requests == Counter(stakeToken=2, secondsPerEpoch=2, curEpoch=2)
+    abi_misses = load_contract_abi.cache_info().misses
+
+    # steady state: only curEpoch, which changes every epoch
+    provider.n_requests.clear()
+    for _ in range(10):
+        assert _step() == objs  # singleton wrappers
+    assert provider.n_requests == Counter(curEpoch=20)
+    assert load_contract_abi.cache_info().misses == abi_misses
+
+    # a new web3_config (eg other rpc_url) builds new wrappers
+    web3_pp.set_web3_config(Web3Config("http://stub2.rpc"))
+    web3_pp.web3_config.w3 = Web3(provider)
+    provider.n_requests.clear()
+    assert _step()[0] is not objs[0]
+    assert provider.n_requests["stakeToken"] == 2
@@ -0,0 +1,119 @@
+from unittest.mock import Mock, patch
+
+from enforce_typing import enforce_types
+from web3 import Web3
+
+from pdr_backend.contract.feed_contract import get_current_epochs, get_prices
+from pdr_backend.contract.multicall import MULTICALL3_ADDRESS, Multicall
+from pdr_backend.util.currency_types import Wei
+
+_VIEW_ABI = [
+    {
+        "inputs": [{"name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getFixedRates",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "contractAddress", "type": "address"},
+                    {"name": "id", "type": "bytes32"},
+                ],
+                "name": "",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+_TOKEN_ADDR = "0x" + "11" * 20
+_ACCOUNT = "0x" + "22" * 20
+
+
+@enforce_types
+def test_multicall_fallback():
+    """Without a Multicall3 address: one eth_call per function"""
+    web3_pp = Mock()
+    web3_pp.multicall_address = None
+    w3 = Web3()
+    w3.eth.get_balance = Mock(return_value=7)  # type: ignore[method-assign]
+    web3_pp.web3_config.w3 = w3
+    multicall = Multicall(web3_pp)
+
+    fn = Mock()
+    fn.call.return_value = 5
+    results = multicall.call([fn, multicall.eth_balance_fn(_ACCOUNT)])
+    assert results == [5, 7]
+    w3.eth.get_balance.assert_called_once_with(_ACCOUNT)
+    assert multicall.n_rpc_calls == 2
+
+
+@enforce_types
+def test_multicall_aggregate():
+    """With a Multicall3 address: batch_size functions per eth_call"""
+    w3 = Web3()
+    web3_pp = Mock()
+    web3_pp.multicall_address = MULTICALL3_ADDRESS
+    web3_pp.web3_config.w3 = w3
+    multicall = Multicall(web3_pp, batch_size=2)
+
+    token = w3.eth.contract(address=w3.to_checksum_address(_TOKEN_ADDR), abi=_VIEW_ABI)
+    fns = [token.functions.balanceOf(_ACCOUNT) for _ in range(3)]
+    fns.append(token.functions.getFixedRates())
+    exchange = (w3.to_checksum_address("0x" + "33" * 20), b"\x01" * 32)
+    return_datas = [w3.codec.encode(["uint256"], [bal]) for bal in [10, 11, 12]]
+    return_datas.append(w3.codec.encode(["(address,bytes32)[]"], [[exchange]]))
+
+    eth_calls = []
+
+    def _mock_eth_call(tx, *args, **kwargs):  # pylint: disable=unused-argument
+        assert tx["to"] == MULTICALL3_ADDRESS
+        n_prev = 2 * len(eth_calls)
+        eth_calls.append(tx)
+        outputs = [(True, data) for data in return_datas[n_prev : n_prev + 2]]
+        return w3.codec.encode(["(bool,bytes)[]"], [outputs])
+
+    w3.eth.call = _mock_eth_call  # type: ignore[method-assign]
+    results = multicall.call(fns)
+    assert results[:3] == [10, 11, 12]
+    assert list(results[3]) == [exchange]
+    assert multicall.n_rpc_calls == 2
+    assert multicall.call([]) == []
+
+
+@enforce_types
+def test_multicall_feed_reads():
+    """Reads across feeds: one multicall per round"""
+    feed_contracts = [Mock(), Mock()]
+    multicall = Mock()
+    multicall.address = MULTICALL3_ADDRESS
+
+    # curEpoch of each. secondsPerEpoch is memoized
+    multicall.call.return_value = [600, 7200]
+    feed_contracts[0].get_secondsPerEpoch.return_value = 300
+    feed_contracts[1].get_secondsPerEpoch.return_value = 3600
+    assert get_current_epochs(multicall, feed_contracts) == [2, 2]
+
+    # exchanges of each, then prices of each. Same exchange: 1 FixedRate
+    exchange = ("0x" + "33" * 20, b"\x01" * 32)
+    multicall.call.side_effect = [
+        [[exchange], [exchange]],
+        [(5, 0, 0, 0), (6, 0, 0, 0)],
+    ]
+    with patch("pdr_backend.contract.feed_contract.FixedRate") as mock_fixed_rate:
+        assert get_prices(multicall, feed_contracts) == [Wei(5), Wei(6)]
+    assert mock_fixed_rate.call_count == 1
+
+    # no Multicall3: one contract at a time
+    multicall.address = None
+    for c in feed_contracts:
+        c.get_current_epoch.return_value = 3
+        c.get_price.return_value = Wei(8)
+    assert get_current_epochs(multicall, feed_contracts) == [3, 3]
+    assert get_prices(multicall, feed_contracts) == [Wei(8), Wei(8)]
@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+
+import pytest
+from enforce_typing import enforce_types
+from web3.exceptions import TransactionNotFound
+
+from pdr_backend.contract.tx_pipeline import TxPipeline
+
+
+def _mock_web3_pp(mined: set) -> Mock:
+    """Mock Web3PP. Has receipts for the tx hashes in mined"""
+    web3_pp = Mock()
+    web3_pp.tx_call_params.side_effect = lambda: {"from": "0xOwner", "gasPrice": 10}
+    eth = web3_pp.web3_config.w3.eth
+    eth.get_transaction_count.return_value = 5
+
+    def _get_receipt(tx_hash):
+        if tx_hash not in mined:
+            raise TransactionNotFound(tx_hash)
+        return {"status": 1, "transactionHash": tx_hash}
+
+    eth.get_transaction_receipt.side_effect = _get_receipt
+    return web3_pp
+
+
+@enforce_types
+def test_tx_pipeline_nonces():
+    """Many txs in flight, at consecutive nonces. Receipts come later"""
+    mined: set = set()
+    web3_pp = _mock_web3_pp(mined)
+    pipeline = TxPipeline(web3_pp, poll_s=0.01)
+
+    sent = []
+
+    def _send_tx(call_params):
+        sent.append(call_params)
+        return f"0xhash{call_params['nonce']}"
+
+    futures = [pipeline.submit(f"tx{i}", _send_tx) for i in range(3)]
+    assert [call_params["nonce"] for call_params in sent] == [5, 6, 7]
+    assert pipeline.n_in_flight == 3
+    assert pipeline.poll() == []
+    web3_pp.web3_config.w3.eth.get_transaction_count.assert_called_once()
+
+    mined.update(["0xhash5", "0xhash6", "0xhash7"])
+    pipeline.wait_all(timeout=5.0)
+    assert [f.result()["transactionHash"] for f in futures] == [
+        "0xhash5",
+        "0xhash6",
+        "0xhash7",
+    ]
+    assert [name for name, _ in pipeline.poll()] == ["tx0", "tx1", "tx2"]
+    assert pipeline.n_in_flight == 0
+
+
+@enforce_types
+def test_tx_pipeline_resend():
+    """Send failure: retry with nonce from chain. Not mined: bump gas price"""
+    mined: set = set()
+    web3_pp = _mock_web3_pp(mined)
+    pipeline = TxPipeline(web3_pp, receipt_timeout_s=0.05, poll_s=0.01)
+
+    sent = []
+
+    def _send_tx(call_params):
+        sent.append(call_params)
+        if len(sent) == 1:
+            raise ValueError("nonce too low")
+        tx_hash = f"0xhash{len(sent)}"
+        if call_params["gasPrice"] > 10:
+            mined.add(tx_hash)
+        return tx_hash
+
+    receipt = pipeline.submit("tx", _send_tx).result(timeout=5.0)
+    assert receipt["transactionHash"] == "0xhash3"
+    assert [call_params["nonce"] for call_params in sent] == [5, 5, 5]
+    assert [call_params["gasPrice"] for call_params in sent] == [10, 10, 12]
+    assert web3_pp.web3_config.w3.eth.get_transaction_count.call_count == 2
+
+
+@enforce_types
+def test_tx_pipeline_give_up():
+    web3_pp = _mock_web3_pp(set())
+    pipeline = TxPipeline(web3_pp, receipt_timeout_s=0.0, max_tries=2, poll_s=0.01)
+
+    # never mined
+    assert pipeline.submit("tx", lambda _: "0xhash").result(timeout=5.0) is None
+    assert pipeline._nonce is None  # pylint: disable=protected-access
+
+    # never sent
+    def _fail(_):
+        raise ValueError("rpc down")
+
+    assert pipeline.submit("tx", _fail).result(timeout=5.0) is None
+    assert [name for name, _ in pipeline.poll()] == ["tx"]
+
+    with pytest.raises(ValueError):
+        TxPipeline(web3_pp, max_tries=0)
+    with pytest.raises(ValueError):
+        TxPipeline(web3_pp, gas_bump=0.9)
@@ -1,3 +1,5 @@
+from typing import List, Optional, Tuple
+
 from enforce_typing import enforce_types
 from web3.types import TxParams, Wei as Web3Wei
 
@@ -26,8 +28,15 @@ class Token(BaseContract):
             return tx
         return self.config.w3.eth.wait_for_transaction_receipt(tx)
 
-    def approve(self, spender, amount: Wei, wait_for_receipt=True):
-        call_params = self.web3_pp.tx_call_params()
+    def approve(
+        self,
+        spender,
+        amount: Wei,
+        wait_for_receipt=True,
+        call_params: Optional[dict] = None,
+    ):
+        if call_params is None:
+            call_params = self.web3_pp.tx_call_params()
         # print(f"Approving {amount} for {spender} on contract {self.contract_address}")
         tx = self.contract_instance.functions.approve(spender, amount.amt_wei).transact(
             call_params
@@ -71,3 +80,34 @@ class NativeToken:
         if not wait_for_receipt:
             return tx
         return self.w3.eth.wait_for_transaction_receipt(tx)
+
+
+@enforce_types
+def get_balances(
+    multicall, token: Token, native_token: NativeToken, accounts: List[str]
+) -> Tuple[List[Wei], List[Wei]]:
+    """
+    @description
+      Balances of each account, in token and in native token, in one
+      eth_call. Without Multicall3: one balance at a time, as usual.
+
+    @arguments
+      multicall -- Multicall
+      token -- eg OCEAN
+      native_token -- ROSE
+      accounts -- addresses to get balances of
+
+    @return
+      token_bals -- [i] : balance of accounts[i] in token
+      native_bals -- [i] : balance of accounts[i] in native token
+    """
+    if multicall.address is None:
+        return (
+            [token.balanceOf(account) for account in accounts],
+            [native_token.balanceOf(account) for account in accounts],
+        )
+
+    fns = [token.contract_instance.functions.balanceOf(a) for a in accounts]
+    fns += [multicall.eth_balance_fn(a) for a in accounts]
+    bals = [Wei(val) for val in multicall.call(fns)]
+    return bals[: len(accounts)], bals[len(accounts) :]
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from enforce_typing import enforce_types
+from web3.exceptions import TransactionNotFound
+
+logger = logging.getLogger("tx_pipeline")
+
+
+class TxPipeline:
+    """
+    Send txs without waiting for them to be mined.
+    - Nonces are tracked locally, so many txs can be in flight at once.
+      They get mined in the order they were submitted
+    - Receipts are awaited in background threads
+    - A tx that fails to send is retried, with the nonce re-synced from chain
+    - A tx that isn't mined within receipt_timeout_s is re-sent at the same
+      nonce with a gas price bumped by gas_bump, up to max_tries sends
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    @enforce_types
+    def __init__(
+        self,
+        web3_pp,
+        receipt_timeout_s: float = 30.0,
+        max_tries: int = 3,
+        gas_bump: float = 1.2,
+        poll_s: float = 1.0,
+    ):
+        """
+        @arguments
+          web3_pp -- Web3PP
+          receipt_timeout_s -- wait this long for a receipt before re-sending
+          max_tries -- max # sends per tx, incl re-sends
+          gas_bump -- multiply gas price by this at each re-send
+          poll_s -- time between receipt checks
+        """
+        if max_tries < 1:
+            raise ValueError(f"max_tries={max_tries} must be >= 1")
+        if gas_bump < 1.0:
+            raise ValueError(f"gas_bump={gas_bump} must be >= 1.0")
+
+        self.web3_pp = web3_pp
+        self.receipt_timeout_s = receipt_timeout_s
+        self.max_tries = max_tries
+        self.gas_bump = gas_bump
+        self.poll_s = poll_s
+
+        self._nonce: Optional[int] = None  # next nonce. None -> sync from chain
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(thread_name_prefix="tx")
+        self._in_flight: List[Tuple[str, Future]] = []  # (name, future)
+
+    @property
+    def w3(self):
+        return self.web3_pp.web3_config.w3
+
+    @property
+    def n_in_flight(self) -> int:
+        return sum(not future.done() for _, future in self._in_flight)
+
+    def submit(self, name: str, send_tx: Callable[[dict], Any]) -> Future:
+        """
+        @description
+          Send a tx at the next nonce, and return right away.
+          Its receipt is awaited in the background.
+
+        @arguments
+          name -- for logging, eg "submit_prediction slot=1704067200"
+          send_tx -- sends the tx given its call_params (incl "nonce" and
+            "gasPrice"), and returns its hash without waiting for the
+            receipt. Eg lambda call_params: token.approve(
+              spender, amt, wait_for_receipt=False, call_params=call_params)
+
+        @return
+          future -- resolves to the tx receipt; or None if the tx was never
+            sent or never mined
+        """
+        with self._lock:  # keep nonces in order of submission
+            call_params = self.web3_pp.tx_call_params()
+            tx_hash = None
+            for try_i in range(1, self.max_tries + 1):
+                call_params["nonce"] = self._next_nonce()
+                try:
+                    tx_hash = send_tx(dict(call_params))
+                    break
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.warning(
+                        "%s: couldn't send tx (try %d/%d): %s",
+                        name,
+                        try_i,
+                        self.max_tries,
+                        e,
+                    )
+                    self._nonce = None
+
+            if tx_hash is None:
+                logger.error("%s: gave up sending tx", name)
+                future: Future = Future()
+                future.set_result(None)
+                return future
+
+            self._nonce = call_params["nonce"] + 1
+
+        logger.info(
+            "%s: sent tx %s, nonce=%s", name, _hex(tx_hash), call_params["nonce"]
+        )
+        future = self._pool.submit(self._confirm, name, send_tx, call_params, tx_hash)
+        self._in_flight.append((name, future))
+        return future
+
+    def poll(self) -> List[Tuple[str, Optional[dict]]]:
+        """
+        @description
+          Forget txs that are done, and return them. Doesn't block.
+
+        @return
+          done -- list of (name, receipt or None), in order of submission
+        """
+        done = [(name, f) for name, f in self._in_flight if f.done()]
+        self._in_flight = [(name, f) for name, f in self._in_flight if not f.done()]
+        return [(name, f.result()) for name, f in done]
+
+    @enforce_types
+    def wait_all(self, timeout: Optional[float] = None):
+        """Block till all txs in flight are done. Eg at shutdown, or tests"""
+        for _, future in self._in_flight:
+            future.result(timeout=timeout)
+
+    def _next_nonce(self) -> int:
+        if self._nonce is None:
+            owner = self.web3_pp.web3_config.owner
+            self._nonce = self.w3.eth.get_transaction_count(owner, "pending")
+        return self._nonce  # type: ignore[return-value]
+
+    def _confirm(
+        self,
+        name: str,
+        send_tx: Callable[[dict], Any],
+        call_params: dict,
+        tx_hash,
+    ) -> Optional[dict]:
+        """Wait for the receipt of tx_hash, or of a re-send of it"""
+        tx_hashes = [tx_hash]
+        n_sends = 1
+        t_send = time.time()
+        while True:
+            for h in tx_hashes:
+                receipt = self._get_receipt(h)
+                if receipt is not None:
+                    if receipt["status"] != 1:
+                        logger.warning("%s: tx %s failed", name, _hex(h))
+                    return receipt
+
+            if time.time() - t_send < self.receipt_timeout_s:
+                time.sleep(self.poll_s)
+                continue
+
+            if n_sends >= self.max_tries:
+                logger.error("%s: tx not mined after %d sends", name, n_sends)
+                with self._lock:
+                    self._nonce = None  # it may have been dropped
+                return None
+
+            # re-send at the same nonce, so that only one of them gets mined
+            gas_price = call_params["gasPrice"]
+            bumped = max(int(gas_price * self.gas_bump), gas_price + 1)
+            call_params = dict(call_params, gasPrice=bumped)
+            n_sends += 1
+            t_send = time.time()
+            try:
+                tx_hashes.append(send_tx(dict(call_params)))
+                logger.info(
+                    "%s: re-sent tx with gasPrice=%d (send %d/%d)",
+                    name,
+                    bumped,
+                    n_sends,
+                    self.max_tries,
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # eg the previous send got mined meanwhile
+                logger.warning("%s: couldn't re-send tx: %s", name, e)
+
+    def _get_receipt(self, tx_hash) -> Optional[dict]:
+        try:
+            return self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.debug("Couldn't get receipt of tx %s: %s", _hex(tx_hash), e)
+            return None
+
+
+def _hex(tx_hash) -> str:
+    return tx_hash.hex() if isinstance(tx_hash, bytes) else str(tx_hash)
@@ -6,8 +6,9 @@ from typing import Dict, List, Tuple
 
 from enforce_typing import enforce_types
 
+from pdr_backend.contract.multicall import Multicall
 from pdr_backend.contract.predictoor_batcher import PredictoorBatcher
-from pdr_backend.contract.feed_contract import FeedContract
+from pdr_backend.contract.feed_contract import FeedContract, get_prices
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.subgraph.subgraph_consume_so_far import get_consume_so_far_per_contract
 from pdr_backend.subgraph.subgraph_feed import print_feeds
@@ -22,6 +23,7 @@ logger = logging.getLogger("dfbuyer_agent")
 
 @enforce_types
 class DFBuyerAgent:
+    # pylint: disable=too-many-instance-attributes
     def __init__(self, ppss: PPSS):
         # ppss
         self.ppss = ppss
@@ -48,6 +50,7 @@ class DFBuyerAgent:
         )
         self.fail_counter = 0
         self.batch_size = ppss.dfbuyer_ss.batch_size
+        self.multicall = Multicall(ppss.web3_pp)
 
         # Check allowance and approve if necessary
         logger.info("Checking allowance...")
@@ -258,9 +261,11 @@ class DFBuyerAgent:
         return bool(failures)
 
     def _get_prices(self, contract_addresses: List[str]) -> Dict[str, Eth]:
+        contracts = [FeedContract(self.ppss.web3_pp, a) for a in contract_addresses]
+        prices = get_prices(self.multicall, contracts)
         return {
-            address: FeedContract(self.ppss.web3_pp, address).get_price().to_eth()
-            for address in contract_addresses
+            address: price.to_eth()
+            for address, price in zip(contract_addresses, prices)
         }
 
     def _get_consume_so_far(self, ts: UnixTimeS) -> Dict[str, float]:
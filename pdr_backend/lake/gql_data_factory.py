@@ -7,7 +7,7 @@ from enforce_typing import enforce_types
 from pdr_backend.lake.csv_data_store import CSVDataStore
 from pdr_backend.lake.duckdb_data_store import DuckDBDataStore
 from pdr_backend.lake.lake_mapper import LakeMapper
-from pdr_backend.lake.payout import Payout
+from pdr_backend.lake.payout import Payout, add_missing_contract_column
 from pdr_backend.lake.plutil import _object_list_to_df
 from pdr_backend.lake.prediction import Prediction
 from pdr_backend.lake.table import Table, NewEventsTable
@@ -270,6 +270,9 @@ class GQLDataFactory:
 
         fin_ut = self.ppss.lake_ss.fin_timestamp
 
+        # older lakes: bring pdr_payouts up to the current schema
+        add_missing_contract_column(self.ppss.lake_ss.lake_dir)
+
         for dataclass in _GQLDF_REGISTERED_LAKE_TABLES:
             # calculate start and end timestamps
             table = Table.from_dataclass(dataclass)
@@ -29,6 +29,26 @@ from pdr_backend.util.time_types import UnixTimeMs
 logger = logging.getLogger("ohlcv_data_factory")
 
 
+@enforce_types
+def rawohlcv_filename(
+    lake_dir: str, exch_str: str, pair_str: str, timeframe_str: str
+) -> str:
+    """
+    @description
+      Filename of the rawohlcv data for one (exchange, pair, timeframe)
+
+    @arguments
+      lake_dir -- eg ppss.lake_ss.lake_dir
+      exch_str -- eg "binance"
+      pair_str -- eg "BTC/USDT". '/' becomes '-' in the filename
+      timeframe_str -- eg "5m"
+    """
+    assert "/" in pair_str or "-" in pair_str, pair_str
+    pair_str = pair_str.replace("/", "-")  # filesystem needs "-"
+    basename = f"{exch_str}_{pair_str}_{timeframe_str}.parquet"
+    return os.path.join(lake_dir, basename)
+
+
 @enforce_types
 class OhlcvDataFactory:
     """
@@ -267,12 +287,9 @@ class OhlcvDataFactory:
         @notes
           If pair_str has '/', it will become '-' in the filename.
         """
-        pair_str = str(feed.pair)
-        assert "/" in str(pair_str) or "-" in pair_str, pair_str
-        pair_str = str(pair_str).replace("/", "-")  # filesystem needs "-"
-        basename = f"{feed.exchange}_{pair_str}_{feed.timeframe}.parquet"
-        filename = os.path.join(self.ss.lake_dir, basename)
-        return filename
+        return rawohlcv_filename(
+            self.ss.lake_dir, str(feed.exchange), str(feed.pair), str(feed.timeframe)
+        )
 
     def _volbar_filename(self, feed: ArgFeed) -> str:
         """
@@ -1,12 +1,20 @@
+import logging
+import os
 from collections import OrderedDict
 from typing import Callable, List
 
+import polars as pl
 from enforce_typing import enforce_types
 from polars import Boolean, Float64, Int64, Utf8
 
+from pdr_backend.lake.csv_data_store import CSVDataStore
+from pdr_backend.lake.duckdb_data_store import DuckDBDataStore
 from pdr_backend.lake.lake_mapper import LakeMapper
+from pdr_backend.lake.table import Table, TableType
 from pdr_backend.util.time_types import UnixTimeS
 
+logger = logging.getLogger("payout")
+
 
 @enforce_types
 class Payout(LakeMapper):  # pylint: disable=too-many-instance-attributes
@@ -22,6 +30,7 @@ class Payout(LakeMapper):  # pylint: disable=too-many-instance-attributes
         predvalue: bool,
         truevalue: bool,
         stake: float,
+        contract: str,
     ) -> None:
         self.ID = ID
         self.user = user
@@ -32,6 +41,7 @@ class Payout(LakeMapper):  # pylint: disable=too-many-instance-attributes
         self.predvalue = predvalue
         self.truevalue = truevalue
         self.stake = stake
+        self.contract = contract
 
         self.check_against_schema()
 
@@ -48,6 +58,8 @@ class Payout(LakeMapper):  # pylint: disable=too-many-instance-attributes
                 "predvalue": Boolean,
                 "truevalue": Boolean,
                 "stake": Float64,
+                # last, so that adding it to older lakes keeps column order
+                "contract": Utf8,
             }
         )
 
@@ -89,9 +101,46 @@ def mock_payout(payout_tuple: tuple) -> Payout:
         predvalue=predvalue,
         truevalue=truevalue,
         stake=stake,
+        contract=ID.split("-")[0],
     )
 
 
+@enforce_types
+def add_missing_contract_column(lake_dir: str):
+    """
+    @description
+      Lakes written before pdr_payouts had a "contract" column lack it.
+      Add it to the payouts db tables and csv files, backfilled from the
+      payout ID, which is <contract>-<slot>-<user>. No-op if it's there.
+    """
+    db = DuckDBDataStore(lake_dir)
+    table_names = db.get_table_names()
+    for table_type in TableType:
+        table_name = Table(Payout.get_lake_table_name(), table_type).table_name
+        if table_name not in table_names:
+            continue
+        n_found = db.query_scalar(
+            "SELECT COUNT(*) FROM information_schema.columns"
+            f" WHERE table_name = '{table_name}' AND column_name = 'contract'"
+        )
+        if n_found > 0:
+            continue
+        logger.info("Add column contract to db table %s", table_name)
+        db.execute_sql(f"ALTER TABLE {table_name} ADD COLUMN contract VARCHAR")
+        db.execute_sql(f"UPDATE {table_name} SET contract = split_part(ID, '-', 1)")
+
+    csvds = CSVDataStore(lake_dir, Payout.get_lake_table_name())
+    for file_path in csvds.get_file_paths():
+        if os.path.getsize(file_path) == 0:
+            continue
+        df = pl.read_csv(file_path)
+        if "contract" in df.columns:
+            continue
+        logger.info("Add column contract to csv file %s", file_path)
+        df = df.with_columns(pl.col("ID").str.split("-").list.first().alias("contract"))
+        df.write_csv(file_path)
+
+
 @enforce_types
 def mock_payouts() -> List[Payout]:
     return [mock_payout(payout_tuple) for payout_tuple in _PAYOUT_TUPS]
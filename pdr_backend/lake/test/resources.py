@@ -298,6 +298,11 @@ def create_sample_raw_data(path: str):
     subscriptions_schema_order = list(Subscription.get_lake_schema().keys())
     slots_schema_order = list(Slot.get_lake_schema().keys())
 
+    # the sample payouts predate the contract column. Derive it from ID
+    payouts_df = payouts_df.with_columns(
+        pl.col("ID").str.split("-").list.first().alias("contract")
+    )
+
     predictions_df = predictions_df[predictions_schema_order]
     payouts_df = payouts_df[payouts_schema_order]
     truevals_df = truevals_df[truevals_schema_order]
@@ -0,0 +1,53 @@
+import os
+
+import polars as pl
+from enforce_typing import enforce_types
+
+from pdr_backend.lake.duckdb_data_store import DuckDBDataStore
+from pdr_backend.lake.payout import (
+    Payout,
+    add_missing_contract_column,
+    mock_payouts,
+)
+from pdr_backend.lake.plutil import _object_list_to_df
+
+
+@enforce_types
+def test_payouts():
+    payouts = mock_payouts()
+    assert len(payouts) == 6
+    assert isinstance(payouts[0], Payout)
+    assert payouts[0].contract == "0x18f54cc21b7a2fdd011bea06bba7801b280e3151"
+    assert payouts[0].ID.startswith(payouts[0].contract + "-")
+
+
+@enforce_types
+def test_add_missing_contract_column(tmpdir):
+    lake_dir = str(tmpdir)
+    new_df = _object_list_to_df(mock_payouts())
+    old_df = new_df.drop("contract")  # as written before the column existed
+
+    db = DuckDBDataStore(lake_dir)
+    db.create_from_df(old_df, "pdr_payouts")
+    csv_dir = os.path.join(lake_dir, "pdr_payouts")
+    os.makedirs(csv_dir)
+    csv_file = os.path.join(csv_dir, "pdr_payouts_from_0000000001_to_.csv")
+    old_df.write_csv(csv_file)
+
+    add_missing_contract_column(lake_dir)
+    add_missing_contract_column(lake_dir)  # no-op the 2nd time
+
+    # db: backfilled from ID, and columns line up with the lake schema
+    df = db.query_data("SELECT * FROM pdr_payouts")
+    assert df.columns == list(Payout.get_lake_schema().keys())
+    assert df["contract"].to_list() == new_df["contract"].to_list()
+
+    # so new rows append by position, as the ETL does
+    db.insert_from_df(new_df, "pdr_payouts")
+    contract = new_df["contract"][0]
+    df = db.query_data(f"SELECT * FROM pdr_payouts WHERE contract = '{contract}'")
+    assert len(df) == 2 * len(new_df)
+
+    # csv files too
+    csv_df = pl.read_csv(csv_file, schema=Payout.get_lake_schema())
+    assert csv_df["contract"].to_list() == new_df["contract"].to_list()
@@ -1,5 +1,6 @@
 import logging
 import time
+from functools import partial
 from typing import Any, List
 
 from enforce_typing import enforce_types
@@ -60,10 +61,13 @@ def request_payout_batches(
 
 
 @enforce_types
-def find_slots_and_payout_with_mgr(pred_submitter_mgr, ppss, query_old_slots=False):
+def find_slots_and_payout_with_mgr(
+    pred_submitter_mgr, ppss, query_old_slots=False, tx_pipeline=None
+):
     # we only need to query in one direction, since both predict on the same slots
     # query_old_slots is by default false to improve bot speed,
     # running the command line argument will set it to true
+    # with a TxPipeline, payout txs are sent without waiting for receipts
     up_addr = pred_submitter_mgr.pred_submitter_up_address()
     web3_config = ppss.web3_pp.web3_config
     subgraph_url: str = ppss.web3_pp.subgraph_url
@@ -85,13 +89,25 @@ def find_slots_and_payout_with_mgr(pred_submitter_mgr, ppss, query_old_slots=Fal
     for slot_tuple in shared_slots:
         contract_addrs, slots = slot_tuple
         contract_addrs = to_checksum(ppss.web3_pp.w3, contract_addrs)
-        tx = pred_submitter_mgr.get_payout(slots, contract_addrs)
         cur_index = shared_slots.index(slot_tuple)
         progress = f"{cur_index + 1}/{len(shared_slots)}"
+        if tx_pipeline is not None:
+            tx_pipeline.submit(
+                f"payout {progress}",
+                partial(_send_payout, pred_submitter_mgr, slots, contract_addrs),
+            )
+            continue
+        tx = pred_submitter_mgr.get_payout(slots, contract_addrs)
         logger.info("Payout tx %s: %s", progress, tx["transactionHash"].hex())
     logger.info("Payout done")
 
 
+def _send_payout(pred_submitter_mgr, slots, contract_addrs, call_params: dict):
+    return pred_submitter_mgr.get_payout(
+        slots, contract_addrs, wait_for_receipt=False, call_params=call_params
+    )
+
+
 @enforce_types
 def do_ocean_payout(ppss: PPSS, check_network: bool = True):
     web3_config = ppss.web3_pp.web3_config
@@ -11,6 +11,7 @@ from pdr_backend.payout.payout import (
     do_ocean_payout,
     do_rose_payout,
     do_usdc_payout,
+    find_slots_and_payout_with_mgr,
     request_payout_batches,
 )
 from pdr_backend.ppss.ppss import PPSS, fast_test_yaml_str
@@ -84,6 +85,32 @@ def test_do_ocean_payout(tmpdir):
         assert len(call_args) == 3
 
 
+@enforce_types
+def test_payout_with_tx_pipeline(tmpdir):
+    """Payout txs go to the pipeline, rather than waiting for each receipt"""
+    ppss = _ppss(tmpdir)
+    mock_addr = "0x0000000000000000000000000000000000000000"
+    mock_contract = Mock(spec=PredSubmitterMgr)
+    mock_contract.pred_submitter_up_address.return_value = "0x1"
+    tx_pipeline = Mock()
+
+    with patch("pdr_backend.payout.payout.wait_until_subgraph_syncs"), patch(
+        "pdr_backend.payout.payout.query_pending_payouts",
+        return_value={mock_addr: [1, 2, 3]},
+    ):
+        find_slots_and_payout_with_mgr(mock_contract, ppss, True, tx_pipeline)
+
+    assert tx_pipeline.submit.call_count == 1
+    name, send_tx = tx_pipeline.submit.call_args.args
+    assert name == "payout 1/1"
+    mock_contract.get_payout.assert_not_called()
+
+    send_tx({"nonce": 7})
+    mock_contract.get_payout.assert_called_once_with(
+        [1, 2, 3], [mock_addr], wait_for_receipt=False, call_params={"nonce": 7}
+    )
+
+
 @enforce_types
 def test_do_rose_payout(tmpdir):
     ppss = _ppss(tmpdir)
@@ -35,6 +35,7 @@ CALIBRATE_PROBS_OPTIONS = [
     "None",
 ]
 CALIBRATE_REGR_OPTIONS = ["CurrentYval", "None"]
+CALC_IMPS_METHOD_OPTIONS = ["Auto", "Permutation"]
 
 
 class AimodelSS(StrMixin):
@@ -56,6 +57,14 @@ class AimodelSS(StrMixin):
             raise ValueError(self.calibrate_probs)
         if self.calibrate_regr not in CALIBRATE_REGR_OPTIONS:
             raise ValueError(self.calibrate_regr)
+        if self.calc_imps_method not in CALC_IMPS_METHOD_OPTIONS:
+            raise ValueError(self.calc_imps_method)
+        if self.calc_imps_n_repeats <= 0:
+            raise ValueError(self.calc_imps_n_repeats)
+        if self.calc_imps_max_samples <= 0:
+            raise ValueError(self.calc_imps_max_samples)
+        if self.cache_max_mb < 0:
+            raise ValueError(self.cache_max_mb)
         self.validate_train_every_n_epochs(self.train_every_n_epochs)
 
     # --------------------------------
@@ -101,6 +110,36 @@ class AimodelSS(StrMixin):
         """Calc feature importances"""
         return self.d.get("calc_imps", True)
 
+    @property
+    def calc_imps_method(self) -> str:
+        """
+        How to calc feature importances, eg 'Auto'.
+        - Auto: coefficients for linear models, native gain for xgboost,
+          subsampled permutation otherwise
+        - Permutation: always use subsampled permutation
+        """
+        return self.d.get("calc_imps_method", "Auto")
+
+    @property
+    def calc_imps_n_repeats(self) -> int:
+        """# repeats for permutation importances, eg 10"""
+        return int(self.d.get("calc_imps_n_repeats", 10))
+
+    @property
+    def calc_imps_max_samples(self) -> int:
+        """Max # samples drawn per permutation repeat, eg 1000"""
+        return int(self.d.get("calc_imps_max_samples", 1000))
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """Dir to cache fitted models in, eg 'aimodel_cache'. None = no cache"""
+        return self.d.get("cache_dir", None) or None
+
+    @property
+    def cache_max_mb(self) -> float:
+        """Evict least-recently-used cached models beyond this size, eg 500"""
+        return float(self.d.get("cache_max_mb", 500))
+
     def calibrate_probs_skmethod(self, N: int) -> str:
         """
         @description
@@ -1,6 +1,8 @@
 import logging
-from typing import Optional
+import os
+from typing import List, Optional
 
+import numpy as np
 from enforce_typing import enforce_types
 
 from pdr_backend.util.dictutil import keyval
@@ -10,7 +12,14 @@ from pdr_backend.util.strutil import StrMixin
 
 logger = logging.getLogger("multisim_ss")
 
-APPROACH_OPTIONS = ["SimpleSweep"]  # future: "FastSweep" too
+APPROACH_OPTIONS = ["SimpleSweep", "FastSweep", "RollingCV"]
+METRIC_OPTIONS = [
+    "pdr_profit_OCEAN",
+    "trader_profit_USD",
+    "acc_est",
+    "f1",
+    "loss",
+]
 
 
 class MultisimSS(StrMixin):
@@ -22,6 +31,25 @@ class MultisimSS(StrMixin):
 
         if self.approach not in APPROACH_OPTIONS:
             raise ValueError(self.approach)
+        n_workers = self.d.get("n_workers", 1)
+        if not isinstance(n_workers, int) or n_workers < 0:
+            raise ValueError(n_workers)
+        if self.fast_sweep_metric not in METRIC_OPTIONS:
+            raise ValueError(self.fast_sweep_metric)
+        if not 0.0 < self.fast_sweep_keep_frac < 1.0:
+            raise ValueError(self.fast_sweep_keep_frac)
+        if not isinstance(self.fast_sweep_min_test_n, int):
+            raise TypeError(self.fast_sweep_min_test_n)
+        if self.fast_sweep_min_test_n <= 0:
+            raise ValueError(self.fast_sweep_min_test_n)
+        if self.rolling_cv_metric not in METRIC_OPTIONS:
+            raise ValueError(self.rolling_cv_metric)
+        if not isinstance(self.rolling_cv_n_folds, int):
+            raise TypeError(self.rolling_cv_n_folds)
+        if self.rolling_cv_n_folds < 2:
+            raise ValueError(self.rolling_cv_n_folds)
+        if self.approach != "SimpleSweep" and "sim_ss.test_n" in self.point_meta:
+            raise ValueError(f"{self.approach} sets sim_ss.test_n; can't sweep it")
 
         assert self.point_meta.n_points > 1
 
@@ -36,6 +64,47 @@ class MultisimSS(StrMixin):
     def sweep_params(self) -> list:
         return self.d["sweep_params"]
 
+    @property
+    def n_workers(self) -> int:
+        """# sim processes to run in parallel. In yaml, 0 means # cpu cores"""
+        n_workers = self.d.get("n_workers", 1)
+        if n_workers == 0:
+            return os.cpu_count() or 1
+        return n_workers
+
+    @property
+    def csv_file(self) -> Optional[str]:
+        """
+        Metrics csv to write to. If None, a new timestamped file in log_dir.
+        If the file exists already, runs recorded in it are skipped (resume)
+        """
+        return self.d.get("csv_file")
+
+    @property
+    def fast_sweep_metric(self) -> str:
+        """FastSweep keeps the points that are best by this metric"""
+        return self.d.get("fast_sweep", {}).get("metric", "pdr_profit_OCEAN")
+
+    @property
+    def fast_sweep_keep_frac(self) -> float:
+        """FastSweep keeps this top fraction of points at each rung"""
+        return self.d.get("fast_sweep", {}).get("keep_frac", 0.33)
+
+    @property
+    def fast_sweep_min_test_n(self) -> int:
+        """FastSweep's test_n at the first rung"""
+        return self.d.get("fast_sweep", {}).get("min_test_n", 100)
+
+    @property
+    def rolling_cv_n_folds(self) -> int:
+        """RollingCV's # forward-chained folds"""
+        return self.d.get("rolling_cv", {}).get("n_folds", 4)
+
+    @property
+    def rolling_cv_metric(self) -> str:
+        """RollingCV ranks points by this metric, averaged across folds"""
+        return self.d.get("rolling_cv", {}).get("metric", "loss")
+
     # --------------------------------
     # derivative properties
     @property
@@ -62,6 +131,39 @@ class MultisimSS(StrMixin):
     def point_i(self, i: int) -> Point:
         return self.point_meta.point_i(i)
 
+    @enforce_types
+    def rung_test_ns(self, test_n: int) -> List[int]:
+        """
+        @description
+          Return FastSweep's test_n at each rung. It starts at min_test_n,
+          and grows by 1/keep_frac per rung. The last rung is at test_n.
+
+        @arguments
+          test_n -- full-length sim's test_n. Eg from sim_ss
+        """
+        rung_test_ns = []
+        rung_test_n = self.fast_sweep_min_test_n
+        while rung_test_n < test_n:
+            rung_test_ns.append(rung_test_n)
+            rung_test_n = int(np.ceil(rung_test_n / self.fast_sweep_keep_frac))
+        rung_test_ns.append(test_n)
+        return rung_test_ns
+
+    @enforce_types
+    def fold_n_drops(self, test_n: int) -> List[int]:
+        """
+        @description
+          Return RollingCV's # most recent rows of data to drop, per fold.
+          Fold k simulates the k-th of n_folds consecutive windows of test_n
+          iterations, oldest first, that end at the most recent data.
+          Every iteration trains only on data before it.
+
+        @arguments
+          test_n -- # iterations per fold. Eg from sim_ss
+        """
+        n_folds = self.rolling_cv_n_folds
+        return [(n_folds - 1 - fold) * test_n for fold in range(n_folds)]
+
 
 # =========================================================================
 # utilities for testing
@@ -71,6 +173,10 @@ class MultisimSS(StrMixin):
 def multisim_ss_test_dict(
     approach: Optional[str] = None,
     sweep_params: Optional[list] = None,
+    n_workers: int = 1,
+    csv_file: Optional[str] = None,
+    fast_sweep: Optional[dict] = None,
+    rolling_cv: Optional[dict] = None,
 ) -> dict:
     approach = approach or "SimpleSweep"
     sweep_params = sweep_params or [
@@ -79,5 +185,10 @@ def multisim_ss_test_dict(
     d = {
         "approach": approach,
         "sweep_params": sweep_params,
+        "n_workers": n_workers,
+        "csv_file": csv_file,
+        "fast_sweep": fast_sweep
+        or {"metric": "pdr_profit_OCEAN", "keep_frac": 0.33, "min_test_n": 100},
+        "rolling_cv": rolling_cv or {"n_folds": 4, "metric": "loss"},
     }
     return d
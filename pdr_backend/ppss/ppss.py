@@ -294,4 +294,10 @@ def fast_test_yaml_str(tmpdir=None):
         assert "log_dir: logs" in s
         s = s.replace("log_dir: logs", f"log_dir: {os.path.join(tmpdir, 'logs')}")
 
+        assert "cache_dir: aimodel_cache" in s
+        s = s.replace(
+            "cache_dir: aimodel_cache",
+            f"cache_dir: {os.path.join(tmpdir, 'aimodel_cache')}",
+        )
+
     return s
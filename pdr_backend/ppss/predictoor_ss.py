@@ -1,3 +1,4 @@
+import os
 from typing import Dict, List, Optional
 
 from enforce_typing import enforce_types
@@ -38,6 +39,16 @@ class PredictoorSS(StrMixin):
             s = f"Allowed approaches={CAND_APPROACHES}, got {self.approach}"
             raise ValueError(s)
 
+        n_train_workers = self.d["bot_only"].get("n_train_workers", 0)
+        if not isinstance(n_train_workers, int) or n_train_workers < 0:
+            s = f"n_train_workers must be an int >= 0, got {n_train_workers}"
+            raise ValueError(s)
+
+        if not 0 <= self.predict_deadline_s <= self.train_deadline_s:
+            s = "Need 0 <= predict_deadline_s <= train_deadline_s, got "
+            s += f"{self.predict_deadline_s}, {self.train_deadline_s}"
+            raise ValueError(s)
+
     # ------------------------------------------------------------------
     # yaml properties
     @property
@@ -106,6 +117,29 @@ class PredictoorSS(StrMixin):
     def min_payout_slots(self) -> int:
         return self.d["bot_only"].get("min_payout_slots", 0)
 
+    @property
+    def n_train_workers(self) -> int:
+        """# models to train in parallel. In yaml, 0 means # cpu cores"""
+        n_train_workers = self.d["bot_only"].get("n_train_workers", 0)
+        if n_train_workers == 0:
+            return os.cpu_count() or 1
+        return n_train_workers
+
+    @property
+    def pretrain(self) -> bool:
+        """Train models early in the epoch, before it's time to predict?"""
+        return self.d["bot_only"].get("pretrain", True)
+
+    @property
+    def train_deadline_s(self) -> int:
+        """Wait for training until this many s before epoch end, at most"""
+        return self.d["bot_only"].get("train_deadline_s", 20)
+
+    @property
+    def predict_deadline_s(self) -> int:
+        """Predictions should be ready by this many s before epoch end"""
+        return self.d["bot_only"].get("predict_deadline_s", 10)
+
     @property
     def my_addresses(self) -> List[str]:
         return self.d.get("my_addresses", [])
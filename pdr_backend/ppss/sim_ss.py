@@ -29,6 +29,9 @@ class SimSS(StrMixin):
         # validate data
         self.validate_test_n(self.test_n)
         self.validate_tradetype(self.tradetype)
+        self.validate_vectorized(self.vectorized, self.tradetype)
+        self.validate_log_every_n_iters(self.log_every_n_iters)
+        self.validate_plot_resolution(self.plot_resolution)
 
     # --------------------------------
     # validators
@@ -46,6 +49,27 @@ class SimSS(StrMixin):
         if tradetype not in TRADETYPE_OPTIONS:
             raise ValueError(tradetype)
 
+    @staticmethod
+    def validate_vectorized(vectorized: bool, tradetype: str):
+        if not isinstance(vectorized, bool):
+            raise TypeError(vectorized)
+        if vectorized and tradetype != "histmock":
+            raise ValueError("vectorized sim needs tradetype histmock")
+
+    @staticmethod
+    def validate_log_every_n_iters(log_every_n_iters: int):
+        if not isinstance(log_every_n_iters, int):
+            raise TypeError(log_every_n_iters)
+        if log_every_n_iters < 0:
+            raise ValueError(log_every_n_iters)
+
+    @staticmethod
+    def validate_plot_resolution(plot_resolution: int):
+        if not isinstance(plot_resolution, int):
+            raise TypeError(plot_resolution)
+        if plot_resolution < 2:
+            raise ValueError(plot_resolution)
+
     # --------------------------------
     # properties direct from yaml dict
     @property
@@ -68,6 +92,21 @@ class SimSS(StrMixin):
     def use_own_model(self) -> bool:
         return self.d["use_own_model"]
 
+    @property
+    def vectorized(self) -> bool:
+        """Compute the whole test_n window in array ops, vs 1 iter at a time?"""
+        return self.d.get("vectorized", False)
+
+    @property
+    def log_every_n_iters(self) -> int:
+        """Log a status line every n iters. 0 = only at the final iter"""
+        return self.d.get("log_every_n_iters", 0)
+
+    @property
+    def plot_resolution(self) -> int:
+        """# mesh points per swept var, for the model response plot"""
+        return self.d.get("plot_resolution", 200)
+
     # --------------------------------
     # derived methods
     def is_final_iter(self, iter_i: int) -> bool:
@@ -76,6 +115,13 @@ class SimSS(StrMixin):
             raise ValueError(iter_i)
         return (iter_i + 1) == self.test_n
 
+    def do_log_iter(self, iter_i: int) -> bool:
+        """Log a status line at iteration 'iter_i'?"""
+        if self.is_final_iter(iter_i):
+            return True
+        n = self.log_every_n_iters
+        return n > 0 and (iter_i + 1) % n == 0
+
     # --------------------------------
     # setters
     def set_test_n(self, test_n: int):
@@ -84,8 +130,13 @@ class SimSS(StrMixin):
 
     def set_tradetype(self, tradetype: str):
         self.validate_tradetype(tradetype)
+        self.validate_vectorized(self.vectorized, tradetype)
         self.d["tradetype"] = tradetype
 
+    def set_vectorized(self, vectorized: bool):
+        self.validate_vectorized(vectorized, self.tradetype)
+        self.d["vectorized"] = vectorized
+
 
 # =========================================================================
 # utilities for testing
@@ -97,11 +148,17 @@ def sim_ss_test_dict(
     use_own_model: Optional[bool] = True,
     test_n: Optional[int] = None,
     tradetype: Optional[str] = None,
+    vectorized: bool = False,
+    log_every_n_iters: int = 0,
+    plot_resolution: int = 200,
 ) -> dict:
     d = {
         "log_dir": log_dir,
         "use_own_model": use_own_model,
         "test_n": test_n or 10,
         "tradetype": tradetype or "histmock",
+        "vectorized": vectorized,
+        "log_every_n_iters": log_every_n_iters,
+        "plot_resolution": plot_resolution,
     }
     return d
@@ -5,6 +5,7 @@ from pdr_backend.ppss.aimodel_ss import (
     AimodelSS,
     aimodel_ss_test_dict,
     APPROACH_OPTIONS,
+    CALC_IMPS_METHOD_OPTIONS,
     CALIBRATE_PROBS_OPTIONS,
     CALIBRATE_REGR_OPTIONS,
     BALANCE_CLASSES_OPTIONS,
@@ -27,6 +28,10 @@ def test_aimodel_ss__default_values():
     )
     assert ss.calibrate_regr == d["calibrate_regr"] == "None"
     assert ss.train_every_n_epochs == d["train_every_n_epochs"] == 1
+    assert ss.calc_imps
+    assert ss.calc_imps_method == "Auto"
+    assert ss.calc_imps_n_repeats == 10
+    assert ss.calc_imps_max_samples == 1000
 
     # str
     assert "AimodelSS" in str(ss)
@@ -69,6 +74,19 @@ def test_aimodel_ss__nondefault_values():
     ss = AimodelSS(aimodel_ss_test_dict(train_every_n_epochs=44))
     assert ss.train_every_n_epochs == 44
 
+    for calc_imps_method in CALC_IMPS_METHOD_OPTIONS:
+        d = aimodel_ss_test_dict()
+        d["calc_imps_method"] = calc_imps_method
+        ss = AimodelSS(d)
+        assert ss.calc_imps_method == calc_imps_method
+
+    d = aimodel_ss_test_dict()
+    d["calc_imps_n_repeats"] = 3
+    d["calc_imps_max_samples"] = 200
+    ss = AimodelSS(d)
+    assert ss.calc_imps_n_repeats == 3
+    assert ss.calc_imps_max_samples == 200
+
 
 @enforce_types
 def test_aimodel_ss__bad_inputs():
@@ -94,6 +112,16 @@ def test_aimodel_ss__bad_inputs():
     with pytest.raises(ValueError):
         AimodelSS(aimodel_ss_test_dict(train_every_n_epochs=-5))
 
+    for key, bad_val in [
+        ("calc_imps_method", "foo"),
+        ("calc_imps_n_repeats", 0),
+        ("calc_imps_max_samples", 0),
+    ]:
+        d = aimodel_ss_test_dict()
+        d[key] = bad_val
+        with pytest.raises(ValueError):
+            AimodelSS(d)
+
 
 @enforce_types
 def test_aimodel_ss__calibrate_probs_skmethod():
@@ -147,3 +147,86 @@ def test_multisim_ss_points2_sweepfeeds():
     assert len(points) == 6
     for target_p in target_points:
         assert obj_in_objlist(target_p, points)
+
+
+@enforce_types
+def test_multisim_ss_n_workers_csv_file():
+    ss = MultisimSS(multisim_ss_test_dict())
+    assert ss.n_workers == 1
+    assert ss.csv_file is None
+
+    ss = MultisimSS(multisim_ss_test_dict(n_workers=4, csv_file="out.csv"))
+    assert ss.n_workers == 4
+    assert ss.csv_file == "out.csv"
+
+    ss = MultisimSS(multisim_ss_test_dict(n_workers=0))  # 0 = # cpu cores
+    assert ss.n_workers >= 1
+
+    d = multisim_ss_test_dict()
+    d["n_workers"] = -1
+    with pytest.raises(ValueError):
+        MultisimSS(d)
+
+
+@enforce_types
+def test_multisim_ss_fast_sweep():
+    ss = MultisimSS(multisim_ss_test_dict(approach="FastSweep"))
+    assert ss.approach == "FastSweep"
+    assert ss.fast_sweep_metric == "pdr_profit_OCEAN"
+    assert ss.fast_sweep_keep_frac == 0.33
+    assert ss.fast_sweep_min_test_n == 100
+
+    # defaults if not in yaml
+    d = multisim_ss_test_dict()
+    del d["fast_sweep"]
+    assert MultisimSS(d).fast_sweep_metric == "pdr_profit_OCEAN"
+
+    # rungs
+    fast_sweep = {"metric": "loss", "keep_frac": 0.25, "min_test_n": 10}
+    ss = MultisimSS(multisim_ss_test_dict("FastSweep", fast_sweep=fast_sweep))
+    assert ss.fast_sweep_metric == "loss"
+    assert ss.rung_test_ns(1000) == [10, 40, 160, 640, 1000]
+    assert ss.rung_test_ns(640) == [10, 40, 160, 640]
+    assert ss.rung_test_ns(5) == [5]
+
+    # bad inputs
+    for bad_fast_sweep, error in [
+        ({"metric": "foo"}, ValueError),
+        ({"keep_frac": 1.0}, ValueError),
+        ({"keep_frac": 0.0}, ValueError),
+        ({"min_test_n": 0}, ValueError),
+        ({"min_test_n": 2.5}, TypeError),
+    ]:
+        with pytest.raises(error):
+            MultisimSS(multisim_ss_test_dict(fast_sweep=bad_fast_sweep))
+
+    sweep_params = [{"sim_ss.test_n": "100, 200"}]
+    with pytest.raises(ValueError):
+        MultisimSS(multisim_ss_test_dict("FastSweep", sweep_params=sweep_params))
+
+
+@enforce_types
+def test_multisim_ss_rolling_cv():
+    ss = MultisimSS(multisim_ss_test_dict(approach="RollingCV"))
+    assert ss.approach == "RollingCV"
+    assert ss.rolling_cv_n_folds == 4
+    assert ss.rolling_cv_metric == "loss"
+    assert ss.fold_n_drops(100) == [300, 200, 100, 0]
+
+    # defaults if not in yaml
+    d = multisim_ss_test_dict()
+    del d["rolling_cv"]
+    assert MultisimSS(d).rolling_cv_n_folds == 4
+
+    # bad inputs
+    for bad_rolling_cv, error in [
+        ({"metric": "foo"}, ValueError),
+        ({"n_folds": 1}, ValueError),
+        ({"n_folds": 2.0}, TypeError),
+    ]:
+        with pytest.raises(error):
+            MultisimSS(multisim_ss_test_dict(rolling_cv=bad_rolling_cv))
+
+    sweep_params = [{"sim_ss.test_n": "100, 200"}]
+    with pytest.raises(ValueError):
+        MultisimSS(multisim_ss_test_dict("RollingCV", sweep_params=sweep_params))
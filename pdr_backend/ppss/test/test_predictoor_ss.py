@@ -43,6 +43,42 @@ def test_predictoor_ss_main():
     assert ss.get_predict_train_feedset("foo", "BTC/USDT", "5m") is None
 
 
+@enforce_types
+def test_predictoor_ss_n_train_workers():
+    d = predictoor_ss_test_dict()
+    assert PredictoorSS(d).n_train_workers >= 1  # default: 0 -> # cpu cores
+
+    d["bot_only"]["n_train_workers"] = 3
+    assert PredictoorSS(d).n_train_workers == 3
+
+    for bad_val in [-1, 1.5, "2"]:
+        d["bot_only"]["n_train_workers"] = bad_val
+        with pytest.raises(ValueError):
+            PredictoorSS(d)
+
+
+@enforce_types
+def test_predictoor_ss_pretrain_deadlines():
+    d = predictoor_ss_test_dict()
+    ss = PredictoorSS(d)
+    assert ss.pretrain
+    assert ss.train_deadline_s == 20
+    assert ss.predict_deadline_s == 10
+
+    d["bot_only"]["pretrain"] = False
+    d["bot_only"]["train_deadline_s"] = 15
+    d["bot_only"]["predict_deadline_s"] = 15
+    ss = PredictoorSS(d)
+    assert not ss.pretrain
+    assert ss.train_deadline_s == ss.predict_deadline_s == 15
+
+    for train_s, predict_s in [(10, 20), (10, -1)]:
+        d["bot_only"]["train_deadline_s"] = train_s
+        d["bot_only"]["predict_deadline_s"] = predict_s
+        with pytest.raises(ValueError):
+            PredictoorSS(d)
+
+
 @enforce_types
 def test_predictoor_ss_feedsets_in_test_dict():
     # test 5m
@@ -92,6 +92,57 @@ def test_sim_ss_tradetype_badpaths(tmpdir):
         _ = SimSS(d)
 
 
+@enforce_types
+def test_sim_ss_vectorized(tmpdir):
+    d = sim_ss_test_dict(_logdir(tmpdir))
+    assert not SimSS(d).vectorized
+
+    d = sim_ss_test_dict(_logdir(tmpdir), vectorized=True)
+    ss = SimSS(d)
+    assert ss.vectorized
+    with pytest.raises(ValueError):
+        ss.set_tradetype("livemock")
+
+    d = sim_ss_test_dict(_logdir(tmpdir), tradetype="livemock", vectorized=True)
+    with pytest.raises(ValueError):
+        _ = SimSS(d)
+
+    d = sim_ss_test_dict(_logdir(tmpdir))
+    d["vectorized"] = "yes"
+    with pytest.raises(TypeError):
+        _ = SimSS(d)
+
+
+@enforce_types
+def test_sim_ss_log_every_n_iters(tmpdir):
+    ss = SimSS(sim_ss_test_dict(_logdir(tmpdir), test_n=10))
+    assert ss.log_every_n_iters == 0
+    assert [i for i in range(10) if ss.do_log_iter(i)] == [9]
+
+    d = sim_ss_test_dict(_logdir(tmpdir), test_n=10, log_every_n_iters=4)
+    ss = SimSS(d)
+    assert [i for i in range(10) if ss.do_log_iter(i)] == [3, 7, 9]
+
+    for bad_val, error in [(-1, ValueError), (2.0, TypeError)]:
+        d["log_every_n_iters"] = bad_val
+        with pytest.raises(error):
+            _ = SimSS(d)
+
+
+@enforce_types
+def test_sim_ss_plot_resolution(tmpdir):
+    ss = SimSS(sim_ss_test_dict(_logdir(tmpdir)))
+    assert ss.plot_resolution == 200
+
+    d = sim_ss_test_dict(_logdir(tmpdir), plot_resolution=50)
+    assert SimSS(d).plot_resolution == 50
+
+    for bad_val, error in [(1, ValueError), (0, ValueError), (50.0, TypeError)]:
+        d["plot_resolution"] = bad_val
+        with pytest.raises(error):
+            _ = SimSS(d)
+
+
 @enforce_types
 def test_sim_ss_is_final_iter(tmpdir):
     d = sim_ss_test_dict(_logdir(tmpdir), test_n=10)
@@ -123,6 +174,13 @@ def test_sim_ss_setters(tmpdir):
     with pytest.raises(ValueError):
         ss.set_tradetype("foo")
 
+    # vectorized
+    with pytest.raises(ValueError):
+        ss.set_vectorized(True)  # tradetype is livereal
+    ss.set_tradetype("histmock")
+    ss.set_vectorized(True)
+    assert ss.vectorized
+
 
 # ====================================================================
 # helper funcs
@@ -32,6 +32,7 @@ _D2 = {
     "rpc_url": "rpc url 2",
     "subgraph_url": "subgraph url 2",
     "owner_addrs": "0xOwner2",
+    "multicall_address": "0xMulticall2",
 }
 _D = {
     "network1": _D1,
@@ -55,6 +56,7 @@ def test_web3_pp__yaml_dict():
     assert pp.rpc_url == "rpc url 1"
     assert pp.subgraph_url == "subgraph url 1"
     assert pp.owner_addrs == "0xOwner1"
+    assert pp.multicall_address is None
     assert isinstance(pp.account, LocalAccount)
 
     # network2
@@ -62,6 +64,7 @@ def test_web3_pp__yaml_dict():
     assert pp2.network == "network2"
     assert pp2.dn == _D2
     assert pp2.address_file == "address.json 2"
+    assert pp2.multicall_address == "0xMulticall2"
 
 
 @enforce_types
@@ -97,16 +100,22 @@ def test_web3_pp__get_pending_slots(monkeypatch):
     monkeypatch.setenv("PRIVATE_KEY", PRIV_KEY)
     web3_pp = Web3PP(_D, "network1")
 
-    def _mock_get_pending_slots(*args, **kwargs):
-        if len(args) >= 2:
-            timestamp = UnixTimeS(args[1])
-        else:
-            timestamp = UnixTimeS(kwargs["timestamp"])
+    def _mock_update(_self, timestamp):
         return [f"1_{timestamp}", f"2_{timestamp}"]
 
-    with patch("pdr_backend.ppss.web3_pp.get_pending_slots", _mock_get_pending_slots):
+    with patch(
+        "pdr_backend.ppss.web3_pp.PendingSlotTracker.update", _mock_update
+    ), patch(
+        "pdr_backend.ppss.web3_pp.PendingSlotTracker.__init__", return_value=None
+    ) as mock_init:
         slots = web3_pp.get_pending_slots(UnixTimeS(6789))
-    assert slots == ["1_6789", "2_6789"]
+        assert slots == ["1_6789", "2_6789"]
+
+        # the tracker is kept, so later calls are incremental
+        slots = web3_pp.get_pending_slots(UnixTimeS(6790))
+        assert slots == ["1_6790", "2_6790"]
+        assert mock_init.call_count == 1
+        assert mock_init.call_args.kwargs["owners_string"] == "0xOwner1"
 
 
 @enforce_types
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import random
@@ -17,8 +16,12 @@ from pdr_backend.contract.slot import Slot
 from pdr_backend.contract.token import NativeToken, Token
 from pdr_backend.subgraph.subgraph_feed import SubgraphFeed
 from pdr_backend.subgraph.subgraph_feed_contracts import query_feed_contracts
-from pdr_backend.subgraph.subgraph_pending_slots import get_pending_slots
-from pdr_backend.util.contract import _condition_sapphire_keys, get_contract_filename
+from pdr_backend.subgraph.subgraph_pending_slots import PendingSlotTracker
+from pdr_backend.util.contract import (
+    get_contract_filename,
+    load_addresses,
+    load_contract_abi,
+)
 from pdr_backend.util.strutil import StrMixin
 from pdr_backend.util.time_types import UnixTimeS
 from pdr_backend.util.web3_config import Web3Config
@@ -41,6 +44,14 @@ class Web3PP(StrMixin):
 
         self._web3_config: Optional[Web3Config] = None
 
+        # singleton contract wrappers. Reset when web3_config changes
+        self._OCEAN_Token: Optional[Token] = None
+        self._NativeToken: Optional[NativeToken] = None
+        self._feed_contracts: Dict[str, Any] = {}  # feed_addr : FeedContract
+
+        # str(allowed_feeds) : PendingSlotTracker
+        self._pending_slot_trackers: Dict[str, PendingSlotTracker] = {}
+
     # --------------------------------
     # JIT cached properties - only do the work if requested
     #   (and therefore don't complain if missing envvar)
@@ -75,11 +86,19 @@ class Web3PP(StrMixin):
     def owner_addrs(self) -> str:
         return self.dn["owner_addrs"]  # type: ignore[index]
 
+    @property
+    def multicall_address(self) -> Optional[str]:
+        """Multicall3 address. None -> read contracts 1 eth_call at a time"""
+        return self.dn.get("multicall_address")  # type: ignore[attr-defined]
+
     # --------------------------------
     # setters (add as needed)
     @enforce_types
     def set_web3_config(self, web3_config):
         self._web3_config = web3_config
+        self._OCEAN_Token = None
+        self._NativeToken = None
+        self._feed_contracts = {}
 
     # --------------------------------
     # derived properties
@@ -125,14 +144,17 @@ class Web3PP(StrMixin):
           feed_addrs -- which feeds we want
 
         @return
-          contracts -- dict of [feed_addr] : FeedContract
+          contracts -- dict of [feed_addr] : FeedContract. Each is built
+            once, then the same object is returned at later calls
         """
         # pylint: disable=import-outside-toplevel
         from pdr_backend.contract.feed_contract import FeedContract
 
         contracts = {}
         for addr in feed_addrs:
-            contracts[addr] = FeedContract(self, addr)
+            if addr not in self._feed_contracts:
+                self._feed_contracts[addr] = FeedContract(self, addr)
+            contracts[addr] = self._feed_contracts[addr]
         return contracts
 
     @enforce_types
@@ -153,15 +175,20 @@ class Web3PP(StrMixin):
         @description
           Query chain to get Slots that have status "Pending".
 
+          Incremental: there's one PendingSlotTracker per allowed_feeds,
+          and each call only queries what changed since the previous one.
+
         @return
-          pending_slots -- List[Slot]
+          pending_slots -- List[Slot], oldest first
         """
-        return get_pending_slots(
-            subgraph_url=self.subgraph_url,
-            timestamp=timestamp,
-            owner_addresses=[self.owner_addrs] if self.owner_addrs else None,
-            allowed_feeds=allowed_feeds,
-        )
+        key = str(allowed_feeds)
+        if key not in self._pending_slot_trackers:
+            self._pending_slot_trackers[key] = PendingSlotTracker(
+                subgraph_url=self.subgraph_url,
+                owners_string=self.owner_addrs,
+                allowed_feeds=allowed_feeds,
+            )
+        return self._pending_slot_trackers[key].update(timestamp)
 
     @enforce_types
     def tx_call_params(self, gas=None) -> dict:
@@ -217,10 +244,7 @@ class Web3PP(StrMixin):
         if not path.exists():
             raise TypeError(f"Cannot find address.json file at {path}")
 
-        with open(path) as f:
-            d = json.load(f)
-
-        d = _condition_sapphire_keys(d)
+        d = load_addresses(str(path))
 
         if "barge" in self.network:  # eg "barge-pytest"
             return d["development"]
@@ -239,32 +263,33 @@ class Web3PP(StrMixin):
 
     @property
     def OCEAN_Token(self) -> Token:
-        return Token(self, self.OCEAN_address)
+        if self._OCEAN_Token is None:
+            self._OCEAN_Token = Token(self, self.OCEAN_address)
+        return self._OCEAN_Token
 
     @property
     def NativeToken(self) -> NativeToken:
-        return NativeToken(self)
+        if self._NativeToken is None:
+            self._NativeToken = NativeToken(self)
+        return self._NativeToken
 
     def get_token_balance(self, address):
         return self.web3_config.w3.eth.get_balance(address)
 
     def get_contract_abi(self, contract_name: str):
         """
-        Returns the ABI for the specified contract
+        Returns the ABI for the specified contract. Memoized per file
         """
         if contract_name == "PredSubmitterMgr":
-            with open(
+            return load_contract_abi(
                 "pdr_backend/pred_submitter/compiled_contracts/PredSubmitterMgr_abi.json"
-            ) as f:
-                return json.load(f)
+            )
         path = get_contract_filename(contract_name, self.address_file)
 
         if not path.exists():
             raise TypeError("Contract name does not exist in artifacts.")
 
-        with open(path) as f:
-            data = json.load(f)
-            return data["abi"]
+        return load_contract_abi(str(path))
 
 
 # =========================================================================
@@ -322,7 +347,7 @@ class _MockEthWithTracking:
     def get_block(
         self, block_number: int, full_transactions: bool = False
     ):  # pylint: disable=unused-argument
-        mock_block = {"timestamp": self.timestamp}
+        mock_block = {"number": self.block_number, "timestamp": self.timestamp}
         return mock_block
 
     def get_balance(self, account):  # pylint: disable=unused-argument
@@ -337,6 +362,14 @@ class _MockEthWithTracking:
         m["transactionHash"] = tx_hash
         return m
 
+    def get_transaction_receipt(self, tx_hash):
+        return self.wait_for_transaction_receipt(tx_hash)
+
+    def get_transaction_count(
+        self, account, block_identifier=None
+    ):  # pylint: disable=unused-argument
+        return 0
+
     def chain_id(self):
         return 8996
 
@@ -0,0 +1,89 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import polars as pl
+from enforce_typing import enforce_types
+
+from pdr_backend.aimodel.aimodel_data_factory import AimodelDataFactory
+from pdr_backend.cli.predict_train_feedset import PredictTrainFeedset
+from pdr_backend.ppss.predictoor_ss import PredictoorSS
+
+
+class EpochDataSnapshot:
+    """
+    One epoch's ohlcv data, and the model inputs built from it, shared
+    across all feeds predicted in that epoch.
+    - The lake is refreshed and merged once, at first use
+    - Model inputs (create_xy) are built once per feedset
+    - Time spent per phase is tracked in 'timings'. Phases run in
+      parallel threads, eg "train", sum across the threads
+    """
+
+    @enforce_types
+    def __init__(
+        self,
+        epoch: int,
+        load_df: Callable[[], pl.DataFrame],
+        pdr_ss: PredictoorSS,
+    ):
+        """
+        @arguments
+          epoch -- unique epoch # that this snapshot is for
+          load_df -- refreshes the lake & returns the merged ohlcv df
+          pdr_ss -- for create_xy()
+        """
+        self.epoch = epoch
+        self._load_df = load_df
+        self.pdr_ss = pdr_ss
+
+        self._mergedohlcv_df: Optional[pl.DataFrame] = None
+        self._xys: Dict[str, tuple] = {}  # str(feedset) : create_xy() output
+        self.timings: Dict[str, float] = {}  # phase : seconds, summed
+        self._timings_lock = threading.Lock()  # models train in threads
+
+    @property
+    def mergedohlcv_df(self) -> pl.DataFrame:
+        if self._mergedohlcv_df is None:
+            with self.timed("refresh_ohlcv"):
+                self._mergedohlcv_df = self._load_df()
+        return self._mergedohlcv_df
+
+    @enforce_types
+    def create_xy(self, feedset: PredictTrainFeedset) -> tuple:
+        """
+        @description
+          AimodelDataFactory.create_xy() at testshift=0, for feedset.
+          Built at the first call per feedset. Callers must not modify it.
+
+        @return
+          X, ytran, yraw, x_df, xrecent -- see create_xy()
+        """
+        key = str(feedset)
+        if key not in self._xys:
+            mergedohlcv_df = self.mergedohlcv_df
+            with self.timed("create_xy"):
+                data_f = AimodelDataFactory(self.pdr_ss)
+                self._xys[key] = data_f.create_xy(
+                    mergedohlcv_df,
+                    testshift=0,
+                    predict_feed=feedset.predict,
+                    train_feeds=feedset.train_on,
+                )
+        return self._xys[key]
+
+    @contextmanager
+    def timed(self, phase: str):
+        """Context manager. Add the time spent in it to timings[phase]"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            with self._timings_lock:
+                self.timings[phase] = self.timings.get(phase, 0.0) + dt
+
+    def timings_str(self) -> str:
+        s = ", ".join(f"{phase}={t:.3f}s" for phase, t in self.timings.items())
+        return f"epoch {self.epoch} timings: {s or 'none'}"
@@ -1,25 +1,30 @@
 import logging
 import os
 import time
-from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
 
 from enforce_typing import enforce_types
 
 from pdr_backend.aimodel.aimodel import Aimodel
-from pdr_backend.aimodel.aimodel_data_factory import AimodelDataFactory
 from pdr_backend.aimodel.aimodel_factory import AimodelFactory
 from pdr_backend.aimodel.ycont_to_ytrue import ycont_to_ytrue
 from pdr_backend.cli.predict_train_feedsets import PredictTrainFeedset
+from pdr_backend.contract.feed_contract import get_current_epochs
+from pdr_backend.contract.multicall import Multicall
 from pdr_backend.contract.pred_submitter_mgr import PredSubmitterMgr
 from pdr_backend.contract.token import NativeToken, Token
+from pdr_backend.contract.tx_pipeline import TxPipeline
 from pdr_backend.lake.ohlcv_data_factory import OhlcvDataFactory
 from pdr_backend.payout.payout import find_slots_and_payout_with_mgr
 from pdr_backend.ppss.ppss import PPSS
+from pdr_backend.predictoor.epoch_data_snapshot import EpochDataSnapshot
 from pdr_backend.predictoor.predictoor_logger import PredictoorAgentLogLine
 from pdr_backend.predictoor.stakes_per_slot import StakesPerSlot, StakeTup
 from pdr_backend.predictoor.util import to_checksum
 from pdr_backend.subgraph.subgraph_feed import SubgraphFeed, print_feeds
+from pdr_backend.util.chain_clock import ChainClock
 from pdr_backend.util.currency_types import Eth, Wei
 from pdr_backend.util.logutil import logging_has_stdout
 from pdr_backend.util.time_types import UnixTimeS
@@ -69,23 +74,54 @@ class PredictoorAgent:
         feed_addrs: List[str] = list(self.feeds.keys())
         feed_addrs = self._to_checksum(feed_addrs)
 
+        # txs are sent without waiting for receipts. Nonces keep them in order
+        self.tx_pipeline = TxPipeline(ppss.web3_pp)
+
         logger.info("Approving tokens...")
-        self.OCEAN.approve(self.pred_submitter_mgr.contract_address, MAX_WEI)
-        self.pred_submitter_mgr.approve_ocean(feed_addrs)
-        logger.info("Tokens approved")
+        mgr = self.pred_submitter_mgr
+        self.tx_pipeline.submit(
+            "approve OCEAN",
+            lambda call_params: self.OCEAN.approve(
+                mgr.contract_address, MAX_WEI, False, call_params=call_params
+            ),
+        )
+        self.tx_pipeline.submit(
+            "approve_ocean",
+            lambda call_params: mgr.approve_ocean(
+                feed_addrs, False, call_params=call_params
+            ),
+        )
+        logger.info("Token approvals sent")
 
         # ensure ohlcv data cache is up to date
         if self.use_ohlcv_data():
             _ = self.get_ohlcv_data()
 
         # set attribs to track block
+        self.clock = ChainClock(ppss.web3_pp)
+        self.multicall = Multicall(ppss.web3_pp)
         self.prev_block_timestamp: UnixTimeS = UnixTimeS(0)
         self.prev_block_number: UnixTimeS = UnixTimeS(0)
         self.prev_submit_epochs: List[int] = []
         self.prev_submit_payouts: List[int] = []
 
         self.iter_number: int = 0
-        self.model: Optional[Aimodel] = None
+
+        # model registry, one model per feedset. Keyed by str(feedset)
+        self.models: Dict[str, Aimodel] = {}
+        self.models_iter: Dict[str, int] = {}  # iter_number at last training
+        self._train_pool: Optional[ThreadPoolExecutor] = None
+        self._train_futures: Dict[str, Future] = {}
+        self._train_deadline: Optional[float] = None  # time.time() to wait till
+
+        # data shared by all feeds predicted in an epoch
+        self.snapshot: Optional[EpochDataSnapshot] = None
+
+        # data that models were pretrained on, early in the epoch
+        self.pretrain_snapshot: Optional[EpochDataSnapshot] = None
+
+        # s from start of stake calcs to all predictions ready, last epoch
+        self.ready_latency_s: Optional[float] = None
 
     @enforce_types
     def run(self):
@@ -100,33 +136,48 @@ class PredictoorAgent:
     def calc_stakes_across_feeds(self, feeds: List[SubgraphFeed]) -> StakesPerSlot:
         stakes = StakesPerSlot()
         prediction_objs = []
-        epoch_cache: Dict[str, int] = defaultdict(int)
+        pdr_ss = self.ppss.predictoor_ss
+        t0, s_left = time.time(), self.min_epoch_s_left
+        self._train_deadline = t0 + s_left - pdr_ss.train_deadline_s
+        self.set_epoch_snapshot(self.cur_unique_epoch)
 
-        # First pass: Collect data and prepare predictions
+        feed_feedsets = []
         for feed in feeds:
-            contract = self.ppss.web3_pp.get_single_contract(feed.address)
             feedset = self.ppss.predictoor_ss.get_predict_train_feedset(
                 feed.source, feed.pair, feed.timeframe
             )
-
             if feedset is None:
                 logger.error("No (predict, train) pair found for feed %s", feed)
                 continue  # Skip further processing for this feed
+            feed_feedsets.append((feed, feedset))
+
+        if self.use_ohlcv_data():
+            self.start_training([feedset for _, feedset in feed_feedsets])
+
+        contracts = {
+            feed.address: self.ppss.web3_pp.get_single_contract(feed.address)
+            for feed, _ in feed_feedsets
+        }
+        epoch_cache = self._current_epochs(
+            [feed for feed, _ in feed_feedsets], contracts
+        )
 
+        # First pass: Collect data and prepare predictions
+        for feed, feedset in feed_feedsets:
             seconds_per_epoch = feed.seconds_per_epoch
             stake_up, stake_down = self.calc_stakes(feedset)
-
-            timeframe_key = feed.timeframe
-            current_epoch = epoch_cache.setdefault(
-                timeframe_key, contract.get_current_epoch()
-            )
+            current_epoch = epoch_cache[feed.timeframe]
 
             target_slot = UnixTimeS((current_epoch + 2) * seconds_per_epoch)
             prediction_objs.append(
-                (feed, stake_up, stake_down, target_slot, seconds_per_epoch, contract)
+                (feed, stake_up, stake_down, target_slot, seconds_per_epoch)
             )
 
-        epoch_cache.clear()  # Reset cache
+        self._train_deadline = None
+        self.log_ready_latency(time.time() - t0, s_left)
+        epoch_cache = self._current_epochs(
+            [objs[0] for objs in prediction_objs], contracts
+        )
 
         # Second pass: Add stakes based on predictions and current time conditions
         for (
@@ -135,13 +186,8 @@ class PredictoorAgent:
             stake_down,
             target_slot,
             seconds_per_epoch,
-            contract,
         ) in prediction_objs:
-            timeframe_key = feed.timeframe
-            current_epoch = epoch_cache.setdefault(
-                timeframe_key, contract.get_current_epoch()
-            )
-
+            current_epoch = epoch_cache[feed.timeframe]
             next_slot = (current_epoch + 1) * seconds_per_epoch
             expected_target_slot = next_slot + seconds_per_epoch
             cur_epoch_s_left = next_slot - self.cur_timestamp
@@ -157,29 +203,210 @@ class PredictoorAgent:
             prediction_line.log_line()
             stakes.add_stake_at_slot(target_slot, stake_tup)
 
+        for snapshot in [self.pretrain_snapshot, self.snapshot]:
+            if snapshot is not None and snapshot.timings:
+                if snapshot.epoch == self.cur_unique_epoch:
+                    logger.info(snapshot.timings_str())
         return stakes
 
+    @enforce_types
+    def _current_epochs(
+        self, feeds: List[SubgraphFeed], contracts: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """
+        @description
+          Current epoch of each timeframe in feeds, from the contract of
+          its first feed. Reads all the contracts in one eth_call.
+
+        @arguments
+          feeds -- feeds to get epochs of their timeframes
+          contracts -- dict of [feed_address] : FeedContract
+
+        @return
+          epochs -- dict of [timeframe str] : current epoch
+        """
+        contract_per_timeframe: Dict[str, Any] = {}
+        for feed in feeds:
+            contract_per_timeframe.setdefault(feed.timeframe, contracts[feed.address])
+        epochs = get_current_epochs(
+            self.multicall, list(contract_per_timeframe.values())
+        )
+        return dict(zip(contract_per_timeframe.keys(), epochs))
+
+    @enforce_types
+    def log_ready_latency(self, latency_s: float, s_left: int):
+        """
+        @description
+          Record & log the prediction-ready latency: time from the start
+          of stake calcs until every feed's prediction is ready.
+          Warn if predictions were ready past predict_deadline_s.
+
+        @arguments
+          latency_s -- prediction-ready latency, in s
+          s_left -- s left in the epoch at the start of stake calcs
+        """
+        self.ready_latency_s = latency_s
+        ready_s_left = s_left - latency_s
+        s = f"Predictions ready in {latency_s:.3f}s"
+        s += f", {ready_s_left:.1f}s before epoch end"
+        if ready_s_left < self.ppss.predictoor_ss.predict_deadline_s:
+            logger.warning("%s: past predict_deadline_s", s)
+        else:
+            logger.info(s)
+
+    @enforce_types
+    def set_epoch_snapshot(self, epoch: int):
+        """
+        @description
+          Make self.snapshot the data snapshot of this epoch. If it isn't
+          already, start a new one. Its data gets loaded at first use.
+          Every block in the prediction window calls this; the lake gets
+          refreshed once per epoch, not once per feed or per block.
+        """
+        if self.snapshot is None or self.snapshot.epoch != epoch:
+            self.snapshot = EpochDataSnapshot(
+                epoch, self.get_ohlcv_data, self.ppss.predictoor_ss
+            )
+
+    @enforce_types
+    def pretrain(self):
+        """
+        @description
+          Early in the epoch, once per epoch: refresh the data and start
+          (re)training the models that are due, on the candles closed so
+          far. At s_until_epoch_end, stake calcs then refresh the data
+          again for the latest candle, and only need to predict.
+        """
+        pdr_ss = self.ppss.predictoor_ss
+        if not pdr_ss.pretrain or not self.use_ohlcv_data():
+            return
+        epoch = self.cur_unique_epoch
+        if self.pretrain_snapshot is not None and self.pretrain_snapshot.epoch == epoch:
+            return  # started this epoch already
+
+        self.pretrain_snapshot = EpochDataSnapshot(epoch, self.get_ohlcv_data, pdr_ss)
+        feedsets = [
+            pdr_ss.get_predict_train_feedset(feed.source, feed.pair, feed.timeframe)
+            for feed in self.feeds.values()
+        ]
+        logger.info("Pretraining models for epoch %d", epoch)
+        self.start_training(
+            [fs for fs in feedsets if fs is not None], self.pretrain_snapshot
+        )
+
+    @enforce_types
+    def start_training(
+        self,
+        feedsets: List[PredictTrainFeedset],
+        snapshot: Optional[EpochDataSnapshot] = None,
+    ):
+        """
+        @description
+          (Re)train, in parallel, the models of the feedsets that are due.
+          Each model trains in its own worker thread, on the data of
+          snapshot (default: self.snapshot). Returns without waiting;
+          get_model() waits.
+        """
+        snapshot = snapshot or self.snapshot
+        assert snapshot is not None
+        due_keys = [str(fs) for fs in feedsets if self._do_train(str(fs))]
+        due_feedsets = [
+            fs
+            for fs in feedsets
+            if str(fs) in due_keys and str(fs) not in self._train_futures
+        ]
+        if not due_feedsets:
+            return
+
+        _ = snapshot.mergedohlcv_df  # load once, before workers share it
+        if self._train_pool is None:
+            self._train_pool = ThreadPoolExecutor(
+                max_workers=self.ppss.predictoor_ss.n_train_workers,
+                thread_name_prefix="train",
+            )
+        for feedset in due_feedsets:
+            self._train_futures[str(feedset)] = self._train_pool.submit(
+                self._train_model, snapshot, feedset
+            )
+
+    @enforce_types
+    def get_model(
+        self, feedset: PredictTrainFeedset, snapshot: EpochDataSnapshot
+    ) -> Aimodel:
+        """
+        @description
+          Return the model for feedset. If it's training in the pool, wait
+          for it. Otherwise if it's due for training, train it now.
+
+          In stake calcs, training gets until train_deadline_s before
+          epoch end. If it overruns, fall back to the previous model, and
+          leave training running for next time.
+        """
+        key = str(feedset)
+        future = self._train_futures.get(key)
+        if future is not None:
+            timeout = None
+            if self._train_deadline is not None and key in self.models:
+                timeout = max(0.0, self._train_deadline - time.time())
+            try:
+                with snapshot.timed("train_wait"):
+                    model = future.result(timeout)
+            except FuturesTimeoutError:
+                logger.warning(
+                    "Training for %s overran train_deadline_s. Using previous model",
+                    key,
+                )
+                return self.models[key]
+            del self._train_futures[key]
+        elif self._do_train(key):
+            model = self._train_model(snapshot, feedset)
+        else:
+            return self.models[key]
+
+        self.models[key] = model
+        self.models_iter[key] = self.iter_number
+        return model
+
+    def _do_train(self, key: str) -> bool:
+        """Is the model of feedset with str(feedset) == key due for training?"""
+        if key not in self.models:
+            return True
+        n = self.ppss.predictoor_ss.aimodel_ss.train_every_n_epochs
+        return (self.iter_number % n) == 0 and self.models_iter[key] != self.iter_number
+
+    def _train_model(
+        self, snapshot: EpochDataSnapshot, feedset: PredictTrainFeedset
+    ) -> Aimodel:
+        """Build a model for feedset, on snapshot's data. Thread-safe"""
+        pdr_ss = self.ppss.predictoor_ss
+        X, ytran, yraw, _, _ = snapshot.create_xy(feedset)
+        y_thr = _y_thr(pdr_ss.aimodel_data_ss.transform, yraw)
+        ybool = ycont_to_ytrue(ytran, y_thr)
+        with snapshot.timed("train"):
+            model_f = AimodelFactory(pdr_ss.aimodel_ss)
+            return model_f.build(X, ybool, ytran, y_thr)
+
     @enforce_types
     def take_step(self):
-        # at new block number yet?
-        if self.cur_block_number <= self.prev_block_number:
+        # at new block yet? The rest of the step uses this block
+        if not self.clock.tick():
             if logging_has_stdout():
                 print(".", end="", flush=True)
             time.sleep(1)
             return
-
-        # is new block ready yet?
-        if not self.cur_block:
-            return
         self.prev_block_number = UnixTimeS(self.cur_block_number)
         self.prev_block_timestamp = UnixTimeS(self.cur_timestamp)
 
+        # report txs confirmed since last step
+        self.log_tx_results()
+
         # get payouts
         self.get_payout()
 
         # --- Prediction ---
         if self.min_epoch_s_left > self.epoch_s_thr:
-            # not time to predict yet
+            # not time to predict yet. Meanwhile, train on the data so far
+            self.pretrain()
             return
         # for each feed, calculate up/down stake (eg via models)
         feeds = list(self.feeds.values())
@@ -235,19 +462,18 @@ class PredictoorAgent:
         w3 = self.ppss.web3_pp.w3
         return to_checksum(w3, addrs)
 
+    # block & time properties: from self.clock, as of its latest tick
     @property
     def cur_block(self):
-        return self.ppss.web3_pp.web3_config.get_block(
-            self.cur_block_number, full_transactions=False
-        )
+        return self.clock.block
 
     @property
     def cur_block_number(self) -> int:
-        return self.ppss.web3_pp.w3.eth.block_number
+        return self.clock.block_number
 
     @property
     def cur_timestamp(self) -> UnixTimeS:
-        return UnixTimeS(self.cur_block["timestamp"])
+        return self.clock.timestamp
 
     @property
     def min_epoch_s_left(self):
@@ -257,20 +483,17 @@ class PredictoorAgent:
         min_tf_seconds = (
             self.ppss.predictoor_ss.predict_train_feedsets.min_epoch_seconds
         )
-        current_ts = self.cur_timestamp
-        seconds_left = min_tf_seconds - current_ts % min_tf_seconds
-        return seconds_left
+        return self.clock.epoch_s_left(min_tf_seconds)
 
     @property
     def cur_unique_epoch(self):
         """
         Returns the unique epoch number for the current timestamp
         """
-        t = self.cur_timestamp
         min_tf_seconds = (
             self.ppss.predictoor_ss.predict_train_feedsets.min_epoch_seconds
         )
-        return t // min_tf_seconds
+        return self.clock.epoch(min_tf_seconds)
 
     @property
     def s_start_payouts(self) -> int:
@@ -307,22 +530,29 @@ class PredictoorAgent:
         target_slot: UnixTimeS,  # a timestamp
         feed_addrs: List[str],
     ):
+        """Send the prediction tx. Don't wait for it; see log_tx_results()"""
         logger.info("Submitting predictions to the chain...")
         stakes_up_wei = [i.to_wei() for i in stakes_up]
         stakes_down_wei = [i.to_wei() for i in stakes_down]
-        tx = self.pred_submitter_mgr.submit_prediction(
-            stakes_up=stakes_up_wei,
-            stakes_down=stakes_down_wei,
-            feed_addrs=feed_addrs,
-            epoch=target_slot,
+        self.tx_pipeline.submit(
+            f"submit_prediction slot={target_slot}",
+            lambda call_params: self.pred_submitter_mgr.submit_prediction(
+                stakes_up=stakes_up_wei,
+                stakes_down=stakes_down_wei,
+                feed_addrs=feed_addrs,
+                epoch=target_slot,
+                wait_for_receipt=False,
+                call_params=call_params,
+            ),
         )
-        logger.info("Tx submitted %s", tx["transactionHash"].hex())
 
-        # handle errors
-        if _tx_failed(tx):
-            s = "Tx failed"
-            s += f"\ntx1={tx.transactionHash.hex()}"
-            logger.warning(s)
+    def log_tx_results(self):
+        """Log txs that got confirmed (or gave up) since the last call"""
+        for name, receipt in self.tx_pipeline.poll():
+            if _tx_failed(receipt):
+                logger.warning("Tx failed: %s", name)
+            else:
+                logger.info("Tx confirmed: %s", name)
 
     @enforce_types
     def calc_stakes(self, feedset: PredictTrainFeedset) -> Tuple[Eth, Eth]:
@@ -405,35 +635,16 @@ class PredictoorAgent:
           stake_down -- amt to stake down, ""
         """
         pdr_ss = self.ppss.predictoor_ss
-        mergedohlcv_df = self.get_ohlcv_data()
-
-        data_f = AimodelDataFactory(pdr_ss)
-        X, ytran, yraw, _, xrecent = data_f.create_xy(
-            mergedohlcv_df,
-            testshift=0,
-            predict_feed=feedset.predict,
-            train_feeds=feedset.train_on,
-        )
-
-        cur_close = yraw[-1]
-
-        if pdr_ss.aimodel_data_ss.transform == "None":
-            y_thr = cur_close
-        else:  # transform = "RelDiff"
-            y_thr = 0.0
-
-        ybool = ycont_to_ytrue(ytran, y_thr)
-
-        if (
-            self.model is None
-            or (self.iter_number % pdr_ss.aimodel_ss.train_every_n_epochs) == 0
-        ):
-            model_f = AimodelFactory(pdr_ss.aimodel_ss)
-            self.model = model_f.build(X, ybool, ytran, y_thr)
+        snapshot = self.snapshot
+        if snapshot is None:  # eg called outside calc_stakes_across_feeds()
+            snapshot = EpochDataSnapshot(-1, self.get_ohlcv_data, pdr_ss)
+        model = self.get_model(feedset, snapshot)
+        xrecent = snapshot.create_xy(feedset)[4]
 
         # predict
-        X_test = xrecent.reshape((1, len(xrecent)))
-        prob_up = self.model.predict_ptrue(X_test)[0]
+        with snapshot.timed("predict"):
+            X_test = xrecent.reshape((1, len(xrecent)))
+            prob_up = model.predict_ptrue(X_test)[0]
 
         # calc stake amounts
         tot_amt = pdr_ss.stake_amount
@@ -489,7 +700,17 @@ class PredictoorAgent:
 
         # Update previous payouts history to avoid claiming for this epoch again
         self.prev_submit_payouts.append(self.cur_unique_epoch)
-        find_slots_and_payout_with_mgr(self.pred_submitter_mgr, self.ppss)
+        find_slots_and_payout_with_mgr(
+            self.pred_submitter_mgr, self.ppss, tx_pipeline=self.tx_pipeline
+        )
+
+
+@enforce_types
+def _y_thr(transform: str, yraw) -> float:
+    """Threshold on the transformed y, between up and down"""
+    if transform == "None":
+        return float(yraw[-1])  # cur close
+    return 0.0  # transform = "RelDiff"
 
 
 @enforce_types
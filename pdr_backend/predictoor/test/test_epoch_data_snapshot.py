@@ -0,0 +1,54 @@
+from enforce_typing import enforce_types
+import polars as pl
+
+from pdr_backend.cli.predict_train_feedset import PredictTrainFeedset
+from pdr_backend.ppss.predictoor_ss import PredictoorSS, predictoor_ss_test_dict
+from pdr_backend.predictoor.epoch_data_snapshot import EpochDataSnapshot
+
+FEEDSET_BTC = PredictTrainFeedset.from_dict(
+    {"predict": "binanceus BTC/USDT c 5m", "train_on": "binanceus BTC/USDT c 5m"}
+)
+FEEDSET_ETH = PredictTrainFeedset.from_dict(
+    {"predict": "binanceus ETH/USDT c 5m", "train_on": "binanceus ETH/USDT c 5m"}
+)
+
+
+@enforce_types
+def test_epoch_data_snapshot():
+    n_loads = []
+
+    def _load_df() -> pl.DataFrame:
+        n_loads.append(1)
+        return pl.DataFrame(
+            {
+                "timestamp": list(range(100, 110)),
+                "binanceus:BTC/USDT:close": [float(v) for v in range(10, 20)],
+                "binanceus:ETH/USDT:close": [float(v) for v in range(30, 40)],
+            }
+        )
+
+    d = predictoor_ss_test_dict()
+    d["aimodel_data_ss"]["autoregressive_n"] = 2
+    d["aimodel_data_ss"]["max_n_train"] = 4
+    d["aimodel_data_ss"]["transform"] = "None"
+    snapshot = EpochDataSnapshot(7, _load_df, PredictoorSS(d))
+    assert snapshot.epoch == 7
+    assert not n_loads  # lazy
+
+    # data is loaded once; model inputs are built once per feedset
+    xy_btc = snapshot.create_xy(FEEDSET_BTC)
+    assert snapshot.create_xy(FEEDSET_BTC) is xy_btc
+    xy_eth = snapshot.create_xy(FEEDSET_ETH)
+    assert len(n_loads) == 1
+
+    xrecent_btc, xrecent_eth = xy_btc[4], xy_eth[4]
+    assert list(xrecent_btc) == [18.0, 19.0]
+    assert list(xrecent_eth) == [38.0, 39.0]
+
+    # timings
+    assert sorted(snapshot.timings.keys()) == ["create_xy", "refresh_ohlcv"]
+    with snapshot.timed("train"):
+        pass
+    assert snapshot.timings["train"] >= 0.0
+    s = snapshot.timings_str()
+    assert "epoch 7" in s and "refresh_ohlcv=" in s and "train=" in s
@@ -1,6 +1,8 @@
-# pylint: disable=redefined-outer-name
+# pylint: disable=redefined-outer-name,protected-access
 
-from unittest.mock import MagicMock, Mock, patch
+import threading
+import time
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import pytest
 import numpy as np
@@ -44,6 +46,17 @@ def test_predictoor_agent_main3(tmpdir, monkeypatch, pred_submitter_mgr):
     _test_predictoor_agent_main(3, str(tmpdir), monkeypatch, pred_submitter_mgr)
 
 
+def _mock_web3_pp(feed_contracts) -> Mock:
+    """Mock Web3PP that serves feed_contracts, and mines every tx at once"""
+    web3_pp = Mock(spec=Web3PP)
+    web3_pp.query_feed_contracts.return_value = feed_contracts
+    web3_pp.tx_call_params.return_value = {"gasPrice": 0}
+    eth = web3_pp.web3_config.w3.eth
+    eth.get_transaction_count.return_value = 0
+    eth.get_transaction_receipt.return_value = {"status": 1}
+    return web3_pp
+
+
 @pytest.fixture()
 def pred_submitter_mgr():
     with patch("pdr_backend.predictoor.predictoor_agent.PredSubmitterMgr") as mock:
@@ -91,6 +104,8 @@ def _test_predictoor_agent_main(
         ppss.web3_pp.query_feed_contracts.return_value = feed_contracts
         ppss.web3_pp.web3_config = web3_config
         ppss.web3_pp.w3 = w3
+        ppss.web3_pp.multicall_address = None
+        ppss.web3_pp.tx_call_params.return_value = {"gasPrice": 0}
         # now we're done the mocking, time for the real work!!
 
         # real work: main iterations
@@ -116,6 +131,14 @@ def _test_predictoor_agent_main(
     )
     print(f"all prediction_slots = {_mock_pdr_contract._prediction_slots}")
 
+    # prediction txs went via the tx pipeline: no waiting, increasing nonces
+    agent.tx_pipeline.wait_all(timeout=5.0)
+    calls = pred_submitter_mgr.return_value.submit_prediction.call_args_list
+    assert calls
+    assert all(call.kwargs["wait_for_receipt"] is False for call in calls)
+    nonces = [call.kwargs["call_params"]["nonce"] for call in calls]
+    assert nonces == sorted(set(nonces)) and nonces[0] >= 2  # after approvals
+
     # relatively basic sanity tests
     # TO-DO Use the Prediction Submitter Manager to check these, commented out for now
     # assert _mock_pdr_contract._prediction_slots
@@ -225,8 +248,7 @@ def test_predictoor_agent_calc_stakes2_1feed(tmpdir, monkeypatch, pred_submitter
         mock_model.aimodel_data_ss = ppss.predictoor_ss.aimodel_data_ss
 
         feed_contracts = ppss.web3_pp.query_feed_contracts()
-        ppss.web3_pp = Mock(spec=Web3PP)
-        ppss.web3_pp.query_feed_contracts.return_value = feed_contracts
+        ppss.web3_pp = _mock_web3_pp(feed_contracts)
 
         ar_n = 3
         ppss.predictoor_ss.aimodel_data_ss.set_autoregressive_n(ar_n)
@@ -267,8 +289,7 @@ def test_predictoor_agent_calc_stakes2_2feeds(tmpdir, monkeypatch, pred_submitte
         )
         assert ppss.predictoor_ss.approach == 2
         feed_contracts = ppss.web3_pp.query_feed_contracts()
-        ppss.web3_pp = Mock(spec=Web3PP)
-        ppss.web3_pp.query_feed_contracts.return_value = feed_contracts
+        ppss.web3_pp = _mock_web3_pp(feed_contracts)
 
         ar_n = 3
         ppss.predictoor_ss.aimodel_data_ss.set_autoregressive_n(ar_n)
@@ -294,6 +315,214 @@ def test_predictoor_agent_calc_stakes2_2feeds(tmpdir, monkeypatch, pred_submitte
         assert_array_equal(expected_yptrue, mock_model.last_yptrue)
 
 
+@enforce_types
+def test_predictoor_agent_epoch_snapshot(tmpdir, monkeypatch, pred_submitter_mgr):
+    """The lake is refreshed once per epoch, shared by every feedset"""
+    n_loads = []
+
+    def _mock_get_ohlcv_data(*args, **kwargs):
+        n_loads.append(1)
+        return mock_get_ohlcv_data2(*args, **kwargs)
+
+    d = "pdr_backend.predictoor.predictoor_agent"
+    with patch(f"{d}.PredictoorAgent.get_ohlcv_data", _mock_get_ohlcv_data):
+        _, ppss = mock_ppss_2feeds(
+            2, str(tmpdir), monkeypatch, pred_submitter_mgr.contract_address
+        )
+        feed_contracts = ppss.web3_pp.query_feed_contracts()
+        ppss.web3_pp = _mock_web3_pp(feed_contracts)
+        ppss.predictoor_ss.aimodel_data_ss.set_autoregressive_n(3)
+        ppss.predictoor_ss.aimodel_data_ss.set_max_n_train(5)
+
+        agent = PredictoorAgent(ppss)
+        n_loads.clear()  # ignore the warm-up load in the constructor
+        feedset = ppss.predictoor_ss.predict_train_feedsets[0]
+
+        agent.set_epoch_snapshot(5)
+        agent.calc_stakes2(feedset)
+        agent.calc_stakes2(feedset)
+        agent.set_epoch_snapshot(5)  # eg next block, same epoch
+        agent.calc_stakes2(feedset)
+        assert len(n_loads) == 1
+        assert {"refresh_ohlcv", "create_xy", "train", "predict"} <= set(
+            agent.snapshot.timings.keys()
+        )
+
+        agent.set_epoch_snapshot(6)
+        agent.calc_stakes2(feedset)
+        assert len(n_loads) == 2
+
+
+@enforce_types
+def test_predictoor_agent_train_in_parallel(tmpdir, monkeypatch, pred_submitter_mgr):
+    """Each feedset has its own model. Due models train concurrently"""
+    barrier = threading.Barrier(2, timeout=10)  # waits for both builds
+    built = []
+
+    def mock_build(*args, **kwargs):  # pylint: disable=unused-argument
+        barrier.wait()
+        built.append(MockModel())
+        return built[-1]
+
+    d = "pdr_backend.predictoor.predictoor_agent"
+    with patch(f"{d}.PredictoorAgent.get_ohlcv_data", mock_get_ohlcv_data2), patch(
+        f"{d}.AimodelFactory.build", mock_build
+    ):
+        _, ppss = mock_ppss_2feeds(
+            2, str(tmpdir), monkeypatch, pred_submitter_mgr.contract_address
+        )
+        feed_contracts = ppss.web3_pp.query_feed_contracts()
+        ppss.web3_pp = _mock_web3_pp(feed_contracts)
+        ppss.predictoor_ss.aimodel_data_ss.set_autoregressive_n(3)
+        ppss.predictoor_ss.aimodel_data_ss.set_max_n_train(5)
+        ppss.predictoor_ss.d["bot_only"]["n_train_workers"] = 2
+
+        agent = PredictoorAgent(ppss)
+        feedsets = list(ppss.predictoor_ss.predict_train_feedsets)
+        assert len(feedsets) == 2
+
+        agent.set_epoch_snapshot(5)
+        agent.start_training(feedsets)
+        models = [agent.get_model(fs, agent.snapshot) for fs in feedsets]
+        assert len(built) == 2
+        assert models[0] is not models[1]
+        assert sorted(agent.models.keys()) == sorted(str(fs) for fs in feedsets)
+        assert "train_wait" in agent.snapshot.timings
+
+        # same iteration: trained already, so reuse
+        agent.start_training(feedsets)
+        assert agent.get_model(feedsets[0], agent.snapshot) is models[0]
+        assert len(built) == 2
+
+
+@enforce_types
+def test_predictoor_agent_pretrain(tmpdir, monkeypatch, pred_submitter_mgr):
+    """Pretrain once per epoch; stake calcs then only wait on the models"""
+    n_loads = []
+
+    def _mock_get_ohlcv_data(*args, **kwargs):
+        n_loads.append(1)
+        return mock_get_ohlcv_data2(*args, **kwargs)
+
+    d = "pdr_backend.predictoor.predictoor_agent"
+    with patch(f"{d}.PredictoorAgent.get_ohlcv_data", _mock_get_ohlcv_data), patch(
+        f"{d}.AimodelFactory.build", lambda *args, **kwargs: MockModel()
+    ), patch.object(
+        PredictoorAgent, "cur_unique_epoch", new_callable=PropertyMock
+    ) as mock_epoch:
+        agent = _agent_2feeds(tmpdir, monkeypatch, pred_submitter_mgr)
+        feedsets = list(agent.ppss.predictoor_ss.predict_train_feedsets)
+        n_loads.clear()  # ignore the warm-up load in the constructor
+
+        mock_epoch.return_value = 5
+        agent.pretrain()
+        agent.pretrain()  # eg next block, same epoch
+        assert len(n_loads) == 1
+        assert agent.pretrain_snapshot.epoch == 5
+        assert sorted(agent._train_futures.keys()) == sorted(map(str, feedsets))
+
+        # at decision time: fresh data for the last candle, then predict
+        agent.set_epoch_snapshot(5)
+        for feedset in feedsets:
+            agent.get_model(feedset, agent.snapshot)
+        assert not agent._train_futures
+        assert len(agent.models) == 2
+        assert "train" in agent.pretrain_snapshot.timings
+        assert "train" not in agent.snapshot.timings
+
+        # disabled
+        agent.ppss.predictoor_ss.d["bot_only"]["pretrain"] = False
+        mock_epoch.return_value = 6
+        agent.pretrain()
+        assert agent.pretrain_snapshot.epoch == 5
+
+
+@enforce_types
+def test_predictoor_agent_train_overrun(tmpdir, monkeypatch, pred_submitter_mgr):
+    """If training overruns its deadline, fall back to the previous model"""
+    done_training = threading.Event()
+
+    def mock_build(*args, **kwargs):  # pylint: disable=unused-argument
+        done_training.wait(timeout=10)
+        return MockModel()
+
+    d = "pdr_backend.predictoor.predictoor_agent"
+    with patch(f"{d}.PredictoorAgent.get_ohlcv_data", mock_get_ohlcv_data2), patch(
+        f"{d}.AimodelFactory.build", mock_build
+    ):
+        agent = _agent_2feeds(tmpdir, monkeypatch, pred_submitter_mgr)
+        feedset = agent.ppss.predictoor_ss.predict_train_feedsets[0]
+        key = str(feedset)
+        prev_model = MockModel()
+        agent.models[key], agent.models_iter[key] = prev_model, -1
+
+        agent.set_epoch_snapshot(5)
+        agent.start_training([feedset])
+        agent._train_deadline = time.time()  # ie passed
+        assert agent.get_model(feedset, agent.snapshot) is prev_model
+        assert key in agent._train_futures  # still training
+
+        # next time, the new model is ready
+        done_training.set()
+        agent._train_deadline = None
+        model = agent.get_model(feedset, agent.snapshot)
+        assert model is not prev_model
+        assert agent.models[key] is model
+
+
+@enforce_types
+def test_predictoor_agent_ready_latency(
+    tmpdir, monkeypatch, pred_submitter_mgr, caplog
+):
+    with patch(
+        "pdr_backend.predictoor.predictoor_agent.PredictoorAgent.get_ohlcv_data",
+        mock_get_ohlcv_data2,
+    ):
+        agent = _agent_2feeds(tmpdir, monkeypatch, pred_submitter_mgr)
+        predict_deadline_s = agent.ppss.predictoor_ss.predict_deadline_s
+
+        agent.log_ready_latency(1.5, predict_deadline_s + 5)
+        assert agent.ready_latency_s == 1.5
+        assert "Predictions ready in 1.500s" in caplog.text
+        assert "past predict_deadline_s" not in caplog.text
+
+        agent.log_ready_latency(6.0, predict_deadline_s + 5)
+        assert "past predict_deadline_s" in caplog.text
+
+
+@enforce_types
+def test_predictoor_agent_chain_clock(tmpdir, monkeypatch, pred_submitter_mgr):
+    """Block & time queries in a step share one head-block RPC call"""
+    with patch(
+        "pdr_backend.predictoor.predictoor_agent.PredictoorAgent.get_ohlcv_data",
+        mock_get_ohlcv_data2,
+    ):
+        agent = _agent_2feeds(tmpdir, monkeypatch, pred_submitter_mgr)
+    get_block = agent.ppss.web3_pp.web3_config.get_block
+    get_block.return_value = {"number": 20, "timestamp": 3 * 300 + 100}
+
+    assert agent.clock.tick()
+    for _ in range(3):
+        _ = agent.status_str()
+    assert agent.cur_unique_epoch == 3
+    assert agent.min_epoch_s_left == 200
+    assert agent.cur_block_number == 20
+    assert get_block.call_count == 1
+
+
+@enforce_types
+def _agent_2feeds(tmpdir, monkeypatch, pred_submitter_mgr) -> PredictoorAgent:
+    """Approach-2 agent on 2 feedsets. Call with get_ohlcv_data mocked"""
+    _, ppss = mock_ppss_2feeds(
+        2, str(tmpdir), monkeypatch, pred_submitter_mgr.contract_address
+    )
+    feed_contracts = ppss.web3_pp.query_feed_contracts()
+    ppss.web3_pp = _mock_web3_pp(feed_contracts)
+    ppss.predictoor_ss.aimodel_data_ss.set_autoregressive_n(3)
+    ppss.predictoor_ss.aimodel_data_ss.set_max_n_train(5)
+    return PredictoorAgent(ppss)
+
+
 @enforce_types
 @pytest.mark.parametrize(
     "OCEAN, ROSE, expected",
@@ -333,10 +562,9 @@ def test_balance_check(tmpdir, monkeypatch, OCEAN, ROSE, expected, pred_submitte
     mock_OCEAN.balanceOf.return_value = OCEAN
     mock_ROSE = Mock()
     mock_ROSE.balanceOf.return_value = ROSE
-    ppss.web3_pp = Mock(spec=Web3PP)
+    ppss.web3_pp = _mock_web3_pp(feed_contracts)
     ppss.web3_pp.OCEAN_Token = mock_OCEAN
     ppss.web3_pp.NativeToken = mock_ROSE
-    ppss.web3_pp.query_feed_contracts.return_value = feed_contracts
 
     agent = PredictoorAgent(ppss)
 
@@ -390,6 +618,7 @@ def test_calc_stakes_across_feeds(tmpdir, monkeypatch):
     ppss.web3_pp.query_feed_contracts.return_value = feed_contracts
     ppss.web3_pp.web3_config = web3_config
     ppss.web3_pp.w3 = w3
+    ppss.web3_pp.multicall_address = None
     with patch("pdr_backend.predictoor.predictoor_agent.PredSubmitterMgr"):
         agent = PredictoorAgent(ppss=ppss)
 
@@ -1,6 +1,7 @@
+import threading
 import time
 
-from dash import Input, Output, State
+from dash import Input, Output, State, ctx, no_update
 
 from pdr_backend.sim.dash_plots.util import get_figures_by_state
 from pdr_backend.sim.dash_plots.view_elements import (
@@ -9,9 +10,12 @@ from pdr_backend.sim.dash_plots.view_elements import (
     get_waiting_template,
     selected_var_checklist,
     get_tabs_component,
+    figure_names,
 )
 from pdr_backend.sim.sim_plotter import SimPlotter
 
+AIMODEL_FIGURES = ["aimodel_varimps", "aimodel_response"]
+
 
 def wait_for_state(sim_plotter, run_id):
     for _ in range(5):
@@ -26,7 +30,24 @@ def wait_for_state(sim_plotter, run_id):
             raise e
 
 
+def _is_rendered(view, run_id) -> bool:
+    """Do the figures show state of run_id already?"""
+    return view is not None and view["run_id"] == run_id
+
+
 def get_callbacks(app):
+    # run_id -> (SimPlotter, lock). Reused, so each refresh loads only the
+    # new state. The server is threaded, so callbacks for one run_id take
+    # turns on its SimPlotter: its incremental reader isn't re-entrant
+    sim_plotters = {}
+    sim_plotters_lock = threading.Lock()
+
+    def get_sim_plotter(run_id):
+        with sim_plotters_lock:
+            if run_id not in sim_plotters:
+                sim_plotters[run_id] = (SimPlotter(), threading.Lock())
+            return sim_plotters[run_id]
+
     @app.callback(
         Output("interval-component", "disabled"),
         [Input("sim_current_ts", "className")],
@@ -57,34 +78,81 @@ def get_callbacks(app):
     @app.callback(
         Output("tabs-container", "children"),
         Output("header", "children"),
+        Output("sim-view", "data"),
+        [Output(key, "figure") for key in figure_names],
         Input("interval-component", "n_intervals"),
         Input("selected_vars", "value"),
         State("selected_vars", "value"),
         State("selected-tab", "data"),
+        State("sim-view", "data"),
     )
     # pylint: disable=unused-argument
-    def update_graph_live(n, selected_vars, selected_vars_old, selected_tab):
+    def update_graph_live(n, selected_vars, selected_vars_old, selected_tab, view):
+        no_figures = [no_update] * len(figure_names)
         try:
             run_id = app.run_id if app.run_id else SimPlotter.get_latest_run_id()
-            sim_plotter = SimPlotter()
+        except Exception as e:
+            return [], [get_waiting_template(e)], None, *no_figures
+
+        sim_plotter, lock = get_sim_plotter(run_id)
+        with lock:
+            return _update_graph_live(
+                sim_plotter,
+                run_id,
+                n,
+                selected_vars,
+                selected_vars_old,
+                selected_tab,
+                view,
+            )
+
+    # pylint: disable=too-many-positional-arguments
+    def _update_graph_live(
+        sim_plotter, run_id, n, selected_vars, selected_vars_old, selected_tab, view
+    ):
+        no_figures = [no_update] * len(figure_names)
+        try:
             st, ts = wait_for_state(sim_plotter, run_id)
         except Exception as e:
-            return [], [get_waiting_template(e)]
+            return [], [get_waiting_template(e)], None, *no_figures
 
         header = get_header_elements(run_id, st, ts)
-        elements = []
-
-        state_options = sim_plotter.aimodel_plotdata.colnames
-        elements.append(selected_var_checklist(state_options, selected_vars_old))
-
-        timeout = 2 if ts != "final" or n < 2 else 10
-
-        figures = get_figures_by_state(sim_plotter, selected_vars, timeout=timeout)
-        tabs = get_tabs(figures)
-        selected_tab_value = selected_tab if selected_tab else tabs[0]["name"]
-        elements = elements + [get_tabs_component(tabs, selected_tab_value)]
-
-        return elements, header
+        new_view = {
+            "run_id": run_id,
+            "n_iters": len(st.probs_up),
+            "plotdata_file": sim_plotter.plotdata_file,
+            "is_final": ts == "final",
+        }
+
+        # render all figures: on 1st load, and once the sim is done
+        if not _is_rendered(view, run_id) or (ts == "final" and not view["is_final"]):
+            elements = []
+
+            state_options = sim_plotter.aimodel_plotdata.colnames
+            elements.append(selected_var_checklist(state_options, selected_vars_old))
+
+            timeout = 2 if ts != "final" or n < 2 else 10
+
+            figures = get_figures_by_state(sim_plotter, selected_vars, timeout=timeout)
+            tabs = get_tabs(figures)
+            selected_tab_value = selected_tab if selected_tab else tabs[0]["name"]
+            elements = elements + [get_tabs_component(tabs, selected_tab_value)]
+
+            return elements, header, new_view, *no_figures
+
+        # else update figures in place: extend the ones that grow over time
+        # with just the new iterations. Redo model plots if the model changed
+        figures = dict(zip(figure_names, no_figures))
+        if new_view["n_iters"] > view["n_iters"]:
+            figures.update(sim_plotter.patch_figures(view["n_iters"]))
+
+        model_changed = new_view["plotdata_file"] != view["plotdata_file"]
+        if model_changed or ctx.triggered_id == "selected_vars":
+            figures.update(
+                get_figures_by_state(sim_plotter, selected_vars, keys=AIMODEL_FIGURES)
+            )
+
+        return no_update, header, new_view, *figures.values()
 
     @app.callback(Output("selected-tab", "data"), Input("tabs", "value"))
     # pylint: disable=unused-argument
@@ -6,10 +6,10 @@ from pdr_backend.sim.dash_plots.view_elements import figure_names
 from pdr_backend.sim.sim_plotter import SimPlotter
 
 
-def get_figures_by_state(sim_plotter: SimPlotter, selected_vars, timeout=2):
+def get_figures_by_state(sim_plotter: SimPlotter, selected_vars, timeout=2, keys=None):
     figures = {}
 
-    for key in figure_names:
+    for key in keys or figure_names:
         if not key.startswith("aimodel"):
             with stopit.ThreadingTimeout(timeout) as context_manager:
                 fig = getattr(sim_plotter, f"plot_{key}")()
@@ -225,6 +225,8 @@ def get_layout():
                 disabled=False,
             ),
             dcc.Store(id="selected-tab"),
+            # what the figures show: run_id, n_iters, plotdata_file, is_final
+            dcc.Store(id="sim-view"),
         ],
         style={"height": "100vh"},
     )
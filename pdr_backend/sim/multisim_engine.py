@@ -1,13 +1,18 @@
-import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import copy
 import csv
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
+import tempfile
 import uuid
-from typing import List, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
+import polars as pl
 from enforce_typing import enforce_types
 
 from pdr_backend.cli.nested_arg_parser import flat_to_nested_args
@@ -21,7 +26,9 @@ from pdr_backend.util.point import Point
 from pdr_backend.util.time_types import UnixTimeMs
 
 logger = logging.getLogger("multisim_engine")
-lock = asyncio.Lock()
+
+# per process: path of published data -> memory-mapped mergedohlcv_df
+_ATTACHED_DFS: Dict[str, pl.DataFrame] = {}
 
 
 class MultisimEngine:
@@ -33,16 +40,26 @@ class MultisimEngine:
         """
         self.d: dict = d
         self.network = "development"
+        self._ppss: Optional[PPSS] = None
 
-        filebase = f"multisim_metrics_{UnixTimeMs.now()}.csv"
-        log_dir = self.ppss.sim_ss.log_dir  # type: ignore[attr-defined]
-        self.csv_file = os.path.join(log_dir, filebase)
+        if self.ss.csv_file:
+            self.csv_file = self.ss.csv_file
+        else:
+            filebase = f"multisim_metrics_{UnixTimeMs.now()}.csv"
+            log_dir = self.ppss.sim_ss.log_dir  # type: ignore[attr-defined]
+            self.csv_file = os.path.join(log_dir, filebase)
 
-        self.ohlcv_dfs: List[pd.DataFrame] = []
+        # lake_key -> mergedohlcv_df. Runs with the same lake_ss share data.
+        # Each df is memory-mapped from a file that worker processes map too
+        self.ohlcv_dfs: Dict[str, pl.DataFrame] = {}
+        self.ohlcv_paths: Dict[str, str] = {}
+        self._lake_keys: Dict[int, str] = {}  # run_i -> lake_key
 
     @property
     def ppss(self) -> PPSS:
-        return PPSS(d=self.d, network=self.network)
+        if self._ppss is None:
+            self._ppss = PPSS(d=self.d, network=self.network)
+        return self._ppss
 
     @property
     def ss(self) -> MultisimSS:
@@ -52,60 +69,315 @@ class MultisimEngine:
     def run(self):
         ss = self.ss
         logger.info("Multisim engine: start. # runs = %s", ss.n_runs)
-        self.initialize_csv_with_header()
+        resume = os.path.exists(self.csv_file)
+        if not resume:
+            self.initialize_csv_with_header()
+
+        self.ohlcv_dfs, self.ohlcv_paths = {}, {}
+        with tempfile.TemporaryDirectory(prefix="multisim_", dir=_shm_dir()) as dir_:
+            if ss.approach == "FastSweep":
+                done_metrics = self.completed_rung_metrics() if resume else {}
+                self._run_fast_sweep(dir_, done_metrics)
+            elif ss.approach == "RollingCV":
+                done_folds = self.completed_run_folds() if resume else set()
+                self._run_rolling_cv(dir_, done_folds)
+            else:
+                done = self.completed_run_numbers() if resume else set()
+                if resume:
+                    logger.info("Multisim: resume. %s runs done already", len(done))
+                todo = [run_i for run_i in range(ss.n_runs) if run_i not in done]
+                self._load_data(dir_, todo)
+                self._run_batch([(run_i, None) for run_i in todo])
+
+            for path in self.ohlcv_paths.values():
+                _ATTACHED_DFS.pop(path, None)
+
+        logger.info("Multisim engine: done. Output file: %s", self.csv_file)
+
+    @enforce_types
+    def _load_data(self, dir_: str, run_is: List[int]):
+        """Load data once per distinct lake_ss, in advance of the runs"""
+        for run_i in run_is:
+            point_i_ppss = self.ppss_from_point(self.ss.point_i(run_i))
+            lake_key = _lake_key(point_i_ppss)
+            if lake_key not in self.ohlcv_dfs:
+                f = OhlcvDataFactory(point_i_ppss.lake_ss)
+                path = os.path.join(dir_, f"mergedohlcv_{lake_key}.arrow")
+                _publish_df(f.get_mergedohlcv_df(), path)
+                self.ohlcv_paths[lake_key] = path
+                self.ohlcv_dfs[lake_key] = _attach_df(path)
+            self._lake_keys[run_i] = lake_key
+
+    @enforce_types
+    def _run_fast_sweep(self, dir_: str, done_metrics: Dict[Tuple[int, int], float]):
+        """
+        @description
+          Successive halving. Run every point with the first rung's test_n.
+          Then keep the top fraction of points by ss.fast_sweep_metric, and
+          run those again with the next rung's (larger) test_n. Repeat until
+          the last rung, whose test_n is the full sim_ss.test_n.
+
+          A rung's sim is a prefix of the full sim: it simulates the oldest
+          test_n iterations of the full window.
+
+        @arguments
+          done_metrics -- (run_i, rung) : metric. From a previous, partial
+            sweep. These don't get run again.
+        """
+        ss = self.ss
+        rung_test_ns = self.rung_test_ns()
+        logger.info("Multisim FastSweep: test_n per rung = %s", rung_test_ns)
+        if done_metrics:
+            logger.info("Multisim: resume. %s sims done already", len(done_metrics))
+
+        alive = list(range(ss.n_points))
+        self._load_data(dir_, alive)
+        rung_metrics: Dict[Tuple[int, int], float] = dict(done_metrics)
+        for rung in range(len(rung_test_ns)):
+            if rung > 0:
+                ranked = self._ranked_runs(alive, rung - 1, rung_metrics)
+                n_keep = int(np.ceil(len(alive) * ss.fast_sweep_keep_frac))
+                alive = ranked[: max(1, n_keep)]
+            logger.info("Multisim rung %s: %s runs alive", rung, len(alive))
+
+            todo = [
+                (run_i, rung) for run_i in alive if (run_i, rung) not in done_metrics
+            ]
+            results = self._run_batch(todo)
+            metric_j = SimState.recent_metrics_names().index(ss.fast_sweep_metric)
+            for (run_i, rung_), run_metrics in results.items():
+                rung_metrics[(run_i, rung_)] = float(run_metrics[metric_j])
+
+        best_run_i = self._ranked_runs(alive, len(rung_test_ns) - 1, rung_metrics)[0]
+        logger.info("Multisim FastSweep: best run_i = %s", best_run_i)
+
+    @enforce_types
+    def _ranked_runs(
+        self, run_is: List[int], rung: int, rung_metrics: Dict[Tuple[int, int], float]
+    ) -> List[int]:
+        """Return run_is sorted best-first by their FastSweep metric at rung"""
+        sign = -1.0 if self.ss.fast_sweep_metric == "loss" else 1.0
+
+        def _score(run_i: int) -> float:
+            val = rung_metrics[(run_i, rung)]
+            return -np.inf if np.isnan(val) else sign * val
+
+        return sorted(run_is, key=_score, reverse=True)
+
+    @enforce_types
+    def _run_rolling_cv(self, dir_: str, done_folds: Set[Tuple[int, int]]):
+        """
+        @description
+          Rolling-origin cross-validation. Simulate every point on each of
+          ss.rolling_cv_n_folds consecutive windows of sim_ss.test_n
+          iterations; see MultisimSS.fold_n_drops(). Then rank the points
+          by ss.rolling_cv_metric, averaged across folds.
+
+          Sims of the same fold whose points have the same data, feedsets
+          and aimodel_data_ss (eg points that differ only by aimodel_ss)
+          share their feature matrices. They run in one process, one after
+          the other, with one xy cache.
+
+        @arguments
+          done_folds -- (run_i, fold) from a previous, partial run. These
+            don't get run again.
+        """
+        ss = self.ss
+        if done_folds:
+            logger.info("Multisim: resume. %s sims done already", len(done_folds))
+
+        run_is = list(range(ss.n_points))
+        self._load_data(dir_, run_is)
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for fold in range(ss.rolling_cv_n_folds):
+            for run_i in run_is:
+                if (run_i, fold) in done_folds:
+                    continue
+                xy_key = _xy_key(self.ppss_from_point(ss.point_i(run_i)))
+                groups.setdefault((fold, xy_key), []).append(run_i)
+        logger.info("Multisim RollingCV: %s groups of shared data", len(groups))
+        self._run_fold_groups([(fold, run_is) for (fold, _), run_is in groups.items()])
+
+        ranked_df = self.rank_cv_runs()
+        ranked_df.to_csv(self.ranked_csv_file, index=False)
+        logger.info("Multisim RollingCV ranking:\n%s", ranked_df.to_string())
+        logger.info("Multisim RollingCV ranking file: %s", self.ranked_csv_file)
+
+    @enforce_types
+    def _run_fold_groups(self, groups: List[Tuple[int, List[int]]]):
+        """
+        @description
+          Run RollingCV sims, serially or in a process pool. Each group is
+          (fold, run_is) whose sims can share an xy cache. Record each sim
+          in the csv as soon as its group is done.
+        """
+        n_workers = min(self.ss.n_workers, len(groups))
+        if n_workers <= 1:
+            for fold, run_is in groups:
+                xy_cache: Dict[int, tuple] = {}
+                for run_i in run_is:
+                    self.run_one_fold(run_i, fold, xy_cache)
+            return
+
+        logger.info("Multisim: %s groups across %s processes", len(groups), n_workers)
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {}
+            for fold, run_is in groups:
+                ds = [self._d_from_fold(run_i, fold)[0] for run_i in run_is]
+                n_drop = self._d_from_fold(run_is[0], fold)[1]
+                path = self.ohlcv_paths[self._lake_keys[run_is[0]]]
+                future = executor.submit(
+                    _run_sims_in_worker, ds, self.network, path, n_drop
+                )
+                futures[future] = (fold, run_is)
+
+            for future in as_completed(futures):
+                fold, run_is = futures[future]
+                for run_i, run_metrics in zip(run_is, future.result()):
+                    point_i = self.ss.point_i(run_i)
+                    self.update_csv(run_i, run_metrics, point_i, fold=fold)
+                    logger.info("Multisim run_i=%s fold=%s: done", run_i, fold)
+
+    @enforce_types
+    def run_one_fold(
+        self, run_i: int, fold: int, xy_cache: Optional[dict] = None
+    ) -> list:
+        point_i = self.ss.point_i(run_i)
+        logger.info("Multisim run_i=%s fold=%s: start. Vals=%s", run_i, fold, point_i)
+        d, n_drop = self._d_from_fold(run_i, fold)
+        ppss = PPSS(d=d, network=self.network)
+        mergedohlcv_df = self.ohlcv_dfs[_lake_key(ppss)]
+        run_metrics_list = _run_sim(ppss, _drop_last(mergedohlcv_df, n_drop), xy_cache)
+        self.update_csv(run_i, run_metrics_list, point_i, fold=fold)
+        logger.info("Multisim run_i=%s fold=%s: done", run_i, fold)
+        return run_metrics_list
+
+    def _d_from_fold(self, run_i: int, fold: int) -> Tuple[dict, int]:
+        """
+        PPSS constructor dict for sim_engine run #i at a given RollingCV
+        fold, and the # most recent rows of data to drop for that fold.
+        Histmock folds run vectorized, which keeps the xy cache to one entry
+        per retrain. Other tradetypes can't, so they run the regular loop.
+        """
+        d = self._d_from_point(self.ss.point_i(run_i))
+        tradetype = d["sim_ss"].get("tradetype", "histmock")
+        d["sim_ss"]["vectorized"] = tradetype == "histmock"
+        n_drop = self.ss.fold_n_drops(self.ppss.sim_ss.test_n)[fold]
+        return d, n_drop
+
+    @property
+    def ranked_csv_file(self) -> str:
+        """RollingCV's output: one row per point, best first"""
+        return os.path.splitext(self.csv_file)[0] + "_ranked.csv"
+
+    @enforce_types
+    def rank_cv_runs(self) -> pd.DataFrame:
+        """
+        @description
+          Rank RollingCV points from the sims recorded in the csv
+
+        @return
+          ranked_df -- one row per point: run_number, # folds done, each
+            metric averaged across folds, and the point's values.
+            Best first, by ss.rolling_cv_metric.
+        """
+        df = self.load_csv()
+        metric_names = SimState.recent_metrics_names()
+        point_names = list(self.ss.point_meta.keys())
+        for name in point_names:
+            df[name] = df[name].astype(str).str.strip()
 
-        # must be done in advance, as it's async
-        for run_i in range(ss.n_runs):
-            point_i = self.ss.point_i(run_i)
-            point_i_ppss = self.ppss_from_point(point_i)
-            f = OhlcvDataFactory(point_i_ppss.lake_ss)
-            mergedohlcv_df = f.get_mergedohlcv_df()
-            self.ohlcv_dfs.append(mergedohlcv_df)
+        grouped = df.groupby("run_number")
+        ranked_df = grouped[metric_names].mean()
+        ranked_df.insert(0, "n_folds", grouped.size())
+        ranked_df = ranked_df.join(grouped[point_names].first())
+
+        metric = self.ss.rolling_cv_metric
+        ranked_df = ranked_df.sort_values(
+            metric, ascending=(metric == "loss"), na_position="last", kind="stable"
+        )
+        return ranked_df.reset_index()
+
+    @enforce_types
+    def rung_test_ns(self) -> List[int]:
+        """Return test_n for each FastSweep rung"""
+        return self.ss.rung_test_ns(self.ppss.sim_ss.test_n)
+
+    @enforce_types
+    def _run_batch(self, tasks: List[Tuple[int, Optional[int]]]) -> Dict[tuple, list]:
+        """
+        @description
+          Run the sims, serially or in a process pool. Record each in the
+          csv as soon as it's done.
+
+        @arguments
+          tasks -- list of (run_i, rung). rung is None for a full-length sim
 
-        asyncio.run(self.run_async(ss.n_runs))
+        @return
+          results -- (run_i, rung) : run_metrics
+        """
+        n_workers = min(self.ss.n_workers, len(tasks))
+        if n_workers <= 1:
+            return {(run_i, rung): self.run_one(run_i, rung) for run_i, rung in tasks}
+        return self._run_parallel(tasks, n_workers)
 
     @enforce_types
-    async def run_async(self, n_runs):
-        tasks = []
+    def _run_parallel(
+        self, tasks: List[Tuple[int, Optional[int]]], n_workers: int
+    ) -> Dict[tuple, list]:
+        """Run sims in a process pool. Record each run as soon as it's done"""
+        logger.info("Multisim: %s runs across %s processes", len(tasks), n_workers)
 
-        for run_i in range(n_runs):
-            tasks.append(self.run_one(run_i))
+        # "spawn" because forking a process that has polars threads can hang
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {}
+            for run_i, rung in tasks:
+                point_i = self.ss.point_i(run_i)
+                d, n_drop = self._d_from_task(run_i, rung)
+                path = self.ohlcv_paths[self._lake_keys[run_i]]
+                future = executor.submit(
+                    _run_sim_in_worker, d, self.network, path, n_drop
+                )
+                futures[future] = (run_i, rung, point_i)
 
-        await asyncio.gather(*tasks)
+            for future in as_completed(futures):
+                run_i, rung, point_i = futures[future]
+                results[(run_i, rung)] = future.result()
+                self.update_csv(run_i, results[(run_i, rung)], point_i, rung)
+                logger.info("Multisim run_i=%s: done", run_i)
+        return results
 
     @enforce_types
-    async def run_one(self, run_i: int):
+    def run_one(self, run_i: int, rung: Optional[int] = None) -> list:
         point_i = self.ss.point_i(run_i)
         logger.info("Multisim run_i=%s: start. Vals=%s", run_i, point_i)
-        ppss = self.ppss_from_point(point_i)
-        feedset = ppss.predictoor_ss.predict_train_feedsets[0]
-        multi_id = str(uuid.uuid4())
-        sim_engine = SimEngine(ppss, feedset, multi_id)
-        sim_engine.disable_realtime_state()
-        sim_engine.run(self.ohlcv_dfs[run_i])
-
-        st = sim_engine.st
-        recent_metrics = st.recent_metrics()
-
-        # below, the "[1:]" is to avoid the first sample, which may be off
-        run_metrics = {
-            "acc_est": recent_metrics["acc_est"],
-            "acc_l": recent_metrics["acc_l"],
-            "acc_u": recent_metrics["acc_u"],
-            "f1": np.mean(st.aim.f1s),
-            "precision": np.mean(st.aim.precisions[1:]),
-            "recall": np.mean(st.aim.recalls[1:]),
-            "loss": np.mean(st.aim.losses[1:]),
-            "yerr": np.mean(st.aim.yerrs[1:]),
-            "pdr_profit_OCEAN": np.sum(st.pdr_profits_OCEAN),
-            "trader_profit_USD": np.sum(st.trader_profits_USD),
-        }
-        run_metrics_list = list(run_metrics.values())
-        async with lock:
-            self.update_csv(run_i, run_metrics_list, point_i)
-            logger.info("Multisim run_i=%s: done", run_i)
+        d, n_drop = self._d_from_task(run_i, rung)
+        ppss = PPSS(d=d, network=self.network)
+        mergedohlcv_df = self.ohlcv_dfs[_lake_key(ppss)]
+        run_metrics_list = _run_sim(ppss, _drop_last(mergedohlcv_df, n_drop))
+        self.update_csv(run_i, run_metrics_list, point_i, rung)
+        logger.info("Multisim run_i=%s: done", run_i)
+        return run_metrics_list
 
-        logger.info("Multisim engine: done. Output file: %s", self.csv_file)
+    def _d_from_task(self, run_i: int, rung: Optional[int]) -> Tuple[dict, int]:
+        """
+        PPSS constructor dict for sim_engine run #i at a given rung, and
+        the # most recent rows of data to drop so that it's a prefix sim
+        """
+        d = self._d_from_point(self.ss.point_i(run_i))
+        if rung is None:
+            return d, 0
+        full_test_n = self.ppss.sim_ss.test_n
+        rung_test_n = self.rung_test_ns()[rung]
+        d["sim_ss"]["test_n"] = rung_test_n
+        return d, full_test_n - rung_test_n
 
     def ppss_from_point(self, point_i: Point) -> PPSS:
         """
@@ -115,17 +387,53 @@ class MultisimEngine:
         @arguments
           point_i -- value of each sweep param
         """
+        d = self._d_from_point(point_i)
+        ppss = PPSS(d=d, network=self.network)
+        return ppss
+
+    def _d_from_point(self, point_i: Point) -> dict:
+        """PPSS constructor dict for sim_engine run #i"""
         nested_args = flat_to_nested_args(point_i)
         d = copy.deepcopy(self.d)
         recursive_update(d, nested_args)
-        ppss = PPSS(d=d, network=self.network)
-        return ppss
+        return d
+
+    @enforce_types
+    def completed_run_numbers(self) -> Set[int]:
+        """Return the run numbers already recorded in the csv"""
+        df = self.load_csv()
+        if list(df.columns) != self.csv_header():
+            s = f"Can't resume: {self.csv_file} has different columns than"
+            s += f" this sweep. Got {list(df.columns)}"
+            raise ValueError(s)
+        return {int(run_i) for run_i in df["run_number"]}
+
+    @enforce_types
+    def completed_rung_metrics(self) -> Dict[Tuple[int, int], float]:
+        """Return (run_i, rung) : FastSweep metric, for sims in the csv"""
+        _ = self.completed_run_numbers()  # validate columns
+        df = self.load_csv()
+        cols = [df["run_number"], df["rung"], df[self.ss.fast_sweep_metric]]
+        return {(int(run_i), int(rung)): float(val) for run_i, rung, val in zip(*cols)}
+
+    @enforce_types
+    def completed_run_folds(self) -> Set[Tuple[int, int]]:
+        """Return (run_i, fold) of RollingCV sims already in the csv"""
+        _ = self.completed_run_numbers()  # validate columns
+        df = self.load_csv()
+        return {
+            (int(run_i), int(fold)) for run_i, fold in zip(df["run_number"], df["fold"])
+        }
 
     @enforce_types
     def csv_header(self) -> List[str]:
         # put metrics first, because point_meta names/values can be superlong
         header = []
         header += ["run_number"]
+        if self.ss.approach == "FastSweep":
+            header += ["rung", "test_n"]
+        elif self.ss.approach == "RollingCV":
+            header += ["fold"]
         header += SimState.recent_metrics_names()
         header += list(self.ss.point_meta.keys())
         return header
@@ -135,6 +443,10 @@ class MultisimEngine:
         buf = 3
         spaces = []
         spaces += [len("run_number") + buf]
+        if self.ss.approach == "FastSweep":
+            spaces += [len("rung") + buf, max(len("test_n"), 6) + buf]
+        elif self.ss.approach == "RollingCV":
+            spaces += [len("fold") + buf]
         spaces += [max(len(name), 6) + buf for name in SimState.recent_metrics_names()]
 
         for var, cand_vals in self.ss.point_meta.items():
@@ -161,6 +473,8 @@ class MultisimEngine:
         run_i: int,
         run_metrics: List[Union[int, float]],
         point_i: Point,
+        rung: Optional[int] = None,
+        fold: Optional[int] = None,
     ):
         """
         @description
@@ -170,6 +484,8 @@ class MultisimEngine:
           run_i - it's run #i
           run_metrics -- output of SimState.recent_metrics() for run #i
           point_i -- value of each sweep param, for run #i
+          rung -- FastSweep rung that run #i got to. None if not FastSweep
+          fold -- RollingCV fold of this sim. None if not RollingCV
         """
         assert os.path.exists(self.csv_file), self.csv_file
         spaces = self.spaces()
@@ -179,9 +495,15 @@ class MultisimEngine:
                 return f"{val:.4f}"
             return str(val)
 
+        rung_cols = []
+        if rung is not None:
+            rung_cols = [str(rung), str(self.rung_test_ns()[rung])]
+        elif fold is not None:
+            rung_cols = [str(fold)]
+
         with open(self.csv_file, "a") as f:
             writer = csv.writer(f)
-            row = [str(run_i)] + run_metrics + list(point_i.values())
+            row = [str(run_i)] + rung_cols + run_metrics + list(point_i.values())
             assert len(row) == len(self.csv_header())
             writer.writerow(
                 [_val2str(val).rjust(space) for val, space in zip(row, spaces)]
@@ -193,3 +515,102 @@ class MultisimEngine:
         df = pd.read_csv(self.csv_file)
         df.rename(columns=lambda x: x.strip(), inplace=True)  # strip whitespace
         return df
+
+
+@enforce_types
+def _lake_key(ppss: PPSS) -> str:
+    """Fingerprint of lake_ss. Runs with the same key use the same data"""
+    s = json.dumps(ppss.lake_ss.d, sort_keys=True, default=str)
+    return hashlib.sha1(s.encode()).hexdigest()
+
+
+@enforce_types
+def _xy_key(ppss: PPSS) -> str:
+    """
+    Fingerprint of what a sim's model inputs depend on. Sims on the same
+    rows of data with the same key have the same create_xy() outputs
+    """
+    pdr_d = ppss.predictoor_ss.d
+    vals = [
+        ppss.lake_ss.d,
+        pdr_d["predict_train_feedsets"],
+        pdr_d["aimodel_data_ss"],
+    ]
+    s = json.dumps(vals, sort_keys=True, default=str)
+    return hashlib.sha1(s.encode()).hexdigest()
+
+
+def _shm_dir() -> Optional[str]:
+    """Directory for published data. RAM-backed if the OS offers one"""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+@enforce_types
+def _publish_df(df: pl.DataFrame, path: str):
+    """
+    Write df as uncompressed Arrow IPC, in one chunk, so that every
+    process can memory-map it zero-copy rather than hold its own copy
+    """
+    df.rechunk().write_ipc(path, compression="uncompressed")
+
+
+@enforce_types
+def _attach_df(path: str) -> pl.DataFrame:
+    """Memory-map a df written by _publish_df(). Once per process & path"""
+    if path not in _ATTACHED_DFS:
+        _ATTACHED_DFS[path] = pl.read_ipc(path, memory_map=True, rechunk=False)
+    return _ATTACHED_DFS[path]
+
+
+@enforce_types
+def _drop_last(df: pl.DataFrame, n_drop: int) -> pl.DataFrame:
+    """Return df without its n_drop most recent rows. Zero-copy"""
+    return df.slice(0, len(df) - n_drop)
+
+
+def _run_sim_in_worker(d: dict, network: str, ohlcv_path: str, n_drop: int) -> list:
+    ppss = PPSS(d=d, network=network)
+    return _run_sim(ppss, _drop_last(_attach_df(ohlcv_path), n_drop))
+
+
+def _run_sims_in_worker(
+    ds: List[dict], network: str, ohlcv_path: str, n_drop: int
+) -> List[list]:
+    """Run sims on the same data, one after the other, sharing an xy cache"""
+    mergedohlcv_df = _drop_last(_attach_df(ohlcv_path), n_drop)
+    xy_cache: Dict[int, tuple] = {}
+    return [_run_sim(PPSS(d=d, network=network), mergedohlcv_df, xy_cache) for d in ds]
+
+
+@enforce_types
+def _run_sim(
+    ppss: PPSS, mergedohlcv_df: pl.DataFrame, xy_cache: Optional[dict] = None
+) -> list:
+    """
+    Run one sim. Return its metrics, in the order of the csv columns.
+    If xy_cache is given, the sim memoizes its model inputs there
+    """
+    feedset = ppss.predictoor_ss.predict_train_feedsets[0]
+    multi_id = str(uuid.uuid4())
+    sim_engine = SimEngine(ppss, feedset, multi_id)
+    sim_engine.disable_realtime_state()
+    sim_engine.xy_cache = xy_cache
+    sim_engine.run(mergedohlcv_df)
+
+    st = sim_engine.st
+    recent_metrics = st.recent_metrics()
+
+    # below, the "[1:]" is to avoid the first sample, which may be off
+    run_metrics = {
+        "acc_est": recent_metrics["acc_est"],
+        "acc_l": recent_metrics["acc_l"],
+        "acc_u": recent_metrics["acc_u"],
+        "f1": np.mean(st.aim.f1s),
+        "precision": np.mean(st.aim.precisions[1:]),
+        "recall": np.mean(st.aim.recalls[1:]),
+        "loss": np.mean(st.aim.losses[1:]),
+        "yerr": np.mean(st.aim.yerrs[1:]),
+        "pdr_profit_OCEAN": np.sum(st.pdr_profits_OCEAN),
+        "trader_profit_USD": np.sum(st.trader_profits_USD),
+    }
+    return list(run_metrics.values())
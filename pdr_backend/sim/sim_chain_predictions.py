@@ -1,17 +1,18 @@
 import logging
 import time
 
-from typing import Dict, Optional
+from typing import Tuple
 
+import numpy as np
 import polars as pl
 
 from pdr_backend.cli.arg_feed import ArgFeed
 from pdr_backend.lake.duckdb_data_store import DuckDBDataStore
 from pdr_backend.lake.gql_data_factory import GQLDataFactory
+from pdr_backend.lake.payout import add_missing_contract_column
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.util.time_types import UnixTimeMs, UnixTimeS
 
-
 logger = logging.getLogger("sim_engine_chain_predictions")
 
 
@@ -40,9 +41,30 @@ class SimChainPredictions:
 
     @staticmethod
     def get_predictions_data(
-        start_slot: int, end_slot: int, ppss: PPSS, predict_feed: ArgFeed
-    ) -> Dict[int, Optional[float]]:
-        result_dict: Dict[int, Optional[float]] = {}
+        slots: np.ndarray, ppss: PPSS, predict_feed: ArgFeed
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        @description
+          Load the chain's aggregate predictions for predict_feed, aligned
+          to the sim's timestamp grid. Lookups are then array indexing.
+
+        @arguments
+          slots -- 1d int array of [i] : unix time in s. Sorted ascending
+          ppss -- PPSS
+          predict_feed -- feed to get predictions for
+
+        @return
+          probs_up -- 1d float array of [i] : prob up at slots[i]; 0.0 if none
+          valid -- 1d bool array of [i] : is there a prediction at slots[i]?
+        """
+        probs_up = np.zeros(len(slots), dtype=float)
+        valid = np.full(len(slots), False)
+        if len(slots) == 0:
+            return probs_up, valid
+
+        # lakes from before pdr_payouts had a contract column
+        add_missing_contract_column(ppss.lake_ss.lake_dir)
+
         db = DuckDBDataStore(ppss.lake_ss.lake_dir)
         query_cont = f"""
             SELECT
@@ -57,30 +79,32 @@ class SimChainPredictions:
         feed_contract_addr = db.query_data(query_cont)
         if len(feed_contract_addr) == 0:
             logger.error("Contract address for the given feed not found in database")
-            return result_dict
+            return probs_up, valid
 
+        # one row per payout, ie per (slot, user). Stakes are per slot
         query = f"""
-            SELECT
+            SELECT DISTINCT
                 slot,
-                CASE
-                    WHEN roundSumStakes = 0.0 THEN NULL
-                    ELSE roundSumStakesUp / roundSumStakes
-                END AS probUp
+                roundSumStakesUp / roundSumStakes AS probUp
             FROM
                 pdr_payouts
             WHERE
-                slot > {start_slot}
-                AND slot < {end_slot}
-                AND ID LIKE '{feed_contract_addr.row(0)[0]}%'
+                contract = '{feed_contract_addr.row(0)[0]}'
+                AND slot >= {int(slots[0])}
+                AND slot <= {int(slots[-1])}
+                AND roundSumStakes > 0.0
         """
-
         df: pl.DataFrame = db.query_data(query)
+        if len(df) == 0:
+            return probs_up, valid
 
-        for row in df.to_dicts():
-            if row["probUp"] is not None:
-                result_dict[row["slot"]] = row["probUp"]
+        df_slots = df["slot"].to_numpy()
+        idx = np.minimum(np.searchsorted(slots, df_slots), len(slots) - 1)
+        on_grid = slots[idx] == df_slots
+        probs_up[idx[on_grid]] = df["probUp"].to_numpy()[on_grid]
+        valid[idx[on_grid]] = True
 
-        return result_dict
+        return probs_up, valid
 
     @staticmethod
     def verify_prediction_data(ppss: PPSS):
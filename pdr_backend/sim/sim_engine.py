@@ -1,16 +1,17 @@
 import logging
 import os
 import uuid
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import polars as pl
 from enforce_typing import enforce_types
-from sklearn.metrics import log_loss, precision_recall_fscore_support
-from statsmodels.stats.proportion import proportion_confint
 
 from pdr_backend.aimodel.aimodel import Aimodel
-from pdr_backend.aimodel.aimodel_data_factory import AimodelDataFactory
+from pdr_backend.aimodel.aimodel_data_factory import (
+    AimodelDataFactory,
+    hist_col_name,
+)
 from pdr_backend.aimodel.aimodel_factory import AimodelFactory
 from pdr_backend.aimodel.aimodel_plotdata import AimodelPlotdata
 from pdr_backend.aimodel.ycont_to_ytrue import ycont_to_ytrue
@@ -20,10 +21,12 @@ from pdr_backend.cli.predict_train_feedsets import PredictTrainFeedset
 from pdr_backend.lake.ohlcv_data_factory import OhlcvDataFactory
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.sim.sim_chain_predictions import SimChainPredictions
-from pdr_backend.sim.sim_logger import SimLogLine
+from pdr_backend.sim.sim_logger import SimEventLog, SimLogLine
 from pdr_backend.sim.sim_plotter import SimPlotter
-from pdr_backend.sim.sim_trader import SimTrader
+from pdr_backend.sim.sim_trader import SimTrader, simulate_trades
 from pdr_backend.sim.sim_state import SimState
+from pdr_backend.statutil.scoring import cumulative_classif_metrics
+from pdr_backend.util.mathutil import fill_nans, has_nan
 from pdr_backend.util.strutil import shift_one_earlier
 from pdr_backend.util.time_types import UnixTimeMs
 
@@ -54,63 +57,257 @@ class SimEngine:
         self.sim_plotter = SimPlotter()
 
         self.logfile = ""
+        self.event_log: Optional[SimEventLog] = None
+        self._log_handler: Optional[logging.FileHandler] = None
 
         if multi_id:
             self.multi_id = multi_id
         else:
             self.multi_id = str(uuid.uuid4())
 
-        # timestamp -> prob up
-        self.chain_predictions_map: Dict[int, float] = {}
+        # chain predictions. [test_i] : prob up; is there a prediction?
+        self.chain_probs_up: np.ndarray = np.array([], dtype=float)
+        self.chain_valid: np.ndarray = np.array([], dtype=bool)
         self.model: Optional[Aimodel] = None
 
+        # batched predictions of self.model, from _predict_ahead()
+        self._ahead_test_i: int = 0
+        self._ahead_probs_up: np.ndarray = np.array([], dtype=float)
+        self._ahead_yconts: Optional[np.ndarray] = None
+
+        # data that self.model was trained on; and the last saved plotdata,
+        # whose model response is reused while model & slice are unchanged
+        self._model_trn_data: Optional[tuple] = None
+        self._prev_plotdata: Optional[AimodelPlotdata] = None
+
+        # testshift -> output of create_xy(). None = don't memoize
+        self.xy_cache: Optional[Dict[int, tuple]] = None
+
     @property
     def predict_feed(self) -> ArgFeed:
         return self.predict_train_feedset.predict
 
     @enforce_types
     def _init_loop_attributes(self):
-        filebase = f"out_{UnixTimeMs.now()}.txt"
-        self.logfile = os.path.join(self.ppss.sim_ss.log_dir, filebase)
+        filebase = os.path.join(self.ppss.sim_ss.log_dir, f"out_{UnixTimeMs.now()}")
+        self.logfile = filebase + ".txt"
+        self.event_log = SimEventLog(filebase + ".csv")
 
-        fh = logging.FileHandler(self.logfile)
-        fh.setLevel(logging.INFO)
-        logger.addHandler(fh)
+        # scoped to this run. Removed in _close_loop_attributes()
+        self._log_handler = logging.FileHandler(self.logfile)
+        self._log_handler.setLevel(logging.INFO)
+        logger.addHandler(self._log_handler)
 
-        self.st.init_loop_attributes()
+        self.st.init_loop_attributes(self.ppss.sim_ss.test_n)
         logger.info("Initialize plot data.")
         self.sim_plotter.init_state(self.multi_id)
 
-        # fetch predictions data
-        if not self.ppss.sim_ss.use_own_model:
-            self.load_chain_prediction_data()
+    def _close_loop_attributes(self):
+        if self.event_log is not None:
+            self.event_log.close()
+        if self._log_handler is not None:
+            logger.removeHandler(self._log_handler)
+            self._log_handler.close()
+            self._log_handler = None
 
     @enforce_types
-    def load_chain_prediction_data(self):
+    def load_chain_prediction_data(self, ut_seconds: np.ndarray):
+        """Load chain predictions, aligned to ut_seconds: [test_i] : ut in s"""
         SimChainPredictions.verify_use_chain_data_in_syms_dependencies(self.ppss)
         if not SimChainPredictions.verify_prediction_data(self.ppss):
             raise Exception("Couldn't get prediction data")
-        self.chain_predictions_map = SimChainPredictions.get_predictions_data(
-            UnixTimeMs(self.ppss.lake_ss.st_timestamp).to_seconds(),
-            UnixTimeMs(self.ppss.lake_ss.fin_timestamp).to_seconds(),
-            self.ppss,
-            self.predict_feed,
+        self.chain_probs_up, self.chain_valid = (
+            SimChainPredictions.get_predictions_data(
+                ut_seconds,
+                self.ppss,
+                self.predict_feed,
+            )
         )
 
+    @enforce_types
+    def sim_uts(self, mergedohlcv_df: pl.DataFrame) -> np.ndarray:
+        """Return 1d array of [test_i] : ut in ms, of each sim iteration"""
+        test_n = self.ppss.sim_ss.test_n
+        testshifts = np.arange(test_n - 1, -1, -1)
+        recent_ut = int(mergedohlcv_df["timestamp"][-1])
+        timeframe: ArgTimeframe = self.predict_feed.timeframe  # type: ignore
+        return recent_ut - testshifts * timeframe.ms
+
     @enforce_types
     def run(self, mergedohlcv_df: Optional[pl.DataFrame] = None):
         logger.info("Start run")
         self._init_loop_attributes()
+        try:
+            if mergedohlcv_df is None:
+                f = OhlcvDataFactory(self.ppss.lake_ss)
+                mergedohlcv_df = f.get_mergedohlcv_df()
+
+            if not self.ppss.sim_ss.use_own_model:
+                self.load_chain_prediction_data(self.sim_uts(mergedohlcv_df) // 1000)
+
+            if self.ppss.sim_ss.vectorized:
+                self.run_vectorized(mergedohlcv_df)
+            else:
+                # main loop!
+                for test_i in range(self.ppss.sim_ss.test_n):
+                    self.run_one_iter(test_i, mergedohlcv_df)
+
+            logger.info("Done all iters.")
+        finally:
+            self._close_loop_attributes()
+
+    # pylint: disable=too-many-locals, too-many-statements
+    @enforce_types
+    def run_vectorized(self, mergedohlcv_df: pl.DataFrame):
+        """
+        @description
+          Same SimState series as calling run_one_iter() for each test_i,
+          but with each step done for the whole test_n window at once:
+          - models: (re)train where the loop would; each predicts ahead
+            until the next retrain, in one batch call
+          - chain predictions: one lookup of all timestamps
+          - predictoor profit, classifier metrics: array ops
+          - trader profit: simulate_trades(), a tight loop w/o exchange calls
+
+          Every iteration goes to the event log. It logs a status line &
+          saves plot state for the final iteration only.
+        """
+        ppss, pdr_ss, st = self.ppss, self.ppss.predictoor_ss, self.st
+        test_n = ppss.sim_ss.test_n
+        train_every = pdr_ss.aimodel_ss.train_every_n_epochs
+        transform = pdr_ss.aimodel_data_ss.transform
+        stake_amt = pdr_ss.stake_amount.amt_eth
+        others_stake = pdr_ss.others_stake.amt_eth
+        revenue = pdr_ss.revenue.amt_eth
+        predict_feed = self.predict_train_feedset.predict
+        data_f = AimodelDataFactory(pdr_ss)  # type: ignore[arg-type]
 
-        if mergedohlcv_df is None:
-            f = OhlcvDataFactory(self.ppss.lake_ss)
-            mergedohlcv_df = f.get_mergedohlcv_df()
-
-        # main loop!
-        for test_i in range(self.ppss.sim_ss.test_n):
-            self.run_one_iter(test_i, mergedohlcv_df)
+        # prices & times. Entry [test_i] is for testshift = test_n - test_i - 1
+        testshifts = np.arange(test_n - 1, -1, -1)
+        filled_df = mergedohlcv_df
+        if has_nan(mergedohlcv_df):
+            filled_df = fill_nans(mergedohlcv_df)
+        closes = filled_df[hist_col_name(predict_feed)].to_numpy()
+        cur_closes = closes[len(closes) - 2 - testshifts]
+        next_closes = closes[len(closes) - 1 - testshifts]
+        cur_highs, cur_lows = data_f.get_highlows(
+            mergedohlcv_df, predict_feed, testshifts
+        )
+        uts = self.sim_uts(mergedohlcv_df)
+
+        # model predictions. Train even if using chain predictions, for yerr
+        probs_up = np.zeros(test_n)
+        yconts = np.zeros(test_n)
+        for test_i in range(0, test_n, train_every):
+            testshift = test_n - test_i - 1
+            X, ytran, _, x_df, _ = self._create_xy(mergedohlcv_df, testshift)
+            y_thr = cur_closes[test_i] if transform == "None" else 0.0
+            self._train(test_i, testshift, mergedohlcv_df, X, ytran, float(y_thr))
+            n_ahead = len(self._ahead_probs_up)
+            probs_up[test_i : test_i + n_ahead] = self._ahead_probs_up
+            if self._ahead_yconts is not None:
+                yconts[test_i : test_i + n_ahead] = self._ahead_yconts
+        assert self.model is not None
+
+        # iterations to simulate. Like the loop, skip ones w/o chain pred'n
+        keep = np.full(test_n, True)
+        if not ppss.sim_ss.use_own_model:
+            probs_up, keep = self.chain_probs_up, self.chain_valid
+            for ut in uts[~keep]:
+                logger.error("No prediction found at time %s", ut // 1000)
+        if not keep.any():
+            return
+        probs_up, yconts = probs_up[keep], yconts[keep]
+        cur_closes, next_closes = cur_closes[keep], next_closes[keep]
+        cur_highs, cur_lows = cur_highs[keep], cur_lows[keep]
+
+        # trader
+        conf_ups = (probs_up - 0.5) * 2.0  # to range [0,1]
+        conf_downs = ((1.0 - probs_up) - 0.5) * 2.0  # to range [0,1]
+        conf_threshold = ppss.trader_ss.sim_confidence_threshold
+        pred_ups = (probs_up > 0.5) & (conf_ups > conf_threshold)
+        pred_downs = (probs_up < 0.5) & (conf_downs > conf_threshold)
+        trader_profits = simulate_trades(
+            ppss,
+            cur_closes,
+            cur_highs,
+            cur_lows,
+            pred_ups,
+            pred_downs,
+            conf_ups,
+            conf_downs,
+        )
 
-        logger.info("Done all iters.")
+        # predictoor
+        true_ups = next_closes > cur_closes
+        stake_ups = stake_amt * probs_up
+        stake_downs = stake_amt * (1.0 - probs_up)
+        tot_stake = others_stake + stake_amt
+        others_stake_correct = others_stake * pdr_ss.others_accuracy
+        stake_corrects = np.where(true_ups, stake_ups, stake_downs)
+        payouts = (revenue + tot_stake) * (
+            stake_corrects / (others_stake_correct + stake_corrects)
+        )
+        acct_up_profits = -stake_ups + np.where(true_ups, payouts, 0.0)
+        acct_down_profits = -stake_downs + np.where(true_ups, 0.0, payouts)
+        pdr_profits = acct_up_profits + acct_down_profits
+
+        # aimodel metrics
+        m = cumulative_classif_metrics(true_ups, probs_up)
+        losses = np.where(m["has_both_classes"], m["loss"], 3.0)
+        yerrs = np.zeros(len(probs_up))
+        if self.model.do_regr:
+            if transform == "None":
+                pred_next_closes = yconts
+            else:  # transform = "RelDiff"
+                pred_next_closes = cur_closes + yconts * cur_closes
+            yerrs = next_closes - pred_next_closes
+
+        # fill state
+        st.probs_up.extend(probs_up.tolist())
+        st.ytrues.extend(true_ups.tolist())
+        st.classif_metrics.update_many(true_ups, probs_up)
+        st.aim.update_many(
+            m["acc_est"],
+            m["acc_l"],
+            m["acc_u"],
+            m["f1"],
+            m["precision"],
+            m["recall"],
+            losses,
+            yerrs,
+        )
+        st.pdr_profits_OCEAN.extend(pdr_profits.tolist())
+        st.trader_profits_USD.extend(trader_profits.tolist())
+
+        assert self.event_log is not None
+        self.event_log.add_many(
+            {
+                "iter": np.flatnonzero(keep),
+                "ut": uts[keep],
+                "prob_up": probs_up,
+                "true_up": true_ups,
+                "acct_up_profit": acct_up_profits,
+                "acct_down_profit": acct_down_profits,
+                "pdr_profit_OCEAN": pdr_profits,
+                "trader_profit_USD": trader_profits,
+            }
+        )
+        last_i = int(np.flatnonzero(keep)[-1])
+        SimLogLine(
+            ppss,
+            st,
+            last_i,
+            UnixTimeMs(int(uts[last_i])),
+            float(acct_up_profits[-1]),
+            float(acct_down_profits[-1]),
+        ).log_line()
+
+        # the loop saves final state only if it simulated the final iter
+        if keep[-1]:
+            if (test_n - 1) % train_every != 0:  # need X for testshift=0
+                X, _, _, x_df, _ = self._create_xy(mergedohlcv_df, 0)
+            self._save_plot_state(test_n - 1, X, list(x_df.columns), True)
 
     # pylint: disable=too-many-statements# pylint: disable=too-many-statements
     @enforce_types
@@ -124,23 +321,11 @@ class SimEngine:
         testshift = ppss.sim_ss.test_n - test_i - 1  # eg [99, 98, .., 2, 1, 0]
         data_f = AimodelDataFactory(pdr_ss)  # type: ignore[arg-type]
         predict_feed = self.predict_train_feedset.predict
-        train_feeds = self.predict_train_feedset.train_on
-        features = self.predict_train_feedset.ta_features
 
         # X, ycont, and x_df are all expressed in % change wrt prev candle
-        X, ytran, yraw, x_df, _ = data_f.create_xy(
-            mergedohlcv_df,
-            testshift,
-            predict_feed,
-            train_feeds,
-            ta_features=features,
-        )
+        X, ytran, yraw, x_df, _ = self._create_xy(mergedohlcv_df, testshift)
         colnames = list(x_df.columns)
 
-        st_, fin = 0, X.shape[0] - 1
-        X_train, X_test = X[st_:fin, :], X[fin : fin + 1, :]
-        ytran_train, _ = ytran[st_:fin], ytran[fin : fin + 1]
-
         cur_high, cur_low = data_f.get_highlow(mergedohlcv_df, predict_feed, testshift)
 
         cur_close = yraw[-2]
@@ -150,16 +335,11 @@ class SimEngine:
             y_thr = cur_close
         else:  # transform = "RelDiff"
             y_thr = 0.0
-        ytrue = ycont_to_ytrue(ytran, y_thr)
 
-        ytrue_train, _ = ytrue[st_:fin], ytrue[fin : fin + 1]
-
-        if (
-            self.model is None
-            or self.st.iter_number % pdr_ss.aimodel_ss.train_every_n_epochs == 0
-        ):
-            model_f = AimodelFactory(pdr_ss.aimodel_ss)
-            self.model = model_f.build(X_train, ytrue_train, ytran_train, y_thr)
+        if self.model is None or test_i % pdr_ss.aimodel_ss.train_every_n_epochs == 0:
+            self._train(test_i, testshift, mergedohlcv_df, X, ytran, y_thr)
+        assert self.model is not None
+        prob_up_hat, ycont_hat = self._get_ahead(test_i)
 
         # current time
         recent_ut = UnixTimeMs(int(mergedohlcv_df["timestamp"].to_list()[-1]))
@@ -168,13 +348,12 @@ class SimEngine:
         prob_up: float = 0.0
         # predict price direction
         if self.ppss.sim_ss.use_own_model:
-            prob_up = self.model.predict_ptrue(X_test)[0]  # in [0.0, 1.0]
+            prob_up = prob_up_hat  # in [0.0, 1.0]
         else:
-            ut_seconds = ut.to_seconds()
-            if not ut_seconds in self.chain_predictions_map:
-                logger.error("No prediction found at time %s", ut_seconds)
+            if not self.chain_valid[test_i]:
+                logger.error("No prediction found at time %s", ut.to_seconds())
                 return
-            prob_up = self.chain_predictions_map[ut_seconds]
+            prob_up = float(self.chain_probs_up[test_i])
 
         prob_down: float = 1.0 - prob_up
         conf_up = (prob_up - 0.5) * 2.0  # to range [0,1]
@@ -207,24 +386,17 @@ class SimEngine:
         true_up = next_close > cur_close
         st.ytrues.append(true_up)
 
-        # update classifier metrics
-        n_correct = sum(np.array(st.ytrues) == np.array(st.ytrues_hat))
-        n_trials = len(st.ytrues)
-        acc_est = n_correct / n_trials
-        acc_l, acc_u = proportion_confint(count=n_correct, nobs=n_trials)
-        (precision, recall, f1, _) = precision_recall_fscore_support(
-            st.ytrues,
-            st.ytrues_hat,
-            average="binary",
-            zero_division=0.0,
-        )
-        if min(st.ytrues) == max(st.ytrues):
-            loss = 3.0
-        else:
-            loss = log_loss(st.ytrues, st.probs_up)
+        # update classifier metrics. O(1), via running counts
+        clm = st.classif_metrics
+        clm.update(bool(true_up), float(prob_up))
+        acc_est = clm.acc_est
+        acc_l, acc_u = clm.acc_interval()
+        precision, recall, f1 = clm.precision_recall_f1()
+        loss = clm.loss if clm.has_both_classes else 3.0
         yerr = 0.0
         if self.model.do_regr:
-            pred_ycont = self.model.predict_ycont(X_test)[0]
+            assert ycont_hat is not None
+            pred_ycont = ycont_hat
             if transform == "None":
                 pred_next_close = pred_ycont
             else:  # transform = "RelDiff"
@@ -248,25 +420,159 @@ class SimEngine:
         pdr_profit_OCEAN = acct_up_profit + acct_down_profit
         st.pdr_profits_OCEAN.append(pdr_profit_OCEAN)
 
-        SimLogLine(ppss, st, test_i, ut, acct_up_profit, acct_down_profit).log_line()
+        assert self.event_log is not None
+        self.event_log.add(
+            test_i,
+            int(ut),
+            prob_up,
+            bool(true_up),
+            acct_up_profit,
+            acct_down_profit,
+            pdr_profit_OCEAN,
+            profit,
+        )
+        if ppss.sim_ss.do_log_iter(test_i):
+            SimLogLine(
+                ppss, st, test_i, ut, acct_up_profit, acct_down_profit
+            ).log_line()
 
         save_state, is_final_state = self.save_state(test_i, self.ppss.sim_ss.test_n)
 
         if save_state:
-            colnames = [shift_one_earlier(colname) for colname in colnames]
-            most_recent_x = X[-1, :]
-            slicing_x = most_recent_x  # plot about the most recent x
-            d = AimodelPlotdata(
-                self.model,
-                X_train,
-                ytrue_train,
-                ytran_train,
-                y_thr,
-                colnames,
-                slicing_x,
-            )
-            self.st.iter_number = test_i
-            self.sim_plotter.save_state(self.st, d, is_final_state)
+            self._save_plot_state(test_i, X, colnames, is_final_state)
+
+    @enforce_types
+    def _create_xy(self, mergedohlcv_df: pl.DataFrame, testshift: int) -> tuple:
+        """
+        @description
+          AimodelDataFactory.create_xy() for this feedset, at testshift.
+          If self.xy_cache is set, memoize in it. Sims on the same data,
+          feedset and aimodel_data_ss can share one cache: eg sims that
+          differ only by aimodel_ss. Callers must not modify the arrays.
+
+        @return
+          X, ytran, yraw, x_df, xrecent -- see create_xy()
+        """
+        if self.xy_cache is not None:
+            xy = self.xy_cache.get(testshift)
+            if xy is not None:
+                return xy
+
+        data_f = AimodelDataFactory(self.ppss.predictoor_ss)  # type: ignore
+        xy = data_f.create_xy(
+            mergedohlcv_df,
+            testshift,
+            self.predict_train_feedset.predict,
+            self.predict_train_feedset.train_on,
+            ta_features=self.predict_train_feedset.ta_features,
+        )
+        if self.xy_cache is not None:
+            self.xy_cache[testshift] = xy
+        return xy
+
+    @enforce_types
+    def _train(
+        self,
+        test_i: int,
+        testshift: int,
+        mergedohlcv_df: pl.DataFrame,
+        X: np.ndarray,
+        ytran: np.ndarray,
+        y_thr: float,
+    ):
+        """(Re)train self.model on all but the last row of X, then predict ahead"""
+        st_, fin = 0, X.shape[0] - 1
+        X_train, X_test = X[st_:fin, :], X[fin : fin + 1, :]
+        ytran_train = ytran[st_:fin]
+        ytrue_train = ycont_to_ytrue(ytran, y_thr)[st_:fin]
+
+        model_f = AimodelFactory(self.ppss.predictoor_ss.aimodel_ss)
+        self.model = model_f.build(X_train, ytrue_train, ytran_train, y_thr)
+        self._model_trn_data = (X_train, ytrue_train, ytran_train, y_thr)
+        self._predict_ahead(test_i, testshift, mergedohlcv_df, X_test)
+
+    @enforce_types
+    def _save_plot_state(
+        self, test_i: int, X: np.ndarray, colnames: List[str], is_final_state: bool
+    ):
+        assert self.model is not None
+        self.st.iter_number = test_i
+
+        # the state log keeps model plot data until the model changes
+        prev_d = self._prev_plotdata
+        if not is_final_state and prev_d is not None and prev_d.model is self.model:
+            self.sim_plotter.save_state(self.st, None, is_final_state)
+            return
+
+        colnames = [shift_one_earlier(colname) for colname in colnames]
+        most_recent_x = X[-1, :]
+        slicing_x = most_recent_x  # plot about the most recent x
+        if self.model.has_importance_per_var:
+            # compute once per model (lazy + cached), so that the
+            # dashboard doesn't recompute on every load of saved state
+            self.model.importance_per_var()
+        assert self._model_trn_data is not None
+        X_trn, ytrue_trn, ytran_trn, y_thr_trn = self._model_trn_data
+        d = AimodelPlotdata(
+            self.model,
+            X_trn,
+            ytrue_trn,
+            ytran_trn,
+            y_thr_trn,
+            colnames,
+            slicing_x,
+            resolution=self.ppss.sim_ss.plot_resolution,
+        )
+        # compute the response surface here, once, rather than on
+        # every dashboard load. Reuse the previous one if still valid
+        can_choose = d.n <= 2 or self.model.has_importance_per_var
+        if can_choose and not d.reuse_response(self._prev_plotdata):
+            _ = d.response
+        self._prev_plotdata = d
+        self.sim_plotter.save_state(self.st, d, is_final_state)
+
+    @enforce_types
+    def _predict_ahead(
+        self,
+        test_i: int,
+        testshift: int,
+        mergedohlcv_df: pl.DataFrame,
+        X_test: np.ndarray,
+    ):
+        """
+        @description
+          Right after (re)training, score the test rows of this iteration and
+          of the following ones until the next retrain, in one batch call.
+          The model is unchanged across those iterations.
+
+          Row k from the end of X at testshift s is the test row at
+          testshift s+k, so one create_xy() call covers every iteration.
+        """
+        assert self.model is not None
+        n_ahead = min(
+            self.ppss.predictoor_ss.aimodel_ss.train_every_n_epochs,
+            self.ppss.sim_ss.test_n - test_i,
+        )
+        if n_ahead == 1:
+            X_ahead = X_test
+        else:
+            X, _, _, _, _ = self._create_xy(mergedohlcv_df, testshift - (n_ahead - 1))
+            X_ahead = X[-n_ahead:, :]
+
+        self._ahead_test_i = test_i
+        self._ahead_probs_up, self._ahead_yconts = self.model.predict_ptrue_ycont(
+            X_ahead
+        )
+
+    @enforce_types
+    def _get_ahead(self, test_i: int) -> Tuple[float, Optional[float]]:
+        """Return (prob_up, ycont) predicted by _predict_ahead() for test_i"""
+        j = test_i - self._ahead_test_i
+        assert 0 <= j < len(self._ahead_probs_up), "must call _predict_ahead()"
+        prob_up = float(self._ahead_probs_up[j])
+        if self._ahead_yconts is None:
+            return prob_up, None
+        return prob_up, float(self._ahead_yconts[j])
 
     def disable_realtime_state(self):
         self.do_state_updates = False
@@ -1,4 +1,5 @@
 import logging
+import os
 
 import numpy as np
 from enforce_typing import enforce_types
@@ -7,6 +8,19 @@ from pdr_backend.util.strutil import compactSmallNum
 
 logger = logging.getLogger("sim_engine")
 
+# one row per sim iteration, in this order
+EVENT_COLUMNS = [
+    "iter",
+    "ut",
+    "prob_up",
+    "true_up",
+    "acct_up_profit",
+    "acct_down_profit",
+    "pdr_profit_OCEAN",
+    "trader_profit_USD",
+]
+_EVENT_FMT = ["%d", "%d", "%.8g", "%d", "%.8g", "%.8g", "%.8g", "%.8g"]
+
 
 @enforce_types
 # pylint: disable=too-many-instance-attributes
@@ -20,7 +34,7 @@ class SimLogLine:
         self.acct_up_profit = acct_up_profit
         self.acct_down_profit = acct_down_profit
 
-        self.n_correct = sum(np.array(st.ytrues) == np.array(st.ytrues_hat))
+        self.n_correct = st.n_correct
         self.n_trials = len(st.ytrues)
 
         for key, item in st.recent_metrics(extras=["prob_up"]).items():
@@ -54,3 +68,74 @@ class SimLogLine:
         s += f" (cumul ${sum(self.st.trader_profits_USD):6.2f})"
 
         logger.info(s)
+
+
+class SimEventLog:
+    """
+    Structured log of sim events, one row per iteration, in a csv file.
+    Rows go to a preallocated in-memory buffer. It's written to the
+    file in chunks: when full, and on flush() / close().
+    No string formatting happens per row.
+    """
+
+    @enforce_types
+    def __init__(self, filename: str, chunk_size: int = 1000):
+        if chunk_size < 1:
+            raise ValueError(chunk_size)
+        self.filename = filename
+        self._buf = np.zeros((chunk_size, len(EVENT_COLUMNS)), dtype=float)
+        self._n_buf = 0  # rows in buffer, not yet written
+        self.n_rows = 0  # rows added so far
+
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, "w") as f:
+            f.write(",".join(EVENT_COLUMNS) + "\n")
+
+    # pylint: disable=too-many-positional-arguments
+    def add(
+        self,
+        test_i: int,
+        ut: int,
+        prob_up: float,
+        true_up: bool,
+        acct_up_profit: float,
+        acct_down_profit: float,
+        pdr_profit_OCEAN: float,
+        trader_profit_USD: float,
+    ):
+        """Add one row. Writes the buffer to file if it's full"""
+        self._buf[self._n_buf, :] = (
+            test_i,
+            ut,
+            prob_up,
+            true_up,
+            acct_up_profit,
+            acct_down_profit,
+            pdr_profit_OCEAN,
+            trader_profit_USD,
+        )
+        self._n_buf += 1
+        self.n_rows += 1
+        if self._n_buf == self._buf.shape[0]:
+            self.flush()
+
+    def add_many(self, cols: dict):
+        """Add many rows at once. cols maps each of EVENT_COLUMNS to 1d array"""
+        self.flush()
+        rows = np.column_stack([cols[name] for name in EVENT_COLUMNS])
+        self._write(rows)
+        self.n_rows += rows.shape[0]
+
+    def flush(self):
+        """Write buffered rows to file"""
+        if self._n_buf == 0:
+            return
+        self._write(self._buf[: self._n_buf])
+        self._n_buf = 0
+
+    def close(self):
+        self.flush()
+
+    def _write(self, rows: np.ndarray):
+        with open(self.filename, "a") as f:
+            np.savetxt(f, rows, fmt=_EVENT_FMT, delimiter=",")
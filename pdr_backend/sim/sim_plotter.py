@@ -1,17 +1,17 @@
-import glob
 import os
-import pickle
-import time
-from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from enforce_typing import enforce_types
+from dash import Patch
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from pdr_backend.aimodel.aimodel_plotdata import AimodelPlotdata
+from pdr_backend.sim.sim_state import SimState
+from pdr_backend.sim.sim_state_log import SimStateLog, extend_state
 
 from pdr_backend.statutil.autocorrelation_plotdata import (
     AutocorrelationPlotdataFactory,
@@ -34,6 +34,10 @@ class SimPlotter:
         self.aimodel_plotdata = None
         self.multi_id = None
 
+        # writer: log of saved state. Reader: plotdata file loaded
+        self.state_log: Optional[SimStateLog] = None
+        self.plotdata_file: Optional[str] = None
+
     @staticmethod
     def get_latest_run_id():
         if not os.path.exists("sim_state"):
@@ -49,6 +53,10 @@ class SimPlotter:
         return [str(p).replace("sim_state/", "") for p in path]
 
     def load_state(self, multi_id):
+        """
+        Load the sim's latest checkpoint. If called again for the same sim,
+        read only the rows appended since, and the plotdata if it changed.
+        """
         root_path = f"sim_state/{multi_id}"
 
         if not os.path.exists("sim_state"):
@@ -61,86 +69,53 @@ class SimPlotter:
                 f"sim_state/{multi_id} folder does not exist. Please run the simulation first."
             )
 
-        all_state_files = glob.glob(f"{root_path}/st_*.pkl")
-        if not all_state_files:
+        state_log = SimStateLog(root_path)
+        if not state_log.exists():
             raise Exception("No state files found. Please run the simulation first.")
+        index = state_log.read_index()
 
-        if not os.path.exists(f"{root_path}/st_final.pkl"):
-            latest_st_file, latest_aimodel_file = _get_latest_usable_state(root_path)
-            with open(latest_st_file, "rb") as f:
-                self.st = pickle.load(f)
-
-            with open(latest_aimodel_file, "rb") as f:
-                self.aimodel_plotdata = pickle.load(f)
-
-            return self.st, latest_st_file.replace(f"{root_path}/st_", "").replace(
-                ".pkl", ""
-            )
-
-        # make sure the final state is written to disk before unpickling
-        # avoid race conditions with the pickling itself
-        if file_age_in_seconds(f"{root_path}/st_final.pkl") < 3:
-            time.sleep(3)
+        n_rows = index["n_rows"]
+        restarted = self.st is not None and n_rows < len(self.st.probs_up)
+        if self.st is None or self.multi_id != multi_id or restarted:
+            self.st = SimState()
+            self.multi_id = multi_id
+            self.plotdata_file = None
 
-        with open(f"{root_path}/st_final.pkl", "rb") as f:
-            self.st = pickle.load(f)
+        n_rows_read = len(self.st.probs_up)
+        if n_rows > n_rows_read:
+            rows = state_log.read_rows(n_rows_read, n_rows)
+            extend_state(self.st, rows)
+        self.st.iter_number = index["iter_number"]
 
-        with open(f"{root_path}/aimodel_plotdata_final.pkl", "rb") as f:
-            self.aimodel_plotdata = pickle.load(f)
+        if index["plotdata_file"] != self.plotdata_file:
+            self.aimodel_plotdata = state_log.read_plotdata(index["plotdata_file"])
+            self.plotdata_file = index["plotdata_file"]
 
-        return self.st, "final"
+        return self.st, "final" if index["is_final"] else index["ts"]
 
     def init_state(self, multi_id):
-        files = glob.glob("sim_state/{multi_id}/*")
-
         self.multi_id = multi_id
-
-        for f in files:
-            os.remove(f)
-
-        os.makedirs(f"sim_state/{multi_id}")
+        self.state_log = SimStateLog(f"sim_state/{multi_id}")
+        self.state_log.reset()
 
     def save_state(
-        self, sim_state, aimodel_plotdata: AimodelPlotdata, is_final: bool = False
+        self,
+        sim_state,
+        aimodel_plotdata: Optional[AimodelPlotdata] = None,
+        is_final: bool = False,
     ):
-        root_path = f"sim_state/{self.multi_id}"
-        ts = (
-            datetime.now().strftime("%Y%m%d_%H%M%S.%f")[:-3]
-            if not is_final
-            else "final"
-        )
-
-        existing_states = sorted(
-            glob.glob(f"{root_path}/st_*.pkl"), key=os.path.getmtime
-        )
-        existing_aimodel_plotdata = sorted(
-            glob.glob(f"{root_path}/aimodel_plotdata_*.pkl"), key=os.path.getmtime
-        )
-
-        if existing_states and not is_final:
-            # remove old files, but if state is not final,
-            # keep next to last so that the runner knows the sim
-            # is running and not warming up
-            existing_states = existing_states[:-1]
-            existing_aimodel_plotdata = existing_aimodel_plotdata[:-1]
-
-        for fl in existing_states:
-            os.remove(fl)
-
-        for fl in existing_aimodel_plotdata:
-            os.remove(fl)
-
-        with open(f"{root_path}/st_{ts}.pkl", "wb") as f:
-            pickle.dump(sim_state, f)
-
-        with open(f"{root_path}/aimodel_plotdata_{ts}.pkl", "wb") as f:
-            pickle.dump(aimodel_plotdata, f)
+        """
+        Append the new iterations of sim_state to the state log.
+        aimodel_plotdata=None means it's unchanged since the last save.
+        """
+        assert self.state_log is not None, "call init_state() first"
+        self.state_log.append(sim_state, aimodel_plotdata, is_final)
 
     @enforce_types
     def plot_pdr_profit_vs_time(self):
         y = list(np.cumsum(self.st.pdr_profits_OCEAN))
         ylabel = "predictoor profit (OCEAN)"
-        title = f"Predictoor profit vs time. Current: {y[-1]:.2f} OCEAN"
+        title = _pdr_profit_vs_time_title(y[-1])
         fig = make_subplots(rows=1, cols=1, subplot_titles=(title,))
         self._add_subplot_y_vs_time(fig, y, ylabel, "lines", row=1, col=1)
         return fig
@@ -149,7 +124,7 @@ class SimPlotter:
     def plot_trader_profit_vs_time(self):
         y = list(np.cumsum(self.st.trader_profits_USD))
         ylabel = "trader profit (USD)"
-        title = f"Trader profit vs time. Current: ${y[-1]:.2f}"
+        title = _trader_profit_vs_time_title(y[-1])
         fig = make_subplots(rows=1, cols=1, subplot_titles=(title,))
         self._add_subplot_y_vs_time(fig, y, ylabel, "lines", row=1, col=1)
         return fig
@@ -167,7 +142,7 @@ class SimPlotter:
             )
         )
         fig.add_hline(y=0, line_dash="dot", line_color="grey")
-        title = f"Predictoor profit dist. avg={np.average(y):.2f} OCEAN"
+        title = _pdr_profit_vs_ptrue_title(y)
         fig.update_layout(title=title)
         fig.update_xaxes(title="prob(up)")
         fig.update_yaxes(title="pdr profit (OCEAN)")
@@ -187,7 +162,7 @@ class SimPlotter:
             )
         )
         fig.add_hline(y=0, line_dash="dot", line_color="grey")
-        title = f"trader profit dist. avg={np.average(y):.2f} USD"
+        title = _trader_profit_vs_ptrue_title(y)
         fig.update_layout(title=title)
         fig.update_xaxes(title="prob(up)")
         fig.update_yaxes(title="trader profit (USD)")
@@ -197,15 +172,7 @@ class SimPlotter:
     @enforce_types
     def plot_model_performance_vs_time(self):
         # set titles
-        aim = self.st.aim
-        s1 = f"accuracy = {aim.acc_ests[-1]*100:.2f}% "
-        s1 += f"[{aim.acc_ls[-1]*100:.2f}%, {aim.acc_us[-1]*100:.2f}%]"
-
-        s2 = f"f1={aim.f1s[-1]:.4f}"
-        s2 += f" [recall={aim.recalls[-1]:.4f}"
-        s2 += f", precision={aim.precisions[-1]:.4f}]"
-
-        s3 = f"log loss = {aim.losses[-1]:.4f}"
+        s1, s2, s3 = _model_performance_titles(self.st.aim)
 
         # make subplots
         fig = make_subplots(
@@ -352,6 +319,78 @@ class SimPlotter:
         )
         fig.update_yaxes(title_text="log loss", row=3, col=1)
 
+    @enforce_types
+    def patch_figures(self, st_i: int) -> Dict[str, Patch]:
+        """
+        @description
+          Return updates for the figures that grow over time, so that a
+          dashboard can extend its figures rather than rebuild them.
+          Each update carries just iterations [st_i:] of self.st.
+
+        @return
+          patches -- dict of figure_name : Patch of its plotly figure
+        """
+        st, aim = self.st, self.st.aim
+        n = len(st.probs_up)
+        new_x = list(range(st_i, n))
+        hline_x = [0, n - 1]
+        patches = {}
+
+        for name, profits, title_func in [
+            ("pdr_profit_vs_time", st.pdr_profits_OCEAN, _pdr_profit_vs_time_title),
+            (
+                "trader_profit_vs_time",
+                st.trader_profits_USD,
+                _trader_profit_vs_time_title,
+            ),
+        ]:
+            y = np.cumsum(profits)
+            patch = Patch()
+            patch["data"][0]["x"].extend(new_x)
+            patch["data"][0]["y"].extend(y[st_i:].tolist())
+            patch["data"][1]["x"] = hline_x
+            patch["layout"]["annotations"][0]["text"] = title_func(y[-1])
+            patches[name] = patch
+
+        for name, profits, title_func in [
+            ("pdr_profit_vs_ptrue", st.pdr_profits_OCEAN, _pdr_profit_vs_ptrue_title),
+            (
+                "trader_profit_vs_ptrue",
+                st.trader_profits_USD,
+                _trader_profit_vs_ptrue_title,
+            ),
+        ]:
+            patch = Patch()
+            patch["data"][0]["x"].extend(st.probs_up[st_i:])
+            patch["data"][0]["y"].extend(profits[st_i:])
+            patch["layout"]["title"]["text"] = title_func(profits)
+            patches[name] = patch
+
+        # model performance. Traces are in the order that they're added
+        patch = Patch()
+        trace_ys = [
+            100 * aim.acc_us,
+            100 * aim.acc_ls,
+            100 * aim.acc_ests,
+            None,  # 50% line
+            aim.f1s,
+            aim.precisions,
+            aim.recalls,
+            None,  # 0.5 line
+            aim.losses,
+        ]
+        for trace_i, y in enumerate(trace_ys):
+            if y is None:
+                patch["data"][trace_i]["x"] = hline_x
+            else:
+                patch["data"][trace_i]["x"].extend(new_x)
+                patch["data"][trace_i]["y"].extend(y[st_i:].tolist())
+        for annotation_i, title in enumerate(_model_performance_titles(aim)):
+            patch["layout"]["annotations"][annotation_i]["text"] = title
+        patches["model_performance_vs_time"] = patch
+
+        return patches
+
     @enforce_types
     def plot_prediction_residuals_dist(self):
         if _model_is_classif(self.st):
@@ -461,50 +500,49 @@ class SimPlotter:
 
 
 @enforce_types
-def file_age_in_seconds(pathname):
-    stat_result = os.stat(pathname)
-    return time.time() - stat_result.st_mtime
+def _pdr_profit_vs_time_title(cum_profit) -> str:
+    return f"Predictoor profit vs time. Current: {cum_profit:.2f} OCEAN"
 
 
 @enforce_types
-def _model_is_classif(sim_state) -> bool:
-    yerrs = sim_state.aim.yerrs
-    return min(yerrs) == max(yerrs) == 0.0
+def _trader_profit_vs_time_title(cum_profit) -> str:
+    return f"Trader profit vs time. Current: ${cum_profit:.2f}"
 
 
 @enforce_types
-def empty_fig(title=""):
-    fig = go.Figure()
-    w = "white"
-    fig.update_layout(title=title, paper_bgcolor=w, plot_bgcolor=w)
-    fig.update_xaxes(visible=False, showgrid=False, gridcolor=w, zerolinecolor=w)
-    fig.update_yaxes(visible=False, showgrid=False, gridcolor=w, zerolinecolor=w)
-    return fig
+def _pdr_profit_vs_ptrue_title(profits) -> str:
+    return f"Predictoor profit dist. avg={np.average(profits):.2f} OCEAN"
 
 
 @enforce_types
-def _get_latest_usable_state(root_path: str):
-    all_state_files = glob.glob(f"{root_path}/st_*.pkl")
-    all_state_files.sort()
-    latest_file = all_state_files[-1]
+def _trader_profit_vs_ptrue_title(profits) -> str:
+    return f"trader profit dist. avg={np.average(profits):.2f} USD"
 
-    aimodel_filename = latest_file.replace("st_", "aimodel_plotdata_")
 
-    if os.path.exists(aimodel_filename):
-        return latest_file, aimodel_filename
+@enforce_types
+def _model_performance_titles(aim) -> Tuple[str, str, str]:
+    s1 = f"accuracy = {aim.acc_ests[-1]*100:.2f}% "
+    s1 += f"[{aim.acc_ls[-1]*100:.2f}%, {aim.acc_us[-1]*100:.2f}%]"
 
-    # if the process was interrupted on aimodel filename creation,
-    # the pair is invalid ==> use next to last state if exists
+    s2 = f"f1={aim.f1s[-1]:.4f}"
+    s2 += f" [recall={aim.recalls[-1]:.4f}"
+    s2 += f", precision={aim.precisions[-1]:.4f}]"
 
-    if len(all_state_files) < 1:
-        raise Exception("No valid state files found. Please run the simulation first.")
+    s3 = f"log loss = {aim.losses[-1]:.4f}"
+    return s1, s2, s3
 
-    latest_file = all_state_files[-2]
-    aimodel_filename = latest_file.replace("st_", "aimodel_plotdata_")
 
-    if not os.path.exists(aimodel_filename):
-        raise Exception(
-            "No valid aimodel_plotdata file found. Please run the simulation again."
-        )
+@enforce_types
+def _model_is_classif(sim_state) -> bool:
+    yerrs = sim_state.aim.yerrs
+    return min(yerrs) == max(yerrs) == 0.0
 
-    return latest_file, aimodel_filename
+
+@enforce_types
+def empty_fig(title=""):
+    fig = go.Figure()
+    w = "white"
+    fig.update_layout(title=title, paper_bgcolor=w, plot_bgcolor=w)
+    fig.update_xaxes(visible=False, showgrid=False, gridcolor=w, zerolinecolor=w)
+    fig.update_yaxes(visible=False, showgrid=False, gridcolor=w, zerolinecolor=w)
+    return fig
@@ -1,39 +1,102 @@
 from typing import Dict, List, Optional, Union
 
 from enforce_typing import enforce_types
+import numpy as np
+
+from pdr_backend.statutil.scoring import StreamingClassifMetrics
 
 
 @enforce_types
 class AimodelMetrics:
-    # pylint: disable=too-many-instance-attributes
+    """
+    Per-iteration aimodel metrics. Each series is a view into a preallocated
+    numpy array, which grows by doubling: appends are O(1) amortized.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        # 'i' is iteration number i. Row [i] holds each metric, in the
+        # order of recent_metrics_names()
+        #   acc_ests[i] : %-correct
+        #   acc_ls[i], acc_us[i] : %-correct-lower, %-correct-upper
+        #   f1s[i], precisions[i], recalls[i] : f1-score, precision, recall
+        #   losses[i] : log-loss
+        #   yerrs[i] : regressor pred'n errs, w/ sign
+        n_metrics = len(AimodelMetrics.recent_metrics_names())
+        self._arr = np.zeros((max(capacity, 1), n_metrics), dtype=float)
+        self.n = 0
 
-    def __init__(self):
-        # 'i' is iteration number i
-        self.acc_ests: List[float] = []  # [i] : %-correct
-        self.acc_ls: List[float] = []  # [i] : %-correct-lower
-        self.acc_us: List[float] = []  # [i] : %-correct-upper
+    # pylint: disable=too-many-positional-arguments
+    def update(self, acc_est, acc_l, acc_u, f1, precision, recall, loss, yerr):
+        if self.n == self._arr.shape[0]:  # full, so double the capacity
+            more_rows = np.zeros((max(self.n, 1), self._arr.shape[1]))
+            self._arr = np.concatenate([self._arr, more_rows])
+        self._arr[self.n, :] = [
+            acc_est,
+            acc_l,
+            acc_u,
+            f1,
+            precision,
+            recall,
+            loss,
+            yerr,
+        ]
+        self.n += 1
 
-        self.f1s: List[float] = []  # [i] : f1-score
-        self.precisions: List[float] = []  # [i] : precision
-        self.recalls: List[float] = []  # [i] : recall
+    # pylint: disable=too-many-positional-arguments
+    def update_many(
+        self, acc_ests, acc_ls, acc_us, f1s, precisions, recalls, losses, yerrs
+    ):
+        """Like update() for each iteration in turn. Args are 1d arrays"""
+        rows = np.column_stack(
+            [acc_ests, acc_ls, acc_us, f1s, precisions, recalls, losses, yerrs]
+        )
+        n_new = self.n + rows.shape[0]
+        if n_new > self._arr.shape[0]:
+            more_rows = np.zeros((n_new - self._arr.shape[0], self._arr.shape[1]))
+            self._arr = np.concatenate([self._arr, more_rows])
+        self._arr[self.n : n_new, :] = rows
+        self.n = n_new
+
+    def __getstate__(self) -> dict:
+        """When pickling, drop the unused preallocated rows"""
+        state = self.__dict__.copy()
+        state["_arr"] = self._arr[: self.n].copy()
+        return state
+
+    def _series(self, j: int) -> np.ndarray:
+        return self._arr[: self.n, j]
 
-        self.losses: List[float] = []  # [i] : log-loss
+    @property
+    def acc_ests(self) -> np.ndarray:
+        return self._series(0)
 
-        self.yerrs: List[float] = []  # [i] : regressor pred'n errs, w/ sign
+    @property
+    def acc_ls(self) -> np.ndarray:
+        return self._series(1)
 
-    # pylint: disable=too-many-positional-arguments
-    def update(self, acc_est, acc_l, acc_u, f1, precision, recall, loss, yerr):
-        self.acc_ests.append(acc_est)
-        self.acc_ls.append(acc_l)
-        self.acc_us.append(acc_u)
+    @property
+    def acc_us(self) -> np.ndarray:
+        return self._series(2)
+
+    @property
+    def f1s(self) -> np.ndarray:
+        return self._series(3)
+
+    @property
+    def precisions(self) -> np.ndarray:
+        return self._series(4)
 
-        self.f1s.append(f1)
-        self.precisions.append(precision)
-        self.recalls.append(recall)
+    @property
+    def recalls(self) -> np.ndarray:
+        return self._series(5)
 
-        self.losses.append(loss)
+    @property
+    def losses(self) -> np.ndarray:
+        return self._series(6)
 
-        self.yerrs.append(yerr)
+    @property
+    def yerrs(self) -> np.ndarray:
+        return self._series(7)
 
     @staticmethod
     def recent_metrics_names() -> List[str]:
@@ -50,19 +113,11 @@ class AimodelMetrics:
 
     def recent_metrics(self) -> Dict[str, Union[int, float, None]]:
         """Return most recent aimodel metrics"""
-        if not self.acc_ests:
-            return {key: None for key in AimodelMetrics.recent_metrics_names()}
+        names = AimodelMetrics.recent_metrics_names()
+        if self.n == 0:
+            return {key: None for key in names}
 
-        return {
-            "acc_est": self.acc_ests[-1],
-            "acc_l": self.acc_ls[-1],
-            "acc_u": self.acc_us[-1],
-            "f1": self.f1s[-1],
-            "precision": self.precisions[-1],
-            "recall": self.recalls[-1],
-            "loss": self.losses[-1],
-            "yerr": self.yerrs[-1],
-        }
+        return {key: float(val) for key, val in zip(names, self._arr[self.n - 1])}
 
 
 # pylint: disable=too-many-instance-attributes
@@ -72,15 +127,18 @@ class SimState:
         self.init_loop_attributes()
         self.iter_number = 0
 
-    def init_loop_attributes(self):
+    def init_loop_attributes(self, capacity: int = 1000):
         # 'i' is iteration number i
 
         # base data
         self.ytrues: List[bool] = []  # [i] : was-truly-up
         self.probs_up: List[float] = []  # [i] : predicted-prob-up
 
+        # running classifier metrics, across all (ytrues, probs_up) so far
+        self.classif_metrics = StreamingClassifMetrics()
+
         # aimodel metrics
-        self.aim = AimodelMetrics()
+        self.aim = AimodelMetrics(capacity)
 
         # profits
         self.pdr_profits_OCEAN: List[float] = []  # [i] : predictoor-profit
@@ -95,7 +153,7 @@ class SimState:
 
     def recent_metrics(
         self, extras: Optional[List[str]] = None
-    ) -> List[Union[int, float]]:
+    ) -> Dict[str, Union[int, float, None]]:
         """Return most recent aimodel metrics + profit metrics"""
         rm = self.aim.recent_metrics().copy()
         rm.update(
@@ -116,4 +174,4 @@ class SimState:
 
     @property
     def n_correct(self) -> int:
-        return sum((p > 0.5) == t for p, t in zip(self.probs_up, self.ytrues))
+        return self.classif_metrics.n_correct
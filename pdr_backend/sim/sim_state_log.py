@@ -0,0 +1,157 @@
+import glob
+import json
+import os
+import pickle
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from enforce_typing import enforce_types
+
+from pdr_backend.aimodel.aimodel_plotdata import AimodelPlotdata
+from pdr_backend.sim.sim_state import AimodelMetrics, SimState
+
+# one float64 per column, per iteration
+COLUMNS = (
+    ["prob_up", "ytrue"]
+    + AimodelMetrics.recent_metrics_names()
+    + ["pdr_profit_OCEAN", "trader_profit_USD"]
+)
+ROW_NBYTES = len(COLUMNS) * np.dtype(np.float64).itemsize
+
+METRICS_FILE = "metrics.bin"
+INDEX_FILE = "index.json"
+
+
+class SimStateLog:
+    """
+    Append-only on-disk log of one sim's state, in a directory:
+    - metrics.bin: one row of float64s per iteration, in COLUMNS order.
+      Rows are only ever appended
+    - aimodel_plotdata_<n_rows>.pkl: written only when the model changes
+    - index.json: the latest checkpoint: # rows, plotdata file, iter #.
+      Replaced atomically, after the data it points to is written.
+      Readers use only what it points to.
+    """
+
+    @enforce_types
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.n_rows = 0  # rows written so far, by this writer
+        self.plotdata_file: Optional[str] = None  # latest written
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.root_path, filename)
+
+    # --------------------------------
+    # writer
+    def reset(self):
+        """Start a new log. Removes any previous one in root_path"""
+        os.makedirs(self.root_path, exist_ok=True)
+        for pathname in glob.glob(self.path("*")):
+            os.remove(pathname)
+        self.n_rows = 0
+        self.plotdata_file = None
+
+    @enforce_types
+    def append(
+        self,
+        st: SimState,
+        aimodel_plotdata: Optional[AimodelPlotdata] = None,
+        is_final: bool = False,
+    ):
+        """
+        @description
+          Checkpoint. Append the iterations in st that aren't in the log
+          yet. Write aimodel_plotdata if given, ie if it changed.
+
+        @arguments
+          st -- sim state so far. Its series only ever grow
+          aimodel_plotdata -- None means: unchanged since last checkpoint
+          is_final -- is this the final checkpoint of the sim?
+        """
+        rows = state_to_rows(st, self.n_rows)
+        with open(self.path(METRICS_FILE), "ab") as f:
+            f.write(rows.tobytes())
+        self.n_rows += rows.shape[0]
+
+        prev_plotdata_file = self.plotdata_file
+        if aimodel_plotdata is not None:
+            self.plotdata_file = f"aimodel_plotdata_{self.n_rows}.pkl"
+            with open(self.path(self.plotdata_file), "wb") as f:
+                pickle.dump(aimodel_plotdata, f)
+        assert self.plotdata_file is not None, "need plotdata at 1st checkpoint"
+
+        index = {
+            "n_rows": self.n_rows,
+            "iter_number": st.iter_number,
+            "plotdata_file": self.plotdata_file,
+            "is_final": is_final,
+            "ts": datetime.now().strftime("%Y%m%d_%H%M%S.%f")[:-3],
+        }
+        tmp_path = self.path(INDEX_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.path(INDEX_FILE))
+
+        # a reader may still be loading the previous plotdata. Keep it
+        for pathname in glob.glob(self.path("aimodel_plotdata_*.pkl")):
+            filename = os.path.basename(pathname)
+            if filename not in [self.plotdata_file, prev_plotdata_file]:
+                os.remove(pathname)
+
+    # --------------------------------
+    # reader
+    def exists(self) -> bool:
+        return os.path.exists(self.path(INDEX_FILE))
+
+    def read_index(self) -> dict:
+        with open(self.path(INDEX_FILE), "r") as f:
+            return json.load(f)
+
+    @enforce_types
+    def read_rows(self, st_row: int, fin_row: int) -> np.ndarray:
+        """Return rows [st_row, fin_row) of the log, as 2d array"""
+        n_rows = fin_row - st_row
+        with open(self.path(METRICS_FILE), "rb") as f:
+            f.seek(st_row * ROW_NBYTES)
+            rows = np.fromfile(f, dtype=np.float64, count=n_rows * len(COLUMNS))
+        return rows.reshape((n_rows, len(COLUMNS)))
+
+    def read_plotdata(self, plotdata_file: str) -> AimodelPlotdata:
+        with open(self.path(plotdata_file), "rb") as f:
+            return pickle.load(f)
+
+
+@enforce_types
+def state_to_rows(st: SimState, st_row: int) -> np.ndarray:
+    """Return iterations [st_row:] of st, as 2d array in COLUMNS order"""
+    aim = st.aim
+    cols: List = [
+        st.probs_up[st_row:],
+        st.ytrues[st_row:],
+        aim.acc_ests[st_row:],
+        aim.acc_ls[st_row:],
+        aim.acc_us[st_row:],
+        aim.f1s[st_row:],
+        aim.precisions[st_row:],
+        aim.recalls[st_row:],
+        aim.losses[st_row:],
+        aim.yerrs[st_row:],
+        st.pdr_profits_OCEAN[st_row:],
+        st.trader_profits_USD[st_row:],
+    ]
+    assert len(cols) == len(COLUMNS)
+    return np.column_stack(cols).astype(np.float64).reshape((-1, len(COLUMNS)))
+
+
+@enforce_types
+def extend_state(st: SimState, rows: np.ndarray):
+    """Append rows in COLUMNS order, from state_to_rows(), to st"""
+    probs_up, ytrues = rows[:, 0], rows[:, 1].astype(bool)
+    st.probs_up.extend(probs_up.tolist())
+    st.ytrues.extend(ytrues.tolist())
+    st.classif_metrics.update_many(ytrues, probs_up)
+    st.aim.update_many(*[rows[:, j] for j in range(2, 10)])
+    st.pdr_profits_OCEAN.extend(rows[:, 10].tolist())
+    st.trader_profits_USD.extend(rows[:, 11].tolist())
@@ -1,5 +1,8 @@
 import logging
+
+import numpy as np
 from enforce_typing import enforce_types
+
 from pdr_backend.exchange.exchange_mgr import ExchangeMgr
 
 
@@ -152,7 +155,7 @@ class SimTrader:
             str(self.predict_feed.pair), tokcoin_amt_recd
         )
 
-        logger.info(
+        logger.debug(
             "TX: BUY : send %8.2f %s, receive %8.2f %s, fee = %8.4f %s",
             usdcoin_amt_send,
             self.usdcoin,
@@ -186,7 +189,7 @@ class SimTrader:
         )
 
         usdcoin_amt_fee = tok_amt_fee * price
-        logger.info(
+        logger.debug(
             "TX: SELL: send %8.2f %s, receive %8.2f %s, fee = %8.4f %s",
             tokcoin_amt_send,
             self.tokcoin,
@@ -197,3 +200,98 @@ class SimTrader:
         )
 
         return usdcoin_amt_recd
+
+
+# pylint: disable=too-many-positional-arguments, too-many-locals
+@enforce_types
+def simulate_trades(
+    ppss,
+    cur_closes: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    pred_ups: np.ndarray,
+    pred_downs: np.ndarray,
+    conf_ups: np.ndarray,
+    conf_downs: np.ndarray,
+) -> np.ndarray:
+    """
+    @description
+      Trader profit at each iteration, for a whole window at once. Same
+      results as SimTrader.trade_iter() called once per iteration, starting
+      with no open position. For histmock only: it skips the (mock)
+      exchange orders and per-trade logging, and keeps the long/short
+      TP/SL state in local variables.
+
+    @arguments
+      cur_closes, highs, lows -- 1d arrays [i] : price at iteration i
+      pred_ups, pred_downs -- 1d arrays [i] : bool
+      conf_ups, conf_downs -- 1d arrays [i] : float
+
+    @return
+      profits -- 1d array [i] : profit made by the trader in iteration i
+    """
+    trade_amt = ppss.trader_ss.buy_amt_usd.amt_eth
+    fee = ppss.trader_ss.fee_percent
+    tp_percent = ppss.trader_ss.take_profit_percent
+    sl_percent = ppss.trader_ss.stop_loss_percent
+
+    def _buy(price: float, usd_send: float) -> float:
+        return (usd_send - usd_send * fee) / price
+
+    def _sell(price: float, tok_send: float) -> float:
+        return (tok_send - tok_send * fee) * price
+
+    # python floats & bools: faster per-element access than numpy scalars
+    cols = zip(
+        cur_closes.tolist(),
+        highs.tolist(),
+        lows.tolist(),
+        pred_ups.tolist(),
+        pred_downs.tolist(),
+        conf_ups.tolist(),
+        conf_downs.tolist(),
+    )
+    profits = np.zeros(len(cur_closes), dtype=float)
+    position_open, size, worth, tp, sl = "", 0.0, 0.0, 0.0, 0.0
+    for i, (close, high, low, pred_up, pred_down, conf_up, conf_down) in enumerate(
+        cols
+    ):
+        if position_open == "":
+            if pred_up:
+                worth = trade_amt * (1 + conf_up)
+                size = _buy(close, worth)
+                position_open = "long"
+                tp = close + (close * tp_percent)
+                sl = close - (close * sl_percent)
+            elif pred_down:
+                size = trade_amt * (1 + conf_down) / close
+                worth = _sell(close, size)
+                position_open = "short"
+                tp = close - (close * tp_percent)
+                sl = close + (close * sl_percent)
+            continue
+
+        if position_open == "long":
+            if high >= tp:
+                exit_price = tp
+            elif low <= sl:
+                exit_price = sl
+            elif not pred_up:
+                exit_price = close
+            else:
+                continue
+            profits[i] = _sell(exit_price, size) - worth
+
+        else:  # short
+            if low <= tp:
+                exit_price = tp
+            elif high >= sl:
+                exit_price = sl
+            elif not pred_down:
+                exit_price = close
+            else:
+                continue
+            profits[i] = worth - size * exit_price
+        position_open = ""
+
+    return profits
@@ -1,7 +1,10 @@
+import threading
+import time
 from unittest.mock import Mock, patch
 
 from plotly.graph_objs import Figure
 
+from pdr_backend.sim.dash_plots.callbacks import get_callbacks
 from pdr_backend.sim.dash_plots.util import get_figures_by_state
 from pdr_backend.sim.dash_plots.view_elements import (
     get_tabs,
@@ -74,3 +77,51 @@ def test_get_figures_by_state():
     for key in figure_names:
         assert key in result
         assert isinstance(result[key], Figure)
+
+
+def test_update_graph_live_one_load_at_a_time_per_run():
+    # collect the callbacks, without a real Dash app
+    funcs = {}
+
+    def _callback(*args, **kwargs):  # pylint: disable=unused-argument
+        def _decorator(f):
+            funcs[f.__name__] = f
+            return f
+
+        return _decorator
+
+    app = Mock()
+    app.run_id = "run1"
+    app.callback = _callback
+
+    # a SimPlotter that notices overlapping loads
+    n_active, max_active, n_plotters = [0], [0], [0]
+    lock = threading.Lock()
+
+    class _SimPlotter:
+        def __init__(self):
+            n_plotters[0] += 1
+
+        def load_state(self, run_id):  # pylint: disable=unused-argument
+            with lock:
+                n_active[0] += 1
+                max_active[0] = max(max_active[0], n_active[0])
+            time.sleep(0.02)
+            with lock:
+                n_active[0] -= 1
+            raise ValueError("no state yet")
+
+    with patch("pdr_backend.sim.dash_plots.callbacks.SimPlotter", _SimPlotter):
+        get_callbacks(app)
+        update = funcs["update_graph_live"]
+        threads = [
+            threading.Thread(target=update, args=(i, [], [], None, None))
+            for i in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert n_plotters[0] == 1  # one reused plotter per run_id
+    assert max_active[0] == 1  # its loads never overlapped
@@ -1,13 +1,24 @@
 import os
+import shutil
 
 from enforce_typing import enforce_types
+import pandas as pd
+import polars as pl
+import pytest
 
+from pdr_backend.aimodel.aimodel_data_factory import AimodelDataFactory
 from pdr_backend.ppss.lake_ss import lake_ss_test_dict
 from pdr_backend.ppss.multisim_ss import multisim_ss_test_dict
 from pdr_backend.ppss.ppss import PPSS, fast_test_yaml_str
 from pdr_backend.ppss.predictoor_ss import predictoor_ss_test_dict
 from pdr_backend.ppss.sim_ss import sim_ss_test_dict
-from pdr_backend.sim.multisim_engine import MultisimEngine
+from pdr_backend.lake.ohlcv_data_factory import OhlcvDataFactory
+from pdr_backend.sim.multisim_engine import (
+    MultisimEngine,
+    _attach_df,
+    _lake_key,
+    _publish_df,
+)
 from pdr_backend.sim.sim_state import SimState
 
 
@@ -34,6 +45,247 @@ def test_multisim1(tmpdir):
     assert df["pdr_profit_OCEAN"].is_unique
 
 
+CSV_FILE = (
+    "./pdr_backend/lake/test/merged_ohlcv_df_BTC-ETH_2024-02-01_to_2024-03-08.csv"
+)
+
+
+@enforce_types
+def test_multisim_parallel_and_resume(tmpdir, monkeypatch):
+    """Runs in a process pool; data loaded once; resume skips done runs"""
+    constructor_d = _constructor_d_with_fast_runtime(tmpdir)
+    feed_s = "binance BTC/USDT c 5m"
+    constructor_d["lake_ss"]["feeds"] = [feed_s]
+    feedset_list = [{"train_on": feed_s, "predict": feed_s}]
+    constructor_d["predictoor_ss"]["predict_train_feedsets"] = feedset_list
+
+    param = "predictoor_ss.aimodel_data_ss.autoregressive_n"
+    csv_file = os.path.join(tmpdir, "multisim_metrics.csv")
+    constructor_d["multisim_ss"] = multisim_ss_test_dict(
+        sweep_params=[{param: "1, 2, 3"}],
+        n_workers=2,
+        csv_file=csv_file,
+    )
+
+    # offline data. Count loads
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    n_loads = []
+
+    def _mock_get_mergedohlcv_df(_self):
+        n_loads.append(1)
+        return mergedohlcv_df
+
+    monkeypatch.setattr(
+        OhlcvDataFactory, "get_mergedohlcv_df", _mock_get_mergedohlcv_df
+    )
+    # sims save final state to ./sim_state. Workers need ./logging.yaml
+    shutil.copy("logging.yaml", tmpdir)
+    monkeypatch.chdir(tmpdir)
+
+    # first run: record run 1 only, as if the sweep got killed after it
+    multisim_engine = MultisimEngine(constructor_d)
+    assert multisim_engine.ss.n_workers == 2
+    assert multisim_engine.csv_file == csv_file
+    multisim_engine.initialize_csv_with_header()
+    ppss1 = multisim_engine.ppss_from_point(multisim_engine.ss.point_i(1))
+    multisim_engine.ohlcv_dfs[_lake_key(ppss1)] = mergedohlcv_df
+    multisim_engine.run_one(1)
+    assert multisim_engine.completed_run_numbers() == {1}
+
+    # resume: the other 2 runs, in parallel. 1 data load for all of them,
+    # published once for the workers to share
+    multisim_engine = MultisimEngine(constructor_d)
+    multisim_engine.run()
+    assert len(n_loads) == 1
+    assert len(multisim_engine.ohlcv_dfs) == len(multisim_engine.ohlcv_paths) == 1
+    path = list(multisim_engine.ohlcv_paths.values())[0]
+    assert not os.path.exists(path)  # cleaned up after
+
+    df = multisim_engine.load_csv()
+    assert sorted(df["run_number"]) == [0, 1, 2]
+    assert multisim_engine.completed_run_numbers() == {0, 1, 2}
+    assert sorted(df[param]) == [1, 2, 3]
+
+
+@enforce_types
+def test_multisim_fast_sweep(tmpdir, monkeypatch):
+    """Successive halving: all points at rung 0, top half go on, & resume"""
+    constructor_d = _constructor_d_with_fast_runtime(tmpdir)
+    feed_s = "binance BTC/USDT c 5m"
+    constructor_d["lake_ss"]["feeds"] = [feed_s]
+    feedset_list = [{"train_on": feed_s, "predict": feed_s}]
+    constructor_d["predictoor_ss"]["predict_train_feedsets"] = feedset_list
+    constructor_d["sim_ss"]["test_n"] = 12
+
+    param = "predictoor_ss.aimodel_data_ss.autoregressive_n"
+    csv_file = os.path.join(tmpdir, "multisim_metrics.csv")
+    constructor_d["multisim_ss"] = multisim_ss_test_dict(
+        approach="FastSweep",
+        sweep_params=[{param: "1, 2, 3, 4"}],
+        csv_file=csv_file,
+        fast_sweep={"metric": "pdr_profit_OCEAN", "keep_frac": 0.5, "min_test_n": 3},
+    )
+
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    monkeypatch.setattr(
+        OhlcvDataFactory, "get_mergedohlcv_df", lambda _self: mergedohlcv_df
+    )
+    monkeypatch.chdir(tmpdir)
+
+    multisim_engine = MultisimEngine(constructor_d)
+    assert multisim_engine.rung_test_ns() == [3, 6, 12]
+    header = multisim_engine.csv_header()
+    assert header[:3] == ["run_number", "rung", "test_n"]
+    multisim_engine.run()
+
+    # 4 runs at rung 0, best 2 at rung 1, best 1 at rung 2
+    df = multisim_engine.load_csv()
+    assert list(df.columns) == header
+    assert list(df.groupby("rung").size()) == [4, 2, 1]
+    assert sorted(set(df["test_n"])) == [3, 6, 12]
+    for rung in [0, 1]:
+        df_rung = df[df["rung"] == rung]
+        best = df_rung.nlargest(len(df_rung) // 2, "pdr_profit_OCEAN")
+        next_runs = df[df["rung"] == rung + 1]["run_number"]
+        assert set(next_runs) == set(best["run_number"])
+
+    # resume: drop the last sim from the csv. Only it gets re-run
+    metrics = multisim_engine.completed_rung_metrics()
+    assert len(metrics) == 7
+    with open(csv_file, "r") as f:
+        lines = f.readlines()
+    with open(csv_file, "w") as f:
+        f.writelines(lines[:-1])
+
+    n_sims = []
+    orig_run_one = MultisimEngine.run_one
+
+    def _spy_run_one(self, run_i, rung=None):
+        n_sims.append((run_i, rung))
+        return orig_run_one(self, run_i, rung)
+
+    monkeypatch.setattr(MultisimEngine, "run_one", _spy_run_one)
+    MultisimEngine(constructor_d).run()
+    assert n_sims == [(int(df["run_number"].iloc[-1]), 2)]
+
+
+@enforce_types
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_multisim_rolling_cv(tmpdir, monkeypatch, n_workers):
+    """Each point on each fold; model inputs shared across points; ranked"""
+    constructor_d = _constructor_d_with_fast_runtime(tmpdir)
+    feed_s = "binance BTC/USDT c 5m"
+    constructor_d["lake_ss"]["feeds"] = [feed_s]
+    feedset_list = [{"train_on": feed_s, "predict": feed_s}]
+    constructor_d["predictoor_ss"]["predict_train_feedsets"] = feedset_list
+    constructor_d["predictoor_ss"]["aimodel_ss"]["train_every_n_epochs"] = 2
+    constructor_d["sim_ss"]["test_n"] = 4
+
+    param = "predictoor_ss.aimodel_ss.approach"
+    csv_file = os.path.join(tmpdir, "multisim_metrics.csv")
+    constructor_d["multisim_ss"] = multisim_ss_test_dict(
+        approach="RollingCV",
+        sweep_params=[{param: "ClassifLinearRidge, ClassifLinearLasso"}],
+        n_workers=n_workers,
+        csv_file=csv_file,
+        rolling_cv={"n_folds": 3, "metric": "loss"},
+    )
+
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    monkeypatch.setattr(
+        OhlcvDataFactory, "get_mergedohlcv_df", lambda _self: mergedohlcv_df
+    )
+    shutil.copy("logging.yaml", tmpdir)
+    monkeypatch.chdir(tmpdir)
+
+    # spy on model inputs: (# rows of data, testshift). Serial runs only
+    xy_calls = []
+    orig_create_xy = AimodelDataFactory.create_xy
+
+    def _spy_create_xy(self, df, testshift, *args, **kwargs):
+        xy_calls.append((len(df), testshift))
+        return orig_create_xy(self, df, testshift, *args, **kwargs)
+
+    monkeypatch.setattr(AimodelDataFactory, "create_xy", _spy_create_xy)
+
+    multisim_engine = MultisimEngine(constructor_d)
+    header = multisim_engine.csv_header()
+    assert header[:2] == ["run_number", "fold"]
+    multisim_engine.run()
+
+    df = multisim_engine.load_csv()
+    assert list(df.columns) == header
+    assert sorted(zip(df["run_number"], df["fold"])) == [
+        (run_i, fold) for run_i in range(2) for fold in range(3)
+    ]
+
+    # folds are consecutive windows; the 2nd point reused the 1st's inputs
+    if n_workers == 1:
+        n_rows = len(mergedohlcv_df)
+        assert {len_df for len_df, _ in xy_calls} == {n_rows - 8, n_rows - 4, n_rows}
+        assert len(xy_calls) == len(set(xy_calls))
+
+    # ranked: mean across folds, lowest loss first
+    ranked_df = pd.read_csv(multisim_engine.ranked_csv_file)
+    assert list(ranked_df["n_folds"]) == [3, 3]
+    assert ranked_df["loss"].is_monotonic_increasing
+    for _, row in ranked_df.iterrows():
+        losses = df[df["run_number"] == row["run_number"]]["loss"]
+        assert row["loss"] == pytest.approx(losses.mean())
+    assert set(ranked_df[param]) == {"ClassifLinearRidge", "ClassifLinearLasso"}
+
+    # resume: drop the last sim from the csv. Only it gets re-run
+    with open(csv_file, "r") as f:
+        lines = f.readlines()
+    with open(csv_file, "w") as f:
+        f.writelines(lines[:-1])
+
+    n_sims = []
+    orig_run_one_fold = MultisimEngine.run_one_fold
+
+    def _spy_run_one_fold(self, run_i, fold, xy_cache=None):
+        n_sims.append((run_i, fold))
+        return orig_run_one_fold(self, run_i, fold, xy_cache)
+
+    monkeypatch.setattr(MultisimEngine, "run_one_fold", _spy_run_one_fold)
+    MultisimEngine(constructor_d).run()
+    assert n_sims == [(int(df["run_number"].iloc[-1]), int(df["fold"].iloc[-1]))]
+
+
+@enforce_types
+def test_multisim_rolling_cv_vectorized_only_if_histmock(tmpdir):
+    constructor_d = _constructor_d_with_fast_runtime(tmpdir)
+    param = "sim_ss.tradetype"
+    constructor_d["multisim_ss"] = multisim_ss_test_dict(
+        approach="RollingCV",
+        sweep_params=[{param: "histmock, livemock"}],
+        csv_file=os.path.join(tmpdir, "multisim_metrics.csv"),
+        rolling_cv={"n_folds": 2, "metric": "loss"},
+    )
+    multisim_engine = MultisimEngine(constructor_d)
+
+    vectorizeds = {}
+    for run_i in range(2):
+        d, _ = multisim_engine._d_from_fold(  # pylint: disable=protected-access
+            run_i, 0
+        )
+        ppss = PPSS(d=d, network="development")  # valid, so the sim can run
+        vectorizeds[ppss.sim_ss.tradetype] = ppss.sim_ss.vectorized
+    assert vectorizeds == {"histmock": True, "livemock": False}
+
+
+@enforce_types
+def test_multisim_publish_attach_df(tmpdir):
+    df = pl.read_csv(CSV_FILE)
+    path = os.path.join(tmpdir, "mergedohlcv.arrow")
+    _publish_df(df, path)
+
+    df2 = _attach_df(path)
+    assert df2.equals(df)
+    assert df2.n_chunks() == 1
+    assert _attach_df(path) is df2  # attach once per process
+
+
 @enforce_types
 def _constructor_d_with_fast_runtime(tmpdir):
     s = fast_test_yaml_str(tmpdir)
@@ -2,6 +2,7 @@ import os
 from copy import deepcopy
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 import polars as pl
 
@@ -95,28 +96,27 @@ def test_get_predictions_data(tmpdir):
     assert os.path.exists(ppss.lake_ss.lake_dir)
     assert os.path.exists(os.path.join(ppss.lake_ss.lake_dir, "duckdb.db"))
 
-    st_ut_s = UnixTimeMs(ppss.lake_ss.st_timestamp).to_seconds()
-    prediction_dataset = SimChainPredictions.get_predictions_data(
-        st_ut_s,
-        UnixTimeMs(ppss.lake_ss.fin_timestamp).to_seconds(),
+    # sim grid: every 5 min, around the db's slots
+    db = DuckDBDataStore(ppss.lake_ss.lake_dir)
+    db_slots = db.query_data("SELECT slot FROM pdr_payouts ORDER BY slot")["slot"]
+    slots = np.arange(db_slots[0] - 600, db_slots[-1] + 600, 300)
+    probs_up, valid = SimChainPredictions.get_predictions_data(
+        slots,
         ppss,
         sim_engine.predict_feed,
     )
 
-    db = DuckDBDataStore(ppss.lake_ss.lake_dir)
-    test_query = f"""
-            SELECT 
-                slot
-            FROM pdr_payouts
-            WHERE
-                slot > {st_ut_s}
-            LIMIT 1"""
-
-    df = db.query_data(test_query)
-    assert df is not None
-    assert isinstance(prediction_dataset, dict)
-
-    assert df["slot"][0] in prediction_dataset
+    assert probs_up.shape == valid.shape == slots.shape
+    assert valid.sum() == len(db_slots)
+    assert slots[valid].tolist() == db_slots.to_list()
+    assert probs_up[valid].tolist() == [1.0] * len(db_slots)  # stakes up / all
+    assert not probs_up[~valid].any()
+
+    # empty grid
+    probs_up, valid = SimChainPredictions.get_predictions_data(
+        np.array([], dtype=int), ppss, sim_engine.predict_feed
+    )
+    assert len(probs_up) == len(valid) == 0
     _clear_test_db(ppss)
 
 
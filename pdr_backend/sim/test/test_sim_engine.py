@@ -1,11 +1,16 @@
+import logging
 import os
 
+import numpy as np
+from numpy.testing import assert_array_equal
+import polars as pl
 import pytest
 from dash import Dash
 from enforce_typing import enforce_types
 from selenium.common.exceptions import NoSuchElementException  # type: ignore[import-untyped]
 
 from pdr_backend.aimodel.aimodel import Aimodel
+from pdr_backend.aimodel.aimodel_data_factory import AimodelDataFactory
 from pdr_backend.cli.predict_train_feedsets import PredictTrainFeedsets
 from pdr_backend.ppss.lake_ss import LakeSS, lake_ss_test_dict
 from pdr_backend.ppss.ppss import PPSS, fast_test_yaml_str
@@ -14,6 +19,7 @@ from pdr_backend.ppss.sim_ss import SimSS, sim_ss_test_dict
 from pdr_backend.sim.dash_plots.callbacks import get_callbacks
 from pdr_backend.sim.dash_plots.view_elements import get_layout
 from pdr_backend.sim.sim_engine import SimEngine
+from pdr_backend.sim.sim_plotter import SimPlotter
 
 
 @enforce_types
@@ -100,3 +106,200 @@ def test_sim_engine(tmpdir, check_chromedriver, dash_duo):
         assert "tab--selected" in tab.get_attribute("class")
         for figure_name in figures:
             dash_duo.find_element(f"#{figure_name}")
+
+
+CSV_FILE = (
+    "./pdr_backend/lake/test/merged_ohlcv_df_BTC-ETH_2024-02-01_to_2024-03-08.csv"
+)
+
+
+@enforce_types
+@pytest.mark.parametrize("approach", ["ClassifLinearRidge", "RegrLinearRidge"])
+def test_sim_engine_predict_ahead(tmpdir, monkeypatch, approach):
+    """Between retrains, the sim scores test rows in one batch call"""
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    s = fast_test_yaml_str(tmpdir)
+    ppss = PPSS(yaml_str=s, network="development")
+
+    feedset_list = [
+        {
+            "predict": "binance BTC/USDT c 5m",
+            "train_on": "binance BTC/USDT ETH/USDT c 5m",
+        }
+    ]
+    d = predictoor_ss_test_dict(feedset_list)
+    d["aimodel_data_ss"]["max_n_train"] = 100
+    d["aimodel_data_ss"]["autoregressive_n"] = 2
+    d["aimodel_ss"]["approach"] = approach
+    d["aimodel_ss"]["train_every_n_epochs"] = 3
+    ppss.predictoor_ss = PredictoorSS(d)
+
+    test_n = 7
+    ppss.sim_ss = SimSS(sim_ss_test_dict(os.path.join(tmpdir, "logs"), test_n=test_n))
+
+    # spy on batch predictions of test rows (not of plots' response mesh)
+    X_batches = []
+    orig_predict_ahead = SimEngine._predict_ahead
+
+    def _spy_predict_ahead(self, *args, **kwargs):
+        orig_predict = self.model.predict_ptrue_ycont
+
+        def _spy_predict(X):
+            X_batches.append(X)
+            return orig_predict(X)
+
+        self.model.predict_ptrue_ycont = _spy_predict
+        try:
+            orig_predict_ahead(self, *args, **kwargs)
+        finally:
+            del self.model.predict_ptrue_ycont
+
+    monkeypatch.setattr(SimEngine, "_predict_ahead", _spy_predict_ahead)
+
+    # go
+    monkeypatch.chdir(tmpdir)
+    feedset = ppss.predictoor_ss.predict_train_feedsets[0]
+    sim_engine = SimEngine(ppss, feedset)
+    sim_engine.disable_realtime_state()
+    sim_engine.run(mergedohlcv_df)
+
+    # retrain at test_i = 0, 3, 6. Each retrain scores rows until the next
+    assert [X.shape[0] for X in X_batches] == [3, 3, 1]
+    assert len(sim_engine.st.probs_up) == test_n
+
+    # batched rows == rows that per-iteration create_xy() gives
+    data_f = AimodelDataFactory(ppss.predictoor_ss)
+    X_tests = []
+    for test_i in range(test_n):
+        X, _, _, _, _ = data_f.create_xy(
+            mergedohlcv_df,
+            test_n - test_i - 1,
+            feedset.predict,
+            feedset.train_on,
+        )
+        X_tests.append(X[-1, :])
+    assert_array_equal(np.concatenate(X_batches), np.array(X_tests))
+
+
+@enforce_types
+def test_sim_engine_plot_resolution(tmpdir, monkeypatch):
+    """sim_ss.plot_resolution reaches the model response plot data"""
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    s = fast_test_yaml_str(tmpdir)
+    ppss = PPSS(yaml_str=s, network="development")
+
+    feedset_list = [
+        {
+            "predict": "binance BTC/USDT c 5m",
+            "train_on": "binance BTC/USDT ETH/USDT c 5m",
+        }
+    ]
+    d = predictoor_ss_test_dict(feedset_list)
+    d["aimodel_data_ss"]["max_n_train"] = 100
+    d["aimodel_data_ss"]["autoregressive_n"] = 1
+    ppss.predictoor_ss = PredictoorSS(d)
+    ppss.sim_ss = SimSS(
+        sim_ss_test_dict(os.path.join(tmpdir, "logs"), test_n=2, plot_resolution=20)
+    )
+
+    monkeypatch.chdir(tmpdir)
+    feedset = ppss.predictoor_ss.predict_train_feedsets[0]
+    sim_engine = SimEngine(ppss, feedset)
+    sim_engine.disable_realtime_state()
+    sim_engine.run(mergedohlcv_df)
+
+    plotdata = sim_engine._prev_plotdata  # pylint: disable=protected-access
+    assert plotdata is not None
+    assert plotdata.resolution == 20
+
+
+@enforce_types
+@pytest.mark.parametrize(
+    "approach, use_own_model",
+    [
+        ("ClassifLinearRidge", True),
+        ("RegrLinearRidge", True),
+        ("ClassifLinearRidge", False),
+    ],
+)
+def test_sim_engine_vectorized(tmpdir, monkeypatch, approach, use_own_model):
+    """Vectorized mode gives the same SimState series as the loop"""
+    mergedohlcv_df = pl.read_csv(CSV_FILE)
+    test_n = 10
+    s = fast_test_yaml_str(tmpdir)
+    monkeypatch.chdir(tmpdir)
+
+    def _run(vectorized: bool) -> SimEngine:
+        ppss = PPSS(yaml_str=s, network="development")
+        feedset_list = [
+            {
+                "predict": "binance BTC/USDT c 5m",
+                "train_on": "binance BTC/USDT ETH/USDT c 5m",
+            }
+        ]
+        d = predictoor_ss_test_dict(feedset_list)
+        d["aimodel_data_ss"]["max_n_train"] = 100
+        d["aimodel_data_ss"]["autoregressive_n"] = 2
+        d["aimodel_ss"]["approach"] = approach
+        d["aimodel_ss"]["train_every_n_epochs"] = 3
+        ppss.predictoor_ss = PredictoorSS(d)
+        d = sim_ss_test_dict(
+            os.path.join(tmpdir, "logs"),
+            use_own_model=use_own_model,
+            test_n=test_n,
+            vectorized=vectorized,
+        )
+        ppss.sim_ss = SimSS(d)
+        ppss.trader_ss.d["sim_only"]["confidence_threshold"] = 0.0  # trade often
+
+        feedset = ppss.predictoor_ss.predict_train_feedsets[0]
+        sim_engine = SimEngine(ppss, feedset)
+        sim_engine.disable_realtime_state()
+        np.random.seed(0)  # model builds draw from it; same draws both ways
+        sim_engine.run(mergedohlcv_df)
+        return sim_engine
+
+    if not use_own_model:
+        # chain predictions, with some epochs missing
+        rng = np.random.default_rng(1)
+        chain_probs_up = rng.random(test_n)
+        chain_valid = np.isin(np.arange(test_n), [0, 2, 3, 6, 7, 9])
+
+        def _load(self, ut_seconds):  # pylint: disable=unused-argument
+            self.chain_probs_up = np.where(chain_valid, chain_probs_up, 0.0)
+            self.chain_valid = chain_valid
+
+        monkeypatch.setattr(SimEngine, "load_chain_prediction_data", _load)
+
+    n_handlers = len(logging.getLogger("sim_engine").handlers)
+    engine_loop, engine_vec = _run(False), _run(True)
+    assert len(logging.getLogger("sim_engine").handlers) == n_handlers
+    st_loop, st_vec = engine_loop.st, engine_vec.st
+
+    n = 6 if not use_own_model else test_n
+    assert len(st_vec.probs_up) == len(st_loop.probs_up) == n
+    assert st_vec.probs_up == pytest.approx(st_loop.probs_up)
+    assert st_vec.ytrues == st_loop.ytrues
+    assert st_vec.n_correct == st_loop.n_correct
+    assert st_vec.pdr_profits_OCEAN == pytest.approx(st_loop.pdr_profits_OCEAN)
+    assert st_vec.trader_profits_USD == pytest.approx(st_loop.trader_profits_USD)
+    assert any(st_loop.trader_profits_USD)
+    np.testing.assert_allclose(st_vec.aim._arr[:n], st_loop.aim._arr[:n])
+    assert st_vec.recent_metrics() == pytest.approx(st_loop.recent_metrics())
+
+    # saved state log == in-memory state
+    for engine in [engine_loop, engine_vec]:
+        st_read, ts = SimPlotter().load_state(engine.multi_id)
+        assert ts == "final"
+        assert st_read.probs_up == engine.st.probs_up
+        assert st_read.recent_metrics() == engine.st.recent_metrics()
+
+    # event logs: every simulated iter, same both ways
+    events_loop, events_vec = [
+        pl.read_csv(engine.event_log.filename) for engine in [engine_loop, engine_vec]
+    ]
+    assert events_vec["iter"].to_list() == events_loop["iter"].to_list()
+    assert events_vec["prob_up"].to_list() == pytest.approx(st_loop.probs_up, abs=1e-6)
+    assert events_vec["trader_profit_USD"].to_list() == pytest.approx(
+        st_loop.trader_profits_USD, abs=1e-6
+    )
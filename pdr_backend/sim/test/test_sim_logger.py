@@ -1,9 +1,13 @@
 import os
 from unittest.mock import Mock
 
+import numpy as np
+import polars as pl
+import pytest
+
 from pdr_backend.ppss.ppss import PPSS, fast_test_yaml_str
 from pdr_backend.ppss.sim_ss import SimSS, sim_ss_test_dict
-from pdr_backend.sim.sim_logger import SimLogLine
+from pdr_backend.sim.sim_logger import EVENT_COLUMNS, SimEventLog, SimLogLine
 from pdr_backend.sim.sim_state import SimState
 from pdr_backend.util.time_types import UnixTimeMs
 
@@ -18,6 +22,7 @@ def test_compact_num(tmpdir, caplog):
 
     st = Mock(spec=SimState)
     st.ytrues = [True, False, True, False, True]
+    st.n_correct = 3
     st.recent_metrics.return_value = {
         "pdr_profit_OCEAN": 1.0,
         "trader_profit_USD": 2.0,
@@ -47,3 +52,35 @@ def test_compact_num(tmpdir, caplog):
     assert "pdr_profit=3.00e-3 up" in caplog.text
     assert "prcsn=0.100" in caplog.text
     assert f"Iter #2/{ppss.sim_ss.test_n}" in caplog.text
+
+
+def test_sim_event_log(tmpdir):
+    filename = os.path.join(tmpdir, "logs", "out_1.csv")
+    event_log = SimEventLog(filename, chunk_size=3)
+
+    def _n_written() -> int:
+        return pl.read_csv(filename).shape[0]
+
+    assert _n_written() == 0
+    for i in range(4):
+        event_log.add(i, 1701634400000 + i, 0.25, i % 2 == 0, 1.0, -0.5, 0.5, 2.0)
+    assert _n_written() == 3  # 1st chunk, but not the 4th row yet
+
+    n = 2
+    cols = {name: np.zeros(n) for name in EVENT_COLUMNS}
+    cols["iter"] = np.array([4, 5])
+    event_log.add_many(cols)
+    assert _n_written() == 6
+    assert event_log.n_rows == 6
+
+    event_log.add(6, 1701634400006, 0.75, True, 1.0, -0.5, 0.5, 2.0)
+    event_log.close()
+    df = pl.read_csv(filename)
+    assert df.columns == EVENT_COLUMNS
+    assert df["iter"].to_list() == list(range(7))
+    assert df["ut"][3] == 1701634400003
+    assert df["true_up"].to_list()[:4] == [1, 0, 1, 0]
+    assert df["prob_up"][6] == 0.75
+
+    with pytest.raises(ValueError):
+        SimEventLog(filename, chunk_size=0)
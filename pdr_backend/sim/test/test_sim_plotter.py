@@ -1 +1,77 @@
-# do nothing here, it's all tested in test_sim_engine.py
+# most of SimPlotter is tested in test_sim_engine.py
+import json
+
+import numpy as np
+from enforce_typing import enforce_types
+from pytest import approx
+
+from pdr_backend.sim.sim_plotter import SimPlotter
+from pdr_backend.sim.sim_state import SimState
+
+
+@enforce_types
+def test_sim_plotter_patch_figures():
+    """Figures for the first iters + patches for the rest == full figures"""
+    plotter = SimPlotter()
+    plotter.st = SimState()
+    _add_iters(plotter.st, 5)
+    names = _GROWING_FIGURES
+    figs = {name: _fig_json(plotter, name) for name in names}
+
+    _add_iters(plotter.st, 4)
+    patches = plotter.patch_figures(5)
+    assert sorted(patches.keys()) == sorted(names)
+
+    for name in names:
+        fig = figs[name]
+        _apply_patch(fig, patches[name].to_plotly_json())
+        target_fig = _fig_json(plotter, name)
+
+        assert len(fig["data"]) == len(target_fig["data"])
+        for trace, target_trace in zip(fig["data"], target_fig["data"]):
+            assert trace["x"] == approx(target_trace["x"])
+            assert trace["y"] == approx(target_trace["y"])
+        assert fig["layout"].get("annotations") == target_fig["layout"].get(
+            "annotations"
+        )
+        assert fig["layout"].get("title") == target_fig["layout"].get("title")
+
+
+_GROWING_FIGURES = [
+    "pdr_profit_vs_time",
+    "trader_profit_vs_time",
+    "pdr_profit_vs_ptrue",
+    "trader_profit_vs_ptrue",
+    "model_performance_vs_time",
+]
+
+
+def _fig_json(plotter, name) -> dict:
+    return json.loads(getattr(plotter, f"plot_{name}")().to_json())
+
+
+def _apply_patch(fig: dict, patch: dict):
+    """Apply a dash Patch to a figure, like the dash renderer does"""
+    for op in patch["operations"]:
+        *path, last = op["location"]
+        obj = fig
+        for key in path:
+            obj = obj.setdefault(key, {}) if isinstance(obj, dict) else obj[key]
+        if op["operation"] == "Extend":
+            obj[last].extend(op["params"]["value"])
+        else:
+            assert op["operation"] == "Assign"
+            obj[last] = op["params"]["value"]
+
+
+@enforce_types
+def _add_iters(st: SimState, n: int):
+    rng = np.random.default_rng(len(st.probs_up))
+    for _ in range(n):
+        prob_up, true_up = float(rng.random()), bool(rng.random() > 0.5)
+        st.probs_up.append(prob_up)
+        st.ytrues.append(true_up)
+        st.classif_metrics.update(true_up, prob_up)
+        st.aim.update(*rng.random(8).tolist())
+        st.pdr_profits_OCEAN.append(float(rng.normal()))
+        st.trader_profits_USD.append(float(rng.normal()))
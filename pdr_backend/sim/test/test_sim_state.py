@@ -1 +1,58 @@
-# do nothing here, it's all tested in test_sim_engine.py
+import pickle
+
+from enforce_typing import enforce_types
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from pdr_backend.sim.sim_state import AimodelMetrics
+
+# the rest is tested in test_sim_engine.py
+
+
+@enforce_types
+def test_aimodel_metrics_grows_and_pickles():
+    aim = AimodelMetrics(capacity=2)
+    assert aim.recent_metrics()["acc_est"] is None
+    assert aim.acc_ests.shape == (0,)
+
+    for i in range(5):  # beyond capacity
+        aim.update(0.1 * i, 0.0, 1.0, 0.5, 0.6, 0.7, 0.8, float(i))
+
+    assert isinstance(aim.acc_ests, np.ndarray)
+    assert_array_equal(aim.yerrs, [0.0, 1.0, 2.0, 3.0, 4.0])
+    assert aim.acc_ests[-1] == 0.4
+    assert aim.recent_metrics() == {
+        "acc_est": 0.4,
+        "acc_l": 0.0,
+        "acc_u": 1.0,
+        "f1": 0.5,
+        "precision": 0.6,
+        "recall": 0.7,
+        "loss": 0.8,
+        "yerr": 4.0,
+    }
+
+    # pickle keeps only the used rows, and can keep growing after
+    aim2 = pickle.loads(pickle.dumps(aim))
+    assert aim2._arr.shape[0] == 5
+    assert_array_equal(aim2.yerrs, aim.yerrs)
+    aim2.update(0.5, 0.0, 1.0, 0.5, 0.6, 0.7, 0.8, 5.0)
+    assert_array_equal(aim2.yerrs, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+    aim3 = pickle.loads(pickle.dumps(AimodelMetrics()))
+    aim3.update(0.5, 0.0, 1.0, 0.5, 0.6, 0.7, 0.8, 5.0)
+    assert aim3.n == 1
+
+
+def test_aimodel_metrics_update_many():
+    aim = AimodelMetrics(capacity=2)
+    aim.update(0.1, 0.0, 1.0, 0.5, 0.6, 0.7, 0.8, 0.0)
+
+    ones = np.ones(4)
+    aim.update_many(ones, ones, ones, ones, ones, ones, ones, np.arange(1.0, 5.0))
+    assert aim.n == 5
+    assert_array_equal(aim.yerrs, [0.0, 1.0, 2.0, 3.0, 4.0])
+    assert_array_equal(aim.acc_ests, [0.1, 1.0, 1.0, 1.0, 1.0])
+
+    aim.update(0.5, 0.0, 1.0, 0.5, 0.6, 0.7, 0.8, 5.0)
+    assert_array_equal(aim.yerrs, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
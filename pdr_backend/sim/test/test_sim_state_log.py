@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+from enforce_typing import enforce_types
+from numpy.testing import assert_array_equal
+
+from pdr_backend.aimodel.aimodel_factory import AimodelFactory
+from pdr_backend.aimodel.aimodel_plotdata import AimodelPlotdata
+from pdr_backend.ppss.aimodel_ss import AimodelSS, aimodel_ss_test_dict
+from pdr_backend.sim.sim_plotter import SimPlotter
+from pdr_backend.sim.sim_state import SimState
+from pdr_backend.sim.sim_state_log import METRICS_FILE, ROW_NBYTES, SimStateLog
+
+
+@enforce_types
+def test_sim_state_log_append_and_read(tmpdir):
+    """Each save appends only new rows; plotdata is written if it changed"""
+    root_path = os.path.join(tmpdir, "run1")
+    log = SimStateLog(root_path)
+    log.reset()
+    st = SimState()
+    d1, d2 = _plotdata(), _plotdata()
+
+    _add_iters(st, 3)
+    st.iter_number = 2
+    log.append(st, d1)
+    _add_iters(st, 2)
+    st.iter_number = 4
+    log.append(st)  # model unchanged
+    assert os.path.getsize(log.path(METRICS_FILE)) == 5 * ROW_NBYTES
+
+    index = log.read_index()
+    assert index["n_rows"] == 5
+    assert index["iter_number"] == 4
+    assert index["plotdata_file"] == "aimodel_plotdata_3.pkl"
+    assert not index["is_final"]
+
+    _add_iters(st, 1)
+    st.iter_number = 5
+    log.append(st, d2, is_final=True)
+    index = log.read_index()
+    assert index["is_final"]
+    assert index["plotdata_file"] == "aimodel_plotdata_6.pkl"
+    assert sorted(f for f in os.listdir(root_path) if f.endswith(".pkl")) == [
+        "aimodel_plotdata_3.pkl",  # previous one: a reader may be on it
+        "aimodel_plotdata_6.pkl",
+    ]
+
+    rows = log.read_rows(2, 6)
+    assert rows.shape == (4, 12)
+    assert_array_equal(rows[:, 0], st.probs_up[2:])
+    assert_array_equal(rows[:, -1], st.trader_profits_USD[2:])
+
+
+@enforce_types
+def test_sim_plotter_load_state_incremental(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    writer = SimPlotter()
+    writer.init_state("run1")
+    st = SimState()
+
+    _add_iters(st, 4)
+    st.iter_number = 3
+    writer.save_state(st, _plotdata())
+
+    reader = SimPlotter()
+    st_read, ts = reader.load_state("run1")
+    assert ts != "final"
+    assert st_read.iter_number == 3
+    assert isinstance(reader.aimodel_plotdata, AimodelPlotdata)
+    plotdata = reader.aimodel_plotdata
+
+    _add_iters(st, 3)
+    st.iter_number = 6
+    writer.save_state(st, None, is_final=True)
+
+    # 2nd load: same objects, extended with the new rows
+    read_rows = []
+    orig_read_rows = SimStateLog.read_rows
+
+    def _spy_read_rows(self, st_row, fin_row):
+        read_rows.append((st_row, fin_row))
+        return orig_read_rows(self, st_row, fin_row)
+
+    monkeypatch.setattr(SimStateLog, "read_rows", _spy_read_rows)
+    st_read2, ts = reader.load_state("run1")
+    assert read_rows == [(4, 7)]
+    assert ts == "final"
+    assert st_read2 is st_read
+    assert reader.aimodel_plotdata is plotdata  # unchanged, so not reloaded
+
+    assert st_read.probs_up == st.probs_up
+    assert st_read.ytrues == st.ytrues
+    assert st_read.pdr_profits_OCEAN == st.pdr_profits_OCEAN
+    assert st_read.trader_profits_USD == st.trader_profits_USD
+    assert_array_equal(st_read.aim.losses, st.aim.losses)
+    assert st_read.n_correct == st.n_correct
+    assert st_read.recent_metrics() == st.recent_metrics()
+
+    # a fresh reader gets the same, in one read
+    st_read3, _ = SimPlotter().load_state("run1")
+    assert st_read3.recent_metrics() == st.recent_metrics()
+
+
+@enforce_types
+def _add_iters(st: SimState, n: int):
+    rng = np.random.default_rng(len(st.probs_up))
+    for _ in range(n):
+        prob_up, true_up = float(rng.random()), bool(rng.random() > 0.5)
+        st.probs_up.append(prob_up)
+        st.ytrues.append(true_up)
+        st.classif_metrics.update(true_up, prob_up)
+        st.aim.update(*rng.random(8).tolist())
+        st.pdr_profits_OCEAN.append(float(rng.normal()))
+        st.trader_profits_USD.append(float(rng.normal()))
+
+
+@enforce_types
+def _plotdata() -> AimodelPlotdata:
+    ss = AimodelSS(aimodel_ss_test_dict(approach="ClassifLinearRidge"))
+    X = np.random.uniform(-10.0, 10.0, (20, 2))
+    ycont = X[:, 0] + X[:, 1]
+    ytrue = ycont > 0.0
+    model = AimodelFactory(ss).build(X, ytrue, ycont, 0.0, show_warnings=False)
+    return AimodelPlotdata(model, X, ytrue, ycont, 0.0, ["x0", "x1"], X[-1, :])
@@ -2,12 +2,11 @@
 
 from unittest.mock import Mock
 
-
+import numpy as np
 import pytest
 
-
 from pdr_backend.ppss.exchange_mgr_ss import ExchangeMgrSS
-from pdr_backend.sim.sim_trader import SimTrader
+from pdr_backend.sim.sim_trader import SimTrader, simulate_trades
 
 FEE_PERCENT = 0.01
 
@@ -116,3 +115,35 @@ def test_sell(sim_trader):
     usdcoin_amt_recd = sim_trader._sell(100.0, 10.0)
     assert usdcoin_amt_recd == (100 * 10) * (1 - FEE_PERCENT)
     sim_trader.exchange.create_market_sell_order.assert_called_once()
+
+
+def test_simulate_trades_matches_trade_iter(mock_ppss, sim_trader):
+    rng = np.random.default_rng(0)
+    N = 500
+    closes = 100.0 * np.cumprod(1.0 + 0.02 * rng.standard_normal(N))
+    highs = closes * (1.0 + 0.04 * rng.random(N))
+    lows = closes * (1.0 - 0.04 * rng.random(N))
+    probs_up = rng.random(N)
+    conf_ups = (probs_up - 0.5) * 2.0
+    conf_downs = (0.5 - probs_up) * 2.0
+    pred_ups = conf_ups > 0.1
+    pred_downs = conf_downs > 0.1
+
+    profits = simulate_trades(
+        mock_ppss, closes, highs, lows, pred_ups, pred_downs, conf_ups, conf_downs
+    )
+
+    loop_profits = [
+        sim_trader.trade_iter(
+            float(closes[i]),
+            bool(pred_ups[i]),
+            bool(pred_downs[i]),
+            float(conf_ups[i]),
+            float(conf_downs[i]),
+            float(highs[i]),
+            float(lows[i]),
+        )
+        for i in range(N)
+    ]
+    assert profits.tolist() == loop_profits
+    assert np.count_nonzero(profits) > N // 10  # many trades closed
@@ -1,6 +1,8 @@
-from enforce_typing import enforce_types
+from typing import Dict, Tuple
 
+from enforce_typing import enforce_types
 import numpy as np
+from scipy.stats import norm
 
 
 @enforce_types
@@ -9,3 +11,132 @@ def classif_acc(ytrue_hat, ytrue) -> float:
     n_correct = sum(ytrue_hat == ytrue)
     acc = n_correct / len(ytrue)
     return acc
+
+
+class StreamingClassifMetrics:
+    """
+    Binary classifier metrics over a growing stream of (ytrue, prob_up)
+    samples. Each update() is O(1): it keeps running confusion-matrix
+    counts and a running log-loss sum, rather than rescoring the history.
+
+    Values match sklearn precision_recall_fscore_support(average="binary",
+    zero_division=0.0) and log_loss(), and statsmodels proportion_confint()
+    with its default "normal" method.
+    """
+
+    @enforce_types
+    def __init__(self, alpha: float = 0.05):
+        self.tp = self.fp = self.fn = self.tn = 0
+        self.loss_sum = 0.0
+        self._z = float(norm.isf(alpha / 2.0))
+        self._eps = float(np.finfo(float).eps)
+
+    @enforce_types
+    def update(self, ytrue: bool, prob_up: float):
+        ytrue_hat = prob_up > 0.5
+        if ytrue and ytrue_hat:
+            self.tp += 1
+        elif ytrue:
+            self.fn += 1
+        elif ytrue_hat:
+            self.fp += 1
+        else:
+            self.tn += 1
+
+        p = prob_up if ytrue else 1.0 - prob_up
+        self.loss_sum -= np.log(min(max(p, self._eps), 1.0 - self._eps))
+
+    def update_many(self, ytrues: np.ndarray, probs_up: np.ndarray):
+        """Like update() on each sample in turn, in array ops"""
+        ytrues = np.asarray(ytrues, dtype=bool)
+        probs_up = np.asarray(probs_up, dtype=float)
+        ytrues_hat = probs_up > 0.5
+        self.tp += int(np.sum(ytrues & ytrues_hat))
+        self.fn += int(np.sum(ytrues & ~ytrues_hat))
+        self.fp += int(np.sum(~ytrues & ytrues_hat))
+        self.tn += int(np.sum(~ytrues & ~ytrues_hat))
+
+        p = np.where(ytrues, probs_up, 1.0 - probs_up)
+        self.loss_sum -= float(np.sum(np.log(np.clip(p, self._eps, 1.0 - self._eps))))
+
+    @property
+    def n(self) -> int:
+        return self.tp + self.fp + self.fn + self.tn
+
+    @property
+    def n_correct(self) -> int:
+        return self.tp + self.tn
+
+    @property
+    def acc_est(self) -> float:
+        return self.n_correct / self.n
+
+    def acc_interval(self) -> Tuple[float, float]:
+        """Normal-approximation confidence interval of accuracy"""
+        q = self.acc_est
+        dist = self._z * np.sqrt(q * (1.0 - q) / self.n)
+        return max(q - dist, 0.0), min(q + dist, 1.0)
+
+    def precision_recall_f1(self) -> Tuple[float, float, float]:
+        precision = self.tp / (self.tp + self.fp) if (self.tp + self.fp) else 0.0
+        recall = self.tp / (self.tp + self.fn) if (self.tp + self.fn) else 0.0
+        denom = 2 * self.tp + self.fp + self.fn
+        f1 = 2 * self.tp / denom if denom else 0.0
+        return precision, recall, f1
+
+    @property
+    def has_both_classes(self) -> bool:
+        """Have there been both true and false samples? Log loss needs it"""
+        n_true = self.tp + self.fn
+        return 0 < n_true < self.n
+
+    @property
+    def loss(self) -> float:
+        return float(self.loss_sum / self.n)
+
+
+@enforce_types
+def cumulative_classif_metrics(
+    ytrues: np.ndarray, probs_up: np.ndarray, alpha: float = 0.05
+) -> Dict[str, np.ndarray]:
+    """
+    @description
+      Vectorized version of StreamingClassifMetrics: value [i] of each
+      output is its value after update() on samples 0, 1, .., i.
+
+    @arguments
+      ytrues -- 1d array [i] : bool
+      probs_up -- 1d array [i] : float
+
+    @return
+      metrics -- dict of name : 1d array [i] : value. Names are acc_est,
+        acc_l, acc_u, precision, recall, f1, loss, has_both_classes
+    """
+    ytrues = np.asarray(ytrues, dtype=bool)
+    probs_up = np.asarray(probs_up, dtype=float)
+    ytrues_hat = probs_up > 0.5
+
+    n = np.arange(1, len(ytrues) + 1)
+    tp = np.cumsum(ytrues & ytrues_hat)
+    fp = np.cumsum(~ytrues & ytrues_hat)
+    fn = np.cumsum(ytrues & ~ytrues_hat)
+    n_true = np.cumsum(ytrues)
+
+    def _div(num, denom):
+        return np.divide(num, denom, out=np.zeros(len(n)), where=denom != 0)
+
+    acc_est = (n - fp - fn) / n
+    dist = float(norm.isf(alpha / 2.0)) * np.sqrt(acc_est * (1.0 - acc_est) / n)
+
+    eps = float(np.finfo(float).eps)
+    p = np.clip(np.where(ytrues, probs_up, 1.0 - probs_up), eps, 1.0 - eps)
+    return {
+        "acc_est": acc_est,
+        "acc_l": np.maximum(acc_est - dist, 0.0),
+        "acc_u": np.minimum(acc_est + dist, 1.0),
+        "precision": _div(tp, tp + fp),
+        "recall": _div(tp, tp + fn),
+        "f1": _div(2 * tp, 2 * tp + fp + fn),
+        "loss": np.cumsum(-np.log(p)) / n,
+        "has_both_classes": (n_true > 0) & (n_true < n),
+    }
@@ -1,7 +1,14 @@
 import numpy as np
 from enforce_typing import enforce_types
+from pytest import approx
+from sklearn.metrics import log_loss, precision_recall_fscore_support
+from statsmodels.stats.proportion import proportion_confint
 
-from pdr_backend.statutil.scoring import classif_acc
+from pdr_backend.statutil.scoring import (
+    StreamingClassifMetrics,
+    classif_acc,
+    cumulative_classif_metrics,
+)
 
 
 @enforce_types
@@ -16,3 +23,76 @@ def test_classif_acc():
 
     ybool_hat = np.array([True, False, False, True])
     assert classif_acc(ybool_hat, ybool) == 0.75
+
+
+@enforce_types
+def test_streaming_classif_metrics():
+    """Running metrics == sklearn & statsmodels metrics on full history"""
+    rng = np.random.default_rng(1)
+    N = 300
+    ytrues = rng.random(N) > 0.4
+    probs_up = rng.random(N)
+    probs_up[:5] = [0.0, 1.0, 0.5, 1.0, 0.0]  # edge cases: clipping, ties
+
+    clm = StreamingClassifMetrics()
+    for i in range(N):
+        clm.update(bool(ytrues[i]), float(probs_up[i]))
+        ytrues_i, probs_up_i = ytrues[: i + 1], probs_up[: i + 1]
+        ytrues_hat_i = probs_up_i > 0.5
+
+        n_correct = int(sum(ytrues_i == ytrues_hat_i))
+        assert clm.n == i + 1
+        assert clm.n_correct == n_correct
+        assert clm.acc_est == approx(n_correct / (i + 1))
+        assert clm.acc_interval() == approx(
+            proportion_confint(count=n_correct, nobs=i + 1)
+        )
+
+        (precision, recall, f1, _) = precision_recall_fscore_support(
+            ytrues_i,
+            ytrues_hat_i,
+            average="binary",
+            zero_division=0.0,
+        )
+        assert clm.precision_recall_f1() == approx((precision, recall, f1))
+
+        assert clm.has_both_classes == (min(ytrues_i) != max(ytrues_i))
+        if clm.has_both_classes:
+            assert clm.loss == approx(log_loss(ytrues_i, probs_up_i))
+
+
+@enforce_types
+def test_cumulative_classif_metrics():
+    """Vectorized == running metrics, at every step"""
+    rng = np.random.default_rng(2)
+    N = 200
+    ytrues = rng.random(N) > 0.5
+    probs_up = rng.random(N)
+    probs_up[:3] = [1.0, 0.5, 0.0]
+
+    metrics = cumulative_classif_metrics(ytrues, probs_up)
+
+    clm = StreamingClassifMetrics()
+    for i in range(N):
+        clm.update(bool(ytrues[i]), float(probs_up[i]))
+        acc_l, acc_u = clm.acc_interval()
+        precision, recall, f1 = clm.precision_recall_f1()
+        assert metrics["acc_est"][i] == approx(clm.acc_est)
+        assert metrics["acc_l"][i] == approx(acc_l)
+        assert metrics["acc_u"][i] == approx(acc_u)
+        assert metrics["precision"][i] == approx(precision)
+        assert metrics["recall"][i] == approx(recall)
+        assert metrics["f1"][i] == approx(f1)
+        assert metrics["loss"][i] == approx(clm.loss)
+        assert metrics["has_both_classes"][i] == clm.has_both_classes
+
+    clm_many = StreamingClassifMetrics()
+    clm_many.update_many(ytrues[:50], probs_up[:50])
+    clm_many.update_many(ytrues[50:], probs_up[50:])
+    assert (clm_many.tp, clm_many.fp, clm_many.fn, clm_many.tn) == (
+        clm.tp,
+        clm.fp,
+        clm.fn,
+        clm.tn,
+    )
+    assert clm_many.loss == approx(clm.loss)
@@ -159,6 +159,7 @@ def fetch_payouts(
                 "truevalue": bool(payout["trueValue"]),
                 "slot": UnixTimeS(int(payout["id"].split("-")[1])),
                 "stake": float(payout["prediction"]["stake"]),
+                "contract": payout["prediction"]["slot"]["predictContract"]["id"],
             }
         )
         for payout in data
@@ -1,17 +1,20 @@
 import logging
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pdr_backend.cli.arg_feeds import ArgFeeds
 from pdr_backend.contract.slot import Slot
 from pdr_backend.subgraph.core_subgraph import query_subgraph
 from pdr_backend.subgraph.info725 import get_pair_timeframe_source_from_contract
 from pdr_backend.subgraph.subgraph_feed import SubgraphFeed
+from pdr_backend.subgraph.subgraph_feed_contracts import query_feed_contracts
 from pdr_backend.util.constants import WHITELIST_FEEDS_MAINNET
 from pdr_backend.util.time_types import UnixTimeS
 
 logger = logging.getLogger("subgraph")
 
+_CHUNK_SIZE = 1000  # max for subgraph = 1000
+
 
 # don't use @enforce_types here, it causes issues
 def get_pending_slots(
@@ -125,3 +128,183 @@ def get_pending_slots(
             break
 
     return slots
+
+
+class PendingSlotTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    Keep track of "Pending" slots, incrementally.
+
+    Vs get_pending_slots(), which re-scans all pending slots of the last
+    3 days, with their full feed contract data, at each call:
+    - Feed contracts are looked up once (and every feeds_refresh_s).
+      Owner & feed filters are applied to them, and slot queries ask the
+      subgraph for just those contracts' slots
+    - Slot queries only get slot ids & numbers; feed data is local
+    - Each update() only queries slots newer than the previous update's
+      timestamp, plus the status of the known-pending slots. So its
+      subgraph load is proportional to the # new slots
+    """
+
+    # don't use @enforce_types here, see get_pending_slots()
+    def __init__(
+        self,
+        subgraph_url: str,
+        owners_string: Optional[str] = None,
+        allowed_feeds: Optional[ArgFeeds] = None,
+        feeds_refresh_s: int = 3600,
+    ):
+        """
+        @arguments
+          subgraph_url --
+          owners_string -- eg "0x123,0x124". If None or "", allow all
+          allowed_feeds -- only track slots of these feeds. None -> all
+          feeds_refresh_s -- look up feed contracts this often, to see
+            new ones
+        """
+        self.subgraph_url = subgraph_url
+        self.owners_string = owners_string
+        self.allowed_feeds = allowed_feeds
+        self.feeds_refresh_s = feeds_refresh_s
+
+        self.feeds: Dict[str, SubgraphFeed] = {}  # feed_addr : feed
+        self._feeds_at: Optional[float] = None  # time.time() of last lookup
+        self._slots: Dict[str, Slot] = {}  # slot id : known-pending Slot
+        self._cursor: Optional[int] = None  # all slots <= this were queried
+
+    def update(self, timestamp: UnixTimeS) -> List[Slot]:
+        """
+        @description
+          Bring the known-pending slots up to date, as of timestamp.
+
+        @return
+          pending_slots -- List[Slot], oldest first
+        """
+        now_ts = time.time()
+        # rounds older than 3 days are canceled + 10 min buffer
+        three_days_ago = int(now_ts - 60 * 60 * 24 * 3 + 10 * 60)
+
+        self._refresh_feeds(now_ts)
+        self._slots = {
+            slot_id: slot
+            for slot_id, slot in self._slots.items()
+            if slot.slot_number > three_days_ago and slot.feed.address in self.feeds
+        }
+
+        try:
+            self._drop_resolved_slots()
+            st = three_days_ago if self._cursor is None else self._cursor
+            self._add_new_slots(max(st, three_days_ago), timestamp)
+            self._cursor = int(timestamp)
+        except Exception as e:
+            # keep the cursor, so that the next update() tries again
+            logger.warning(e)
+
+        return sorted(self._slots.values(), key=lambda slot: slot.slot_number)
+
+    def _refresh_feeds(self, now_ts: float):
+        """Look up the allowed feed contracts, if due"""
+        is_due = self._feeds_at is None or (
+            now_ts - self._feeds_at >= self.feeds_refresh_s
+        )
+        if not is_due:
+            return
+
+        feeds = query_feed_contracts(self.subgraph_url, self.owners_string)
+        if not feeds:  # error, or really no feeds. Try again next time
+            return
+        if self.allowed_feeds:
+            feeds = {
+                addr: feed
+                for addr, feed in feeds.items()
+                if self.allowed_feeds.contains_combination(
+                    feed.source, feed.pair, feed.timeframe
+                )
+            }
+
+        if set(feeds) - set(self.feeds):
+            # new feeds: their older slots haven't been seen. Re-scan all
+            self._cursor = None
+        self.feeds = feeds
+        self._feeds_at = now_ts
+
+    def _drop_resolved_slots(self):
+        """Forget known-pending slots that aren't pending anymore"""
+        slot_ids = list(self._slots.keys())
+        for i in range(0, len(slot_ids), _CHUNK_SIZE):
+            ids_str = _list_str(slot_ids[i : i + _CHUNK_SIZE])
+            query = """
+            {
+                predictSlots(where: {id_in: %s, status_not: "Pending"}, first:%s){
+                    id
+                }
+            }
+            """ % (
+                ids_str,
+                _CHUNK_SIZE,
+            )
+            result = query_subgraph(self.subgraph_url, query)
+            for slot in result["data"]["predictSlots"]:
+                self._slots.pop(slot["id"], None)
+
+    def _add_new_slots(self, st: int, timestamp: UnixTimeS):
+        """Add pending slots of the tracked feeds in (st, timestamp]"""
+        if not self.feeds:
+            return
+
+        # page by slot #, not by offset. A page's last slot # may have more
+        # slots in the next page: so ask for slot_gte it, and skip known ids.
+        # A page of only known slots doesn't mean we're done; stop when a
+        # page is short, or its last slot # didn't move on
+        contracts_str = _list_str(list(self.feeds.keys()))
+        slot_where = f"slot_gt: {st}"
+        prev_last_slot: Optional[int] = None
+        while True:
+            query = """
+            {
+                predictSlots(
+                    where: {
+                        predictContract_in: %s, %s, slot_lte: %s, status: "Pending"
+                    },
+                    orderBy: slot, orderDirection: asc, first:%s
+                ){
+                    id
+                    slot
+                    predictContract {
+                        id
+                    }
+                    trueValues {
+                        id
+                    }
+                }
+            }
+            """ % (
+                contracts_str,
+                slot_where,
+                timestamp,
+                _CHUNK_SIZE,
+            )
+            result = query_subgraph(self.subgraph_url, query)
+            if not "data" in result:
+                raise ValueError("No data in result")
+
+            slot_list = result["data"]["predictSlots"]
+            for slot in slot_list:
+                if slot["id"] in self._slots or slot["trueValues"] != []:
+                    continue
+                feed = self.feeds.get(slot["predictContract"]["id"])
+                if feed is None:
+                    continue
+                self._slots[slot["id"]] = Slot(int(slot["slot"]), feed)
+
+            if len(slot_list) < _CHUNK_SIZE:
+                break
+            last_slot = int(slot_list[-1]["slot"])
+            if prev_last_slot is not None and last_slot <= prev_last_slot:
+                break
+            prev_last_slot = last_slot
+            slot_where = f"slot_gte: {last_slot}"
+
+
+def _list_str(strs: List[str]) -> str:
+    """Eg ["0x1", "0x2"] -> '["0x1", "0x2"]', for a GraphQL where clause"""
+    return "[" + ", ".join(f'"{s}"' for s in strs) + "]"
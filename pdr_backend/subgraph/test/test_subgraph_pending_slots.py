@@ -1,10 +1,18 @@
+import re
+import time
 from unittest.mock import patch
 
 from enforce_typing import enforce_types
 
+from pdr_backend.cli.arg_feeds import ArgFeeds
 from pdr_backend.contract.slot import Slot
 from pdr_backend.subgraph.info725 import key_to_key725, value_to_value725
-from pdr_backend.subgraph.subgraph_pending_slots import get_pending_slots
+from pdr_backend.subgraph.subgraph_feed import mock_feed
+from pdr_backend.subgraph.subgraph_pending_slots import (
+    PendingSlotTracker,
+    get_pending_slots,
+)
+from pdr_backend.util.time_types import UnixTimeS
 
 SAMPLE_SLOT_DATA = [
     {
@@ -67,3 +75,146 @@ def test_get_pending_slots():
     assert isinstance(slot0, Slot)
     assert slot0.slot_number == 1000
     assert slot0.feed.name == "ether"
+
+
+# ----------------------------------------------
+# PendingSlotTracker
+
+_PATH = "pdr_backend.subgraph.subgraph_pending_slots"
+
+
+def _feeds():
+    """Return feed1, feed2, and dict of addr : feed for both"""
+    feed1 = mock_feed("5m", "binance", "ETH/USDT")
+    feed2 = mock_feed("5m", "binance", "BTC/USDT")
+    return feed1, feed2, {feed1.address: feed1, feed2.address: feed2}
+
+
+def _slot_data(feed, slot_number):
+    return {
+        "id": f"{feed.address}-{slot_number}",
+        "slot": slot_number,
+        "predictContract": {"id": feed.address},
+        "trueValues": [],
+    }
+
+
+class _MockSubgraph:
+    """Answers pending-slot tracker queries from a list of pending slots"""
+
+    def __init__(self, pending):
+        self.pending = pending  # list of slot data
+        self.queries = []
+
+    def __call__(self, subgraph_url, query):  # pylint: disable=unused-argument
+        self.queries.append(query)
+        if "status_not" in query:  # slots resolved since
+            resolved = [
+                {"id": slot_id}
+                for slot_id in re.findall(r'"(0x[0-9a-f]+-\d+)"', query)
+                if slot_id not in {s["id"] for s in self.pending}
+            ]
+            return {"data": {"predictSlots": resolved}}
+
+        op, st = re.search(r"slot_(gte?): (\d+)", query).groups()
+        fin = int(re.search(r"slot_lte: (\d+)", query).group(1))
+        first = int(re.search(r"first:(\d+)", query).group(1))
+        slots = sorted(
+            (
+                s
+                for s in self.pending
+                if (s["slot"] >= int(st) if op == "gte" else s["slot"] > int(st))
+                and s["slot"] <= fin
+            ),
+            key=lambda s: s["slot"],
+        )
+        return {"data": {"predictSlots": slots[:first]}}
+
+
+@enforce_types
+def test_pending_slot_tracker(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(f"{_PATH}.time.time", lambda: now)
+    feed1, feed2, feeds = _feeds()
+    t0 = int(now) - 600
+
+    subgraph = _MockSubgraph([_slot_data(feed1, t0), _slot_data(feed2, t0 + 300)])
+    allowed = ArgFeeds.from_strs(["binance ETH/USDT"])
+    with patch(f"{_PATH}.query_feed_contracts", return_value=feeds) as mock_q, patch(
+        f"{_PATH}.query_subgraph", subgraph
+    ):
+        tracker = PendingSlotTracker("foo", "0xowner", allowed_feeds=allowed)
+
+        # 1st update scans the last 3 days, for allowed feeds only
+        slots = tracker.update(UnixTimeS(int(now)))
+        assert [(s.slot_number, s.feed) for s in slots] == [(t0, feed1)]
+        mock_q.assert_called_once_with("foo", "0xowner")
+        query = subgraph.queries[-1]
+        assert feed1.address in query and feed2.address not in query
+        assert "nftData" not in query
+
+        # later updates only ask for slots newer than the last update
+        subgraph.pending.append(_slot_data(feed1, t0 + 900))
+        subgraph.queries = []
+        slots = tracker.update(UnixTimeS(int(now) + 300))
+        assert [s.slot_number for s in slots] == [t0, t0 + 900]
+        assert f"slot_gt: {int(now)}," in subgraph.queries[-1]
+
+        # slots that stop being pending are dropped
+        subgraph.pending = [s for s in subgraph.pending if s["slot"] != t0]
+        slots = tracker.update(UnixTimeS(int(now) + 600))
+        assert [s.slot_number for s in slots] == [t0 + 900]
+
+    # feeds weren't looked up again
+    assert mock_q.call_count == 1
+
+
+@enforce_types
+def test_pending_slot_tracker_pages_past_known_slots(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(f"{_PATH}.time.time", lambda: now)
+    monkeypatch.setattr(f"{_PATH}._CHUNK_SIZE", 2)
+    feed1, feed2, feeds = _feeds()
+    t0 = int(now) - 900
+
+    subgraph = _MockSubgraph([_slot_data(feed1, t0), _slot_data(feed1, t0 + 300)])
+    with patch(
+        f"{_PATH}.query_feed_contracts",
+        side_effect=[{feed1.address: feed1}, feeds],
+    ), patch(f"{_PATH}.query_subgraph", subgraph):
+        tracker = PendingSlotTracker("foo", feeds_refresh_s=0)
+        slots = tracker.update(UnixTimeS(int(now)))
+        assert [s.slot_number for s in slots] == [t0, t0 + 300]
+
+        # a new feed forces a re-scan. Its 1st page is a full page of
+        # known slots; the new ones after it must still be found
+        subgraph.pending += [_slot_data(feed1, t0 + 600), _slot_data(feed2, t0 + 600)]
+        slots = tracker.update(UnixTimeS(int(now)))
+        assert sorted((s.slot_number, s.feed.address) for s in slots) == sorted(
+            [
+                (t0, feed1.address),
+                (t0 + 300, feed1.address),
+                (t0 + 600, feed1.address),
+                (t0 + 600, feed2.address),
+            ]
+        )
+
+
+@enforce_types
+def test_pending_slot_tracker_subgraph_error(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(f"{_PATH}.time.time", lambda: now)
+    feed1, _, feeds = _feeds()
+    t0 = int(now) - 600
+
+    with patch(f"{_PATH}.query_feed_contracts", return_value=feeds), patch(
+        f"{_PATH}.query_subgraph", side_effect=Exception("subgraph down")
+    ):
+        tracker = PendingSlotTracker("foo")
+        assert tracker.update(UnixTimeS(int(now))) == []
+
+    # the failed range is asked for again
+    subgraph = _MockSubgraph([_slot_data(feed1, t0)])
+    with patch(f"{_PATH}.query_subgraph", subgraph):
+        slots = tracker.update(UnixTimeS(int(now)))
+    assert [s.slot_number for s in slots] == [t0]
@@ -7,6 +7,7 @@ from typing import Any, Callable, List, Optional, Tuple, Union
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.subgraph.subgraph_feed import SubgraphFeed, print_feeds
 from pdr_backend.util.cache import Cache
+from pdr_backend.util.chain_clock import ChainClock
 from pdr_backend.util.logutil import logging_has_stdout
 from pdr_backend.util.time_types import UnixTimeS
 
@@ -71,6 +72,7 @@ class BaseTraderAgent:
         self.feed_contract = ppss.web3_pp.get_single_contract(feed.address)
 
         # set attribs to track block
+        self.clock = ChainClock(ppss.web3_pp)
         self.prev_block_timestamp: UnixTimeS = UnixTimeS(0)
         self.prev_block_number: int = 0
 
@@ -112,25 +114,15 @@ class BaseTraderAgent:
                 break
 
     async def take_step(self):
-        web3_config = self.ppss.web3_pp.web3_config
-        w3 = web3_config.w3
-
-        # at new block number yet?
-        block_number = w3.eth.block_number
-        if block_number <= self.prev_block_number:
+        # at new block yet?
+        if not self.clock.tick():
             time.sleep(1)
             return
-        self.prev_block_number = block_number
-
-        # is new block ready yet?
-        block = web3_config.get_block(block_number, full_transactions=False)
-        if not block:
-            return
 
-        self.prev_block_number = block_number
-        self.prev_block_timestamp = UnixTimeS(block["timestamp"])
+        self.prev_block_number = self.clock.block_number
+        self.prev_block_timestamp = self.clock.timestamp
         logger.debug("before: %s", time.time())
-        s_till_epoch_ends = await self._process_block(UnixTimeS(block["timestamp"]))
+        s_till_epoch_ends = await self._process_block(self.clock.timestamp)
 
         logger.debug("after: %s", time.time())
         if s_till_epoch_ends == -1:
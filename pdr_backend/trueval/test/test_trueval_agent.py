@@ -1,5 +1,5 @@
 from copy import deepcopy
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 from enforce_typing import enforce_types
@@ -25,36 +25,6 @@ def test_get_contract_info_caching(agent, feed_contract_mock):
     feed_contract_mock.assert_called_once_with(agent.ppss.web3_pp, "0x1")
 
 
-@enforce_types
-def test_get_trueval_slot(
-    agent, slot, feed_contract_mock
-):  # pylint: disable=unused-argument
-    for trueval, cancel in [
-        (True, True),  # up
-        (False, True),  # down
-        (True, False),  # cancel
-    ]:
-        with patch(f"{PATH}.get_trueval", Mock(return_value=(trueval, cancel))):
-            result = agent.get_trueval_slot(slot)
-            assert result == (trueval, cancel)
-
-
-@enforce_types
-def test_get_trueval_slot_too_many_requests_retry(
-    agent, slot, feed_contract_mock
-):  # pylint: disable=unused-argument
-    mock_get_trueval = MagicMock(
-        side_effect=[Exception("Too many requests"), (True, True)]
-    )
-    with patch(f"{PATH}.get_trueval", mock_get_trueval), patch(
-        "time.sleep", return_value=None
-    ) as mock_sleep:
-        result = agent.get_trueval_slot(slot)
-        mock_sleep.assert_called_once_with(60)
-        assert result == (True, True)
-        assert mock_get_trueval.call_count == 2
-
-
 @enforce_types
 def test_trueval_agent_run(agent):
     mock_take_step = Mock()
@@ -75,20 +45,24 @@ def test_trueval_agent_get_init_and_ts(agent):
 
 
 @enforce_types
-def test_process_trueval_slot(
+def test_process_trueval_slots(
     agent, slot, feed_contract_mock
 ):  # pylint: disable=unused-argument
-    for trueval, cancel in [
-        (True, True),  # up
-        (False, True),  # down
-        (True, False),  # cancel
-    ]:
-        with patch(f"{PATH}.get_trueval", Mock(return_value=(trueval, cancel))):
-            slot = TruevalSlot(slot_number=slot.slot_number, feed=slot.feed)
-            agent.process_trueval_slot(slot)
+    results = [(True, False), (False, True), None]
+    slots = [TruevalSlot(slot_number=i, feed=slot.feed) for i in (60, 120, 180)]
+    with patch.object(
+        agent.trueval_resolver, "resolve", return_value=results
+    ) as mock_resolve:
+        agent.process_trueval_slots(slots)
+
+    # one batched call, with each slot's (feed, init_ts, end_ts)
+    mock_resolve.assert_called_once()
+    requests = mock_resolve.call_args[0][0]
+    assert [(ts0, ts1) for _, ts0, ts1 in requests] == [(0, 60), (60, 120), (120, 180)]
 
-            assert slot.trueval == trueval
-            assert slot.cancel == cancel
+    assert (slots[0].trueval, slots[0].cancel) == (True, False)
+    assert (slots[1].trueval, slots[1].cancel) == (False, True)
+    assert (slots[2].trueval, slots[2].cancel) == (None, False)  # retry later
 
 
 @enforce_types
@@ -131,13 +105,18 @@ def test_batch_submit_truevals(agent, slot):
         mock.assert_called_with(contract_addrs, epoch_starts, truevals, cancels, True)
 
 
+def _set_truevals(slots):
+    for slot in slots:
+        slot.set_trueval(True)
+
+
 @enforce_types
 def test_trueval_agent_take_step(agent, slot):
     with patch(f"{PATH}.wait_until_subgraph_syncs"), patch.object(
         agent, "get_batch", return_value=[slot]
     ) as mock_get_batch, patch.object(
-        agent, "process_trueval_slot"
-    ) as mock_process_trueval_slot, patch(
+        agent, "process_trueval_slots", side_effect=_set_truevals
+    ) as mock_process_trueval_slots, patch(
         "time.sleep"
     ), patch.object(
         agent, "batch_submit_truevals"
@@ -145,15 +124,28 @@ def test_trueval_agent_take_step(agent, slot):
         agent.take_step()
 
         mock_get_batch.assert_called_once()
-        call_args = mock_process_trueval_slot.call_args[0][0]
-        assert call_args.slot_number == slot.slot_number
-        assert call_args.feed == slot.feed
+        call_args = mock_process_trueval_slots.call_args[0][0]
+        assert call_args[0].slot_number == slot.slot_number
+        assert call_args[0].feed == slot.feed
 
         call_args = mock_batch_submit_truevals.call_args[0][0]
         assert call_args[0].slot_number == slot.slot_number
         assert call_args[0].feed == slot.feed
 
 
+@enforce_types
+def test_trueval_agent_take_step_no_truevals(agent, slot):
+    with patch(f"{PATH}.wait_until_subgraph_syncs"), patch.object(
+        agent, "get_batch", return_value=[slot]
+    ), patch.object(agent, "process_trueval_slots"), patch("time.sleep"), patch.object(
+        agent, "batch_submit_truevals"
+    ) as mock_batch_submit_truevals:
+        agent.take_step()
+
+    # nothing to submit -> no tx
+    mock_batch_submit_truevals.assert_not_called()
+
+
 @enforce_types
 def test_trueval_agent_get_batch(agent, slot):
     with patch.object(agent.ppss.web3_pp, "get_pending_slots", return_value=[slot]):
@@ -0,0 +1,167 @@
+import os
+from unittest.mock import Mock, patch
+
+import ccxt
+import polars as pl
+from enforce_typing import enforce_types
+
+from pdr_backend.lake.constants import TOHLCV_SCHEMA_PL
+from pdr_backend.lake.ohlcv_data_factory import rawohlcv_filename
+from pdr_backend.lake.plutil import save_rawohlcv_file
+from pdr_backend.subgraph.subgraph_feed import mock_feed
+from pdr_backend.trueval.trueval_resolver import TruevalResolver
+from pdr_backend.util.time_types import UnixTimeS
+
+_PATH = "pdr_backend.trueval.trueval_resolver"
+_MS = 300 * 1000  # 5m candle, in ms
+
+
+def _tohlcvs(since, limit, closes):
+    """Candles from since, with close prices from closes[i]"""
+    i0 = since // _MS
+    return [[(i0 + i) * _MS, 0, 0, 0, closes[i0 + i], 0] for i in range(limit)]
+
+
+def _slot(feed, slot_number):
+    s_per_epoch = feed.seconds_per_epoch
+    return (feed, UnixTimeS(slot_number - s_per_epoch), UnixTimeS(slot_number))
+
+
+@enforce_types
+def test_trueval_resolver_groups_by_feed():
+    closes = [100, 200, 200, 150, 300, 300]
+    exchange = Mock()
+    exchange.fetch_ohlcv.side_effect = lambda symbol, timeframe, since, limit: (
+        _tohlcvs(since, limit, closes)
+    )
+
+    feed = mock_feed("5m", "binance", "BTC/USDT")
+    feed2 = mock_feed("5m", "kraken", "ETH-USDT")
+    slots = [
+        _slot(feed, 600),  # candles 0 & 1: up
+        _slot(feed, 900),  # candles 1 & 2: equal -> cancel
+        _slot(feed, 1200),  # candles 2 & 3: down
+        _slot(feed2, 1500),  # candles 3 & 4: up
+    ]
+
+    resolver = TruevalResolver()
+    with patch.object(resolver, "_exchange", return_value=exchange):
+        results = resolver.resolve(slots)
+
+    assert results == [(True, False), (False, True), (False, False), (True, False)]
+
+    # one fetch per (source, pair, timeframe), covering all its slots
+    calls = sorted(
+        (c.kwargs["symbol"], c.kwargs["since"], c.kwargs["limit"])
+        for c in exchange.fetch_ohlcv.call_args_list
+    )
+    assert calls == [("BTC/USDT", 0, 4), ("ETH/USDT", 3 * _MS, 2)]
+
+
+@enforce_types
+def test_trueval_resolver_uses_lake(tmpdir):
+    lake_dir = str(tmpdir)
+    df = pl.DataFrame(
+        {
+            "timestamp": [0, _MS],
+            "open": [0.0, 0.0],
+            "high": [0.0, 0.0],
+            "low": [0.0, 0.0],
+            "close": [100.0, 90.0],
+            "volume": [0.0, 0.0],
+        },
+        schema=TOHLCV_SCHEMA_PL,
+    )
+    save_rawohlcv_file(rawohlcv_filename(lake_dir, "binance", "BTC/USDT", "5m"), df)
+
+    exchange = Mock()
+    resolver = TruevalResolver(lake_dir=lake_dir)
+    feed = mock_feed("5m", "binance", "BTC/USDT")
+    with patch.object(resolver, "_exchange", return_value=exchange):
+        results = resolver.resolve([_slot(feed, 600)])
+
+    assert results == [(False, False)]
+    exchange.fetch_ohlcv.assert_not_called()
+
+
+@enforce_types
+def test_trueval_resolver_refetches_partial_lake_candle(tmpdir):
+    lake_dir = str(tmpdir)
+    df = pl.DataFrame(
+        {
+            "timestamp": [0, _MS],
+            "open": [0.0, 0.0],
+            "high": [0.0, 0.0],
+            "low": [0.0, 0.0],
+            "close": [100.0, 90.0],  # 2nd candle's close is partial
+            "volume": [0.0, 0.0],
+        },
+        schema=TOHLCV_SCHEMA_PL,
+    )
+    filename = rawohlcv_filename(lake_dir, "binance", "BTC/USDT", "5m")
+    save_rawohlcv_file(filename, df)
+
+    # file was written midway through the 2nd candle
+    written_s = (_MS + _MS // 2) / 1000
+    os.utime(filename, (written_s, written_s))
+
+    closes = [100, 120]
+    exchange = Mock()
+    exchange.fetch_ohlcv.side_effect = lambda symbol, timeframe, since, limit: (
+        _tohlcvs(since, limit, closes)
+    )
+    resolver = TruevalResolver(lake_dir=lake_dir)
+    feed = mock_feed("5m", "binance", "BTC/USDT")
+    with patch.object(resolver, "_exchange", return_value=exchange):
+        results = resolver.resolve([_slot(feed, 600)])
+
+    # 1st candle from lake; 2nd from exchange, with its final close
+    assert results == [(True, False)]
+    exchange.fetch_ohlcv.assert_called_once()
+    assert exchange.fetch_ohlcv.call_args.kwargs["since"] == _MS
+    assert exchange.fetch_ohlcv.call_args.kwargs["limit"] == 1
+
+
+@enforce_types
+def test_trueval_resolver_backs_off_per_exchange():
+    closes = [100, 200]
+    exchange = Mock()
+    exchange.fetch_ohlcv.side_effect = [
+        ccxt.RateLimitExceeded("slow down"),
+        ccxt.RateLimitExceeded("slow down"),
+        _tohlcvs(0, 2, closes),
+    ]
+
+    resolver = TruevalResolver(backoff_s=2.0, max_backoff_s=3.0)
+    feed = mock_feed("5m", "binance", "BTC/USDT")
+    with patch.object(resolver, "_exchange", return_value=exchange), patch(
+        f"{_PATH}.time.sleep"
+    ) as mock_sleep:
+        results = resolver.resolve([_slot(feed, 600)])
+
+    assert results == [(True, False)]
+    assert exchange.fetch_ohlcv.call_count == 3
+
+    # waited out the backoffs: 2 s, then 4 s capped at 3 s
+    waits = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(waits) == 2
+    assert 1.0 < waits[0] <= 2.0
+    assert 2.0 < waits[1] <= 3.0
+
+    # backoff was only for binance, and is reset once it answers
+    assert "binance" in resolver._ok_at  # pylint: disable=protected-access
+    assert not resolver._cur_backoff_s  # pylint: disable=protected-access
+
+
+@enforce_types
+def test_trueval_resolver_unresolved():
+    exchange = Mock()
+    exchange.fetch_ohlcv.side_effect = Exception("exchange down")
+
+    resolver = TruevalResolver()
+    feed = mock_feed("5m", "binance", "BTC/USDT")
+    with patch.object(resolver, "_exchange", return_value=exchange):
+        results = resolver.resolve([_slot(feed, 600)])
+
+    assert results == [None]
+    assert exchange.fetch_ohlcv.call_count == 1  # only rate limits are retried
@@ -12,8 +12,7 @@ from pdr_backend.contract.slot import Slot
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.subgraph.subgraph_feed import SubgraphFeed
 from pdr_backend.subgraph.subgraph_sync import wait_until_subgraph_syncs
-from pdr_backend.trueval.get_trueval import get_trueval
-from pdr_backend.util.logutil import logging_has_stdout
+from pdr_backend.trueval.trueval_resolver import TruevalResolver
 from pdr_backend.util.time_types import UnixTimeS
 
 logger = logging.getLogger("trueval_agent")
@@ -41,6 +40,7 @@ class TruevalAgent:
             self.ppss.web3_pp, predictoor_batcher_addr
         )
         self.contract_cache: Dict[str, tuple] = {}
+        self.trueval_resolver = TruevalResolver(lake_dir=self.ppss.lake_ss.lake_dir)
 
     def run(self, testing: bool = False):
         while True:
@@ -67,11 +67,15 @@ class TruevalAgent:
             TruevalSlot(slot.slot_number, slot.feed) for slot in pending_slots
         ]
 
-        # get the trueval for each slot
-        for slot in trueval_slots:
-            self.process_trueval_slot(slot)
-            if logging_has_stdout():
-                print(".", end="", flush=True)
+        # get the truevals, all at once
+        self.process_trueval_slots(trueval_slots)
+        if not any(slot.trueval is not None for slot in trueval_slots):
+            logger.info(
+                "No truevals could be computed, sleeping for %d seconds...",
+                self.ppss.trueval_ss.sleep_time,
+            )
+            time.sleep(self.ppss.trueval_ss.sleep_time)
+            return
 
         logger.debug("Submitting transaction...")
 
@@ -118,43 +122,6 @@ class TruevalAgent:
         end_ts = UnixTimeS(slot)
         return initial_ts, end_ts
 
-    def get_trueval_slot(self, slot: Slot):
-        """
-        @description
-          Get trueval at the specified slot
-
-        @arguments
-          slot
-
-        @return
-          trueval: bool
-          cancel_round: bool
-        """
-        _, s_per_epoch = self.get_contract_info(slot.feed.address)
-        init_ts, end_ts = self.get_init_and_ts(slot.slot_number, s_per_epoch)
-
-        logger.info(
-            "Get trueval slot: begin. For slot_number %d of %s",
-            slot.slot_number,
-            slot.feed,
-        )
-        try:
-            # calls to get_trueval() func below, via Callable attribute on self
-            (trueval, cancel_round) = get_trueval(slot.feed, init_ts, end_ts)
-        except Exception as e:
-            if "Too many requests" in str(e):
-                logger.warning("Get trueval slot: too many requests, wait for a minute")
-                time.sleep(60)
-                return self.get_trueval_slot(slot)
-
-            # pylint: disable=line-too-long
-            raise Exception(f"An error occured: {e}") from e
-
-        logger.info(
-            "Get trueval slot: done. trueval=%s, cancel_round=%s", trueval, cancel_round
-        )
-        return (trueval, cancel_round)
-
     def batch_submit_truevals(self, slots: List[TruevalSlot]) -> str:
         contracts: dict = defaultdict(
             lambda: {"epoch_starts": [], "trueVals": [], "cancelRounds": []}
@@ -179,10 +146,30 @@ class TruevalAgent:
         )
         return tx["transactionHash"].hex()
 
-    def process_trueval_slot(self, slot: TruevalSlot):
-        # (don't wrap with try/except because the called func already does)
-        (trueval, cancel_round) = self.get_trueval_slot(slot)
+    def process_trueval_slots(self, slots: List[TruevalSlot]):
+        """
+        @description
+          Set the trueval & cancel flag of each slot, resolved as one batch.
+
+          A slot whose trueval couldn't be computed keeps trueval=None.
+          So it's not submitted, and it's tried again at the next step.
+        """
+        requests = []
+        for slot in slots:
+            _, s_per_epoch = self.get_contract_info(slot.feed.address)
+            init_ts, end_ts = self.get_init_and_ts(slot.slot_number, s_per_epoch)
+            requests.append((slot.feed, init_ts, end_ts))
+
+        results = self.trueval_resolver.resolve(requests)
+
+        n_done = 0
+        for slot, result in zip(slots, results):
+            if result is None:
+                continue
+            (trueval, cancel_round) = result
+            slot.set_trueval(trueval)
+            if cancel_round:
+                slot.set_cancel(True)
+            n_done += 1
 
-        slot.set_trueval(trueval)
-        if cancel_round:
-            slot.set_cancel(True)
+        logger.info("Got truevals for %d of %d slots", n_done, len(slots))
@@ -0,0 +1,266 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+import ccxt
+from enforce_typing import enforce_types
+
+from pdr_backend.cli.arg_timeframe import ArgTimeframe
+from pdr_backend.exchange.exchange_mgr import ExchangeMgr
+from pdr_backend.lake.ohlcv_data_factory import rawohlcv_filename
+from pdr_backend.lake.plutil import load_rawohlcv_file
+from pdr_backend.ppss.exchange_mgr_ss import ExchangeMgrSS
+from pdr_backend.subgraph.subgraph_feed import SubgraphFeed
+from pdr_backend.util.time_types import UnixTimeMs, UnixTimeS
+
+logger = logging.getLogger("trueval_resolver")
+
+# (source, pair, timeframe) eg ("binance", "BTC/USDT", "5m")
+GroupKey = Tuple[str, str, str]
+
+# max # candles to ask an exchange for, per request
+MAX_CANDLES_PER_FETCH = 500
+
+
+@enforce_types
+class TruevalResolver:
+    """
+    Compute truevals for many slots at once.
+    - Slots are grouped by (source, pair, timeframe)
+    - Each group's candles are fetched as one covering range, and all of
+      the group's truevals are resolved from it in memory
+    - Groups are fetched concurrently, with one ccxt client per exchange
+    - Candles already in the local ohlcv lake aren't fetched
+    - On rate limits, back off per exchange: other exchanges aren't held up
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        lake_dir: Optional[str] = None,
+        max_workers: int = 8,
+        max_tries: int = 5,
+        backoff_s: float = 2.0,
+        max_backoff_s: float = 60.0,
+    ):
+        """
+        @arguments
+          lake_dir -- ohlcv lake to reuse candles from. None -> don't
+          max_workers -- max # groups fetched at once
+          max_tries -- max # tries per fetch, when rate-limited
+          backoff_s -- 1st backoff on an exchange when it rate-limits us.
+            Doubles at each further rate-limit, up to max_backoff_s
+          max_backoff_s --
+        """
+        self.lake_dir = lake_dir
+        self.max_workers = max_workers
+        self.max_tries = max_tries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+
+        self._exchange_mgr = ExchangeMgr(
+            ExchangeMgrSS({"timeout": 30, "ccxt_params": {}})
+        )
+        self._exchanges: Dict[str, object] = {}  # exchange_str : ccxt client
+        self._cur_backoff_s: Dict[str, float] = {}  # exchange_str : s
+        self._ok_at: Dict[str, float] = {}  # exchange_str : time.time()
+        self._lock = threading.Lock()
+
+    def resolve(
+        self, slots: List[Tuple[SubgraphFeed, UnixTimeS, UnixTimeS]]
+    ) -> List[Optional[Tuple[bool, bool]]]:
+        """
+        @description
+          Did price rise between init & end timestamp, for each slot?
+          Compares the close of the candle before each timestamp. Equal
+          closes cancel the round.
+
+        @arguments
+          slots -- list of (feed, init_timestamp_s, end_timestamp_s)
+
+        @return
+          results -- list of (trueval, cancel_round), 1 per input slot.
+            None for a slot whose candles couldn't be got.
+        """
+        # since we will get close price, we need to go back 1 candle
+        need: Dict[GroupKey, Set[int]] = defaultdict(set)  # key : candle uts
+        slot_uts: List[Tuple[GroupKey, int, int]] = []
+        for feed, init_ts, end_ts in slots:
+            key = _group_key(feed)
+            candle_s = feed.seconds_per_epoch
+            init_ut = UnixTimeS(init_ts - candle_s).to_milliseconds()
+            end_ut = UnixTimeS(end_ts - candle_s).to_milliseconds()
+            need[key] |= {init_ut, end_ut}
+            slot_uts.append((key, init_ut, end_ut))
+
+        closes: Dict[GroupKey, Dict[int, float]] = {}
+        if need:
+            n_workers = min(self.max_workers, len(need))
+            with ThreadPoolExecutor(n_workers, "trueval") as pool:
+                futures = {
+                    key: pool.submit(self._get_closes, key, sorted(uts))
+                    for key, uts in need.items()
+                }
+                closes = {key: future.result() for key, future in futures.items()}
+
+        results: List[Optional[Tuple[bool, bool]]] = []
+        for key, init_ut, end_ut in slot_uts:
+            init_c = closes[key].get(init_ut)
+            end_c = closes[key].get(end_ut)
+            if init_c is None or end_c is None:
+                logger.warning(
+                    "No candle for %s at ut=%s or ut=%s", key, init_ut, end_ut
+                )
+                results.append(None)
+            elif end_c == init_c:
+                results.append((False, True))
+            else:
+                results.append((end_c > init_c, False))
+        return results
+
+    def _get_closes(self, key: GroupKey, uts: List[int]) -> Dict[int, float]:
+        """
+        @description
+          Close prices for one group, at the candle timestamps asked for.
+          From the lake if it has them, otherwise from the exchange.
+
+        @arguments
+          key -- (source, pair, timeframe)
+          uts -- candle open times (in ms), sorted
+
+        @return
+          closes -- dict of ut : close. Missing uts aren't in it
+        """
+        closes = self._lake_closes(key, uts[0], uts[-1])
+        missing = [ut for ut in uts if ut not in closes]
+        if not missing:
+            logger.debug("%s: all %d candles from lake", key, len(uts))
+            return {ut: closes[ut] for ut in uts}
+
+        try:
+            tohlcvs = self._fetch_range(key, missing[0], missing[-1])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("%s: couldn't fetch candles, error: %s", key, e)
+            tohlcvs = []
+        for tohlcv in tohlcvs:
+            closes[int(tohlcv[0])] = float(tohlcv[4])  # c = closing price
+        return {ut: closes[ut] for ut in uts if ut in closes}
+
+    def _lake_closes(self, key: GroupKey, st_ut: int, fin_ut: int) -> Dict[int, float]:
+        """
+        @description
+          Close prices in [st_ut, fin_ut] in the lake, as dict of ut : close.
+
+          The lake may hold a candle that was still forming when its file
+          was written, whose close is partial. So only keep candles that
+          had closed by the file's mtime; the rest get fetched.
+        """
+        if self.lake_dir is None:
+            return {}
+        exch_str, pair_str, timeframe_str = key
+        filename = rawohlcv_filename(self.lake_dir, exch_str, pair_str, timeframe_str)
+        if not os.path.exists(filename):
+            return {}
+        try:
+            written_ut = int(os.path.getmtime(filename) * 1000)
+            df = load_rawohlcv_file(filename, ["close"], st_ut, fin_ut)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Couldn't read lake file %s, error: %s", filename, e)
+            return {}
+        candle_ms = ArgTimeframe(timeframe_str).ms
+        return {
+            ut: close
+            for ut, close in zip(df["timestamp"].to_list(), df["close"].to_list())
+            if ut + candle_ms <= written_ut
+        }
+
+    def _fetch_range(self, key: GroupKey, st_ut: int, fin_ut: int) -> List[list]:
+        """
+        @description
+          Fetch all candles from st_ut to fin_ut inclusive, in as few
+          requests as the exchange allows
+
+        @return
+          tohlcvs -- list of [ut, open, high, low, close, volume]
+        """
+        exch_str, pair_str, timeframe_str = key
+        candle_ms = ArgTimeframe(timeframe_str).ms
+        tohlcvs: List[list] = []
+        since = st_ut
+        while since <= fin_ut:
+            limit = min(MAX_CANDLES_PER_FETCH, (fin_ut - since) // candle_ms + 1)
+            batch = self._fetch(exch_str, pair_str, timeframe_str, since, limit)
+            if not batch or int(batch[-1][0]) < since:
+                break
+            tohlcvs += batch
+            since = int(batch[-1][0]) + candle_ms
+        return tohlcvs
+
+    def _fetch(
+        self, exch_str: str, pair_str: str, timeframe_str: str, since: int, limit: int
+    ) -> List[list]:
+        """One fetch_ohlcv call. When rate-limited, back off & retry"""
+        exchange = self._exchange(exch_str)
+        for tries in range(1, self.max_tries + 1):
+            self._wait_for(exch_str)
+            try:
+                tohlcvs = exchange.fetch_ohlcv(  # type: ignore[attr-defined]
+                    symbol=pair_str,
+                    timeframe=timeframe_str,
+                    since=UnixTimeMs(since),
+                    limit=limit,
+                )
+            except Exception as e:
+                if not _is_rate_limit(e) or tries == self.max_tries:
+                    raise
+                self._back_off(exch_str)
+                continue
+
+            with self._lock:
+                self._cur_backoff_s.pop(exch_str, None)
+            return tohlcvs or []
+
+        return []  # unreachable: the last try returns or raises
+
+    def _exchange(self, exch_str: str):
+        """The ccxt client for this exchange. One per exchange"""
+        with self._lock:
+            if exch_str not in self._exchanges:
+                self._exchanges[exch_str] = self._exchange_mgr.exchange(exch_str)
+            return self._exchanges[exch_str]
+
+    def _back_off(self, exch_str: str):
+        """Hold off all fetches from this exchange, for an increasing time"""
+        with self._lock:
+            prev_s = self._cur_backoff_s.get(exch_str)
+            wait_s = self.backoff_s if prev_s is None else prev_s * 2
+            wait_s = min(wait_s, self.max_backoff_s)
+            self._cur_backoff_s[exch_str] = wait_s
+            self._ok_at[exch_str] = max(
+                self._ok_at.get(exch_str, 0.0), time.time() + wait_s
+            )
+        logger.warning("%s: too many requests, backing off %.1f s", exch_str, wait_s)
+
+    def _wait_for(self, exch_str: str):
+        """Sleep until this exchange's backoff (if any) is over"""
+        with self._lock:
+            ok_at = self._ok_at.get(exch_str, 0.0)
+        wait_s = ok_at - time.time()
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+
+@enforce_types
+def _group_key(feed: SubgraphFeed) -> GroupKey:
+    pair_str = feed.pair.replace("-", "/").upper()
+    return (feed.source, pair_str, feed.timeframe)
+
+
+def _is_rate_limit(e: Exception) -> bool:
+    if isinstance(e, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+        return True
+    return "Too many requests" in str(e)
@@ -0,0 +1,73 @@
+import logging
+from typing import Optional
+
+from enforce_typing import enforce_types
+
+from pdr_backend.util.time_types import UnixTimeS
+
+logger = logging.getLogger("chain_clock")
+
+
+class ChainClock:
+    """
+    The chain's head block, for an agent's main loop.
+    - tick() fetches the head block: one RPC call, once per agent step
+    - Every block, time & epoch query in between is served from memory
+    """
+
+    @enforce_types
+    def __init__(self, web3_pp):
+        """
+        @arguments
+          web3_pp -- Web3PP. Its web3_config is looked up at each tick,
+            so it may be swapped out after this is constructed
+        """
+        self.web3_pp = web3_pp
+        self._block: Optional[dict] = None
+        self.n_ticks = 0  # = # RPC calls made
+
+    @enforce_types
+    def tick(self) -> bool:
+        """
+        @description
+          Fetch the head block, in one RPC call. Keep it if it's new.
+
+        @return
+          is_new -- is the head block newer than the one we had?
+        """
+        block = self.web3_pp.web3_config.get_block("latest", full_transactions=False)
+        self.n_ticks += 1
+        if not block:  # head block isn't ready yet
+            return False
+
+        if self._block is not None and block["number"] <= self._block["number"]:
+            return False
+        self._block = dict(block)
+        return True
+
+    @property
+    def block(self) -> dict:
+        """Head block as of the latest tick. Ticks if there wasn't one"""
+        if self._block is None:
+            self.tick()
+            if self._block is None:
+                raise ValueError("Couldn't get head block")
+        return self._block
+
+    @property
+    def block_number(self) -> int:
+        return int(self.block["number"])
+
+    @property
+    def timestamp(self) -> UnixTimeS:
+        return UnixTimeS(self.block["timestamp"])
+
+    @enforce_types
+    def epoch(self, s_per_epoch: int) -> int:
+        """Epoch # of the head block, for epochs of s_per_epoch seconds"""
+        return self.timestamp // s_per_epoch
+
+    @enforce_types
+    def epoch_s_left(self, s_per_epoch: int) -> int:
+        """Seconds left in the head block's epoch"""
+        return s_per_epoch - self.timestamp % s_per_epoch
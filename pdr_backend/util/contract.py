@@ -1,5 +1,7 @@
 import copy
+import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
@@ -7,9 +9,10 @@ import artifacts
 from enforce_typing import enforce_types
 
 
+@lru_cache(maxsize=None)
 @enforce_types
 def get_contract_filename(contract_name: str, address_file: Union[str, None]):
-    """Returns filename for a contract name."""
+    """Returns filename for a contract name. Memoized: globs once per name"""
     contract_basename = f"{contract_name}.json"
 
     # first, try to find locally
@@ -52,3 +55,37 @@ def _condition_sapphire_keys(d: dict) -> dict:
         elif name == "oasis_saphire":
             d2["sapphire-mainnet"] = d[name]
     return d2
+
+
+@lru_cache(maxsize=None)
+@enforce_types
+def load_contract_abi(path: str) -> list:
+    """
+    @description
+      Returns the ABI in a contract json file: either a full artifact
+      with an "abi" key, or the bare ABI list. Memoized: ABIs never change
+      during a run, so each file is read & parsed once per process.
+      Callers must not modify the returned list.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else data["abi"]
+
+
+@enforce_types
+def load_addresses(path: str) -> dict:
+    """
+    @description
+      Returns the conditioned contents of an address.json file.
+      Memoized per (path, modification time): re-read only if it changes.
+      Callers must not modify the returned dict.
+    """
+    return _load_addresses(path, os.stat(path).st_mtime_ns)
+
+
+# pylint: disable=unused-argument
+@lru_cache(maxsize=None)
+def _load_addresses(path: str, mtime_ns: int) -> dict:
+    with open(path) as f:
+        d = json.load(f)
+    return _condition_sapphire_keys(d)
@@ -1,5 +1,5 @@
 from math import floor, log10
-from typing import Union
+from typing import List, Union
 
 import numpy as np
 import pandas as pd
@@ -59,8 +59,7 @@ def has_nan(
         return has_None or sum(x.is_nan()) > 0  # type: ignore[union-attr]
 
     if isinstance(x, pl.DataFrame):
-        has_None = any(col.is_null().any() for col in x)
-        return has_None or sum(sum(x).is_nan()) > 0  # type: ignore[union-attr]
+        return len(_pl_gap_columns(x)) > 0
 
     # pd.Series or pd.DataFrame
     return x.isnull().values.any()  # type: ignore[union-attr]
@@ -70,33 +69,62 @@ def has_nan(
 def fill_nans(
     df: Union[pd.DataFrame, pl.DataFrame]
 ) -> Union[pd.DataFrame, pl.DataFrame]:
-    """Interpolate the nans using Linear method available in pandas.
+    """Interpolate the nans using Linear method.
     It ignores the index and treat the values as equally spaced.
+    Leading and trailing nans take the nearest non-nan value.
+
+    Polars input stays in polars, and returns polars: only columns with
+    gaps are touched, and each column keeps its dtype.
 
     Ref: https://www.geeksforgeeks.org/working-with-missing-data-in-pandas/
     """
-    interpolate_df = pd.DataFrame()
-    output_type = type(df)
+    if isinstance(df, pl.DataFrame):
+        return _pl_fill_nans(df)
 
-    # polars support
-    if output_type == pl.DataFrame:
-        interpolate_df = df.to_pandas()
-    else:
-        interpolate_df = df
+    df = df.interpolate(method="linear", limit_direction="forward")
+    df = df.interpolate(method="linear", limit_direction="backward")  # row 0
+    return df
 
-    # interpolate is a pandas-only feature
-    interpolate_df = interpolate_df.interpolate(
-        method="linear", limit_direction="forward"
-    )
-    interpolate_df = interpolate_df.interpolate(
-        method="linear", limit_direction="backward"
-    )  # row 0
 
-    # return polars if input was polars
-    if type(output_type) == pl.DataFrame:
-        interpolate_df = pl.from_pandas(interpolate_df)
+@enforce_types
+def _pl_gap_columns(df: pl.DataFrame) -> List[str]:
+    """Return names of the columns that have a None (null) or a nan"""
+    # null counts are kept as metadata, so they're ~free
+    null_counts = df.null_count().row(0)
+    gap_cols = [col for col, n in zip(df.columns, null_counts) if n > 0]
+
+    # nans need a scan. Only floats can hold them
+    float_cols = [
+        col
+        for col, dtype in df.schema.items()
+        if dtype.is_float() and col not in gap_cols
+    ]
+    if float_cols:
+        has_nans = df.select(pl.col(float_cols).is_nan().any()).row(0)
+        gap_cols += [col for col, has in zip(float_cols, has_nans) if has]
 
-    return interpolate_df
+    return [col for col in df.columns if col in gap_cols]
+
+
+@enforce_types
+def _pl_fill_nans(df: pl.DataFrame) -> pl.DataFrame:
+    """fill_nans() for polars, without leaving polars"""
+    exprs = []
+    for col in _pl_gap_columns(df):
+        dtype = df.schema[col]
+        expr = pl.col(col)
+        if dtype.is_float():
+            expr = expr.fill_nan(None)
+        if dtype.is_numeric():
+            expr = expr.interpolate()
+        expr = expr.fill_null(strategy="forward").fill_null(strategy="backward")
+        if dtype.is_integer():  # interpolate() gives floats
+            expr = expr.round(0).cast(dtype)
+        exprs.append(expr)
+
+    if not exprs:
+        return df
+    return df.with_columns(exprs)
 
 
 @enforce_types
@@ -0,0 +1,48 @@
+from unittest.mock import Mock
+
+from enforce_typing import enforce_types
+import pytest
+
+from pdr_backend.util.chain_clock import ChainClock
+
+
+@enforce_types
+def test_chain_clock():
+    blocks = [
+        {"number": 10, "timestamp": 1000},
+        {"number": 10, "timestamp": 1000},  # same head
+        None,  # head not ready
+        {"number": 11, "timestamp": 1490},
+    ]
+    web3_pp = Mock()
+    web3_pp.web3_config.get_block.side_effect = blocks
+    clock = ChainClock(web3_pp)
+
+    # 1st query ticks, if nothing did yet
+    assert clock.block_number == 10
+    assert clock.n_ticks == 1
+
+    # queries in between ticks are served from memory
+    assert clock.timestamp == 1000
+    assert clock.epoch(300) == 3
+    assert clock.epoch_s_left(300) == 200
+    assert clock.block == {"number": 10, "timestamp": 1000}
+    assert web3_pp.web3_config.get_block.call_count == 1
+
+    assert not clock.tick()
+    assert not clock.tick()
+    assert clock.block_number == 10
+
+    assert clock.tick()
+    assert clock.block_number == 11
+    assert clock.epoch(300) == 4
+    assert clock.epoch_s_left(300) == 10
+    assert clock.n_ticks == web3_pp.web3_config.get_block.call_count == 4
+
+
+@enforce_types
+def test_chain_clock_no_block():
+    web3_pp = Mock()
+    web3_pp.web3_config.get_block.return_value = None
+    with pytest.raises(ValueError):
+        _ = ChainClock(web3_pp).timestamp
@@ -1,3 +1,5 @@
+import json
+import os
 from pathlib import Path
 
 import pytest
@@ -7,6 +9,7 @@ from pdr_backend.ppss.ppss import mock_ppss
 from pdr_backend.util.contract import (
     _condition_sapphire_keys,
     get_contract_filename,
+    load_addresses,
 )
 
 _NETWORKS = [
@@ -56,3 +59,17 @@ def test_condition_sapphire_keys():
 
     k3 = {"sapphire-testnet": "test", "sapphire-mainnet": "main", "foo": "bar"}
     assert _condition_sapphire_keys(k3) == k3
+
+
+@enforce_types
+def test_load_addresses(tmp_path):
+    path = tmp_path / "address.json"
+    path.write_text(json.dumps({"oasis_saphire": {"Ocean": "0x1"}}))
+    d = load_addresses(str(path))
+    assert d["sapphire-mainnet"] == {"Ocean": "0x1"}
+    assert load_addresses(str(path)) is d  # memoized
+
+    # re-read once the file changes
+    path.write_text(json.dumps({"development": {"Ocean": "0x2"}}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert load_addresses(str(path)) == {"development": {"Ocean": "0x2"}}
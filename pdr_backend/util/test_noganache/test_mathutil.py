@@ -1,3 +1,7 @@
+import logging
+import os
+import time
+
 import numpy as np
 import pandas as pd
 import polars as pl
@@ -12,6 +16,8 @@ from pdr_backend.util.mathutil import (
     string_to_bytes32,
 )
 
+logger = logging.getLogger("test_mathutil")
+
 
 @enforce_types
 def test_round_sig():
@@ -166,6 +172,86 @@ def _test_fill_nans(pdl):
     assert not has_nan(df2)
 
 
+@enforce_types
+def test_fill_nans_pl_matches_pd():
+    df1 = pl.DataFrame(
+        {
+            "timestamp": [1, 2, None, 4, 5, 6, None],
+            "A": [np.nan, 1.0, 2.0, None, 3.0, 4.0, np.nan],
+            "B": pl.Series([1.0, np.nan, np.nan, 4.0, 5.0, 6.0, 7.0], dtype=pl.Float32),
+            "C": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],  # no gaps
+        }
+    )
+    df2 = fill_nans(df1)
+
+    # stays polars, keeps dtypes, doesn't touch gap-free columns
+    assert isinstance(df2, pl.DataFrame)
+    assert df2.schema == df1.schema
+    assert df2["C"].to_list() == df1["C"].to_list()
+
+    # same values as the pandas path
+    df2_pd = fill_nans(df1.to_pandas())
+    assert isinstance(df2_pd, pd.DataFrame)
+    for col in df1.columns:
+        assert df2[col].to_list() == pytest.approx(df2_pd[col].to_list())
+    assert df2["A"].to_list() == [1.0, 1.0, 2.0, 2.5, 3.0, 4.0, 4.0]
+    assert df2["timestamp"].to_list() == [1, 2, 3, 4, 5, 6, 6]
+
+
+@enforce_types
+def test_fill_nans_pl_no_gaps():
+    df1 = pl.DataFrame({"A": [1.0, 2.0], "B": [3, 4]})
+    assert fill_nans(df1) is df1
+
+
+@enforce_types
+def test_fill_nans_pl_matches_pandas():
+    """Polars path gives the same values as a round trip through pandas"""
+    N, n_cols = 200, 6
+    rng = np.random.default_rng(0)
+    data = {f"x{i}": rng.uniform(1.0, 2.0, N) for i in range(n_cols)}
+    for i in range(0, n_cols, 2):  # gaps in every 2nd column, incl at ends
+        data[f"x{i}"][rng.integers(0, N, 20)] = np.nan
+        data[f"x{i}"][[0, N - 1]] = np.nan
+    df = pl.DataFrame(data)
+
+    assert has_nan(df)
+    df_pl = fill_nans(df)
+    df_pd = fill_nans(df.to_pandas())
+
+    assert isinstance(df_pl, pl.DataFrame)
+    assert not has_nan(df_pl)
+    assert df_pl.columns == list(df_pd.columns)
+    assert np.allclose(df_pl.to_numpy(), df_pd.to_numpy(), rtol=1e-9, atol=0.0)
+
+
+@pytest.mark.skipif(
+    not os.getenv("PDR_BENCHMARKS"), reason="benchmark. Set PDR_BENCHMARKS=1 to run"
+)
+@enforce_types
+def test_fill_nans_pl_benchmark():
+    """Benchmark: 50 cols x 500k rows, vs round trip through pandas.
+    Only logs the timings: wall-clock time isn't asserted, as CI varies"""
+    N, n_cols = 500_000, 50
+    rng = np.random.default_rng(0)
+    data = {f"x{i}": rng.uniform(1.0, 2.0, N) for i in range(n_cols)}
+    for i in range(0, n_cols, 5):  # gaps in 1 of every 5 columns
+        data[f"x{i}"][rng.integers(0, N, 1000)] = np.nan
+    df = pl.DataFrame(data)
+
+    t0 = time.perf_counter()
+    df_pl = fill_nans(df)
+    t_pl = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    df_pd = fill_nans(df.to_pandas())
+    t_pd = time.perf_counter() - t0
+
+    logger.info("fill_nans: polars = %.3f s; via pandas = %.3f s", t_pl, t_pd)
+    assert not has_nan(df_pl)
+    assert np.allclose(df_pl.to_numpy(), df_pd.to_numpy(), rtol=1e-9, atol=0.0)
+
+
 @enforce_types
 def test_string_to_bytes32_1_short():
     data = "hello"
@@ -60,6 +60,7 @@ def test_topup_main(mock_token_, mock_native_token_, mock_get_opf_addresses_, tm
 
     mock_web3_pp = MagicMock(spec=Web3PP)
     mock_web3_pp.network = "sapphire-testnet"
+    mock_web3_pp.multicall_address = None
     mock_web3_pp.OCEAN_Token = mock_token_
     mock_web3_pp.NativeToken = mock_native_token_
 
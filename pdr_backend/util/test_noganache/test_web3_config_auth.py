@@ -0,0 +1,110 @@
+from unittest.mock import Mock
+
+from enforce_typing import enforce_types
+
+from pdr_backend.util import web3_config as web3_config_module
+from pdr_backend.util.web3_config import (
+    AUTH_EXPIRY_MARGIN_S,
+    AUTH_REFRESH_AHEAD_S,
+    AUTH_VALID_S,
+    Web3Config,
+)
+
+# an arbitrary test key. Never used on a live chain
+PRIVATE_KEY = "0x" + "ab" * 32
+
+
+def _config(monkeypatch, now):
+    """Web3Config whose clock reads now[0], and whose head block is at 1000"""
+    monkeypatch.setattr(web3_config_module.time, "time", lambda: now[0])
+    c = Web3Config("http://localhost:8545", PRIVATE_KEY)
+    c.get_block = Mock(return_value={"timestamp": 1000})  # type: ignore
+    return c
+
+
+@enforce_types
+def test_auth_signature_cached(monkeypatch):
+    now = [1000.0]
+    c = _config(monkeypatch, now)
+
+    auth = c.get_auth_signature()
+    assert sorted(auth.keys()) == sorted(["userAddress", "v", "r", "s", "validUntil"])
+    assert auth["userAddress"] == c.owner
+    assert auth["validUntil"] == 1000 + AUTH_VALID_S
+    assert c.get_block.call_count == 1
+
+    # reused without RPC calls, until it's close to expiry
+    now[0] = 1000 + AUTH_VALID_S - AUTH_REFRESH_AHEAD_S - 1
+    assert c.get_auth_signature() == auth
+    assert c.get_block.call_count == 1
+
+    # callers can't mutate the cached auth
+    c.get_auth_signature()["validUntil"] = 0
+    assert c.get_auth_signature() == auth
+
+
+@enforce_types
+def test_auth_signature_refreshed_ahead_of_expiry(monkeypatch):
+    now = [1000.0]
+    c = _config(monkeypatch, now)
+    auth = c.get_auth_signature()
+
+    threads = []
+    monkeypatch.setattr(
+        web3_config_module.threading,
+        "Thread",
+        lambda target, **kwargs: threads.append(target) or Mock(),
+    )
+
+    # within the refresh window: the cached auth is handed out, and
+    # one refresh is started
+    now[0] = 1000 + AUTH_VALID_S - AUTH_REFRESH_AHEAD_S + 1
+    assert c.get_auth_signature() == auth
+    assert c.get_auth_signature() == auth
+    assert len(threads) == 1
+
+    c.get_block.return_value = {"timestamp": 2000}
+    threads[0]()  # run the refresh
+    assert c.get_block.call_count == 2
+    assert c.get_auth_signature()["validUntil"] == 2000 + AUTH_VALID_S
+    assert not c._auth_refreshing  # pylint: disable=protected-access
+
+
+@enforce_types
+def test_auth_signature_expired_resigns(monkeypatch):
+    now = [1000.0]
+    c = _config(monkeypatch, now)
+    c.get_auth_signature()
+
+    # too close to expiry to use: re-sign in the foreground
+    now[0] = 1000 + AUTH_VALID_S - AUTH_EXPIRY_MARGIN_S
+    c.get_block.return_value = {"timestamp": 2000}
+    assert c.get_auth_signature()["validUntil"] == 2000 + AUTH_VALID_S
+    assert c.get_block.call_count == 2
+
+
+@enforce_types
+def test_auth_signature_stale_head_block(monkeypatch):
+    # the head block is 600 s behind local time
+    now = [1600.0]
+    c = _config(monkeypatch, now)
+    auth = c.get_auth_signature()
+    assert auth["validUntil"] == 1000 + AUTH_VALID_S
+
+    # expiry follows validUntil, not local time + AUTH_VALID_S
+    now[0] = 1000 + AUTH_VALID_S - AUTH_EXPIRY_MARGIN_S
+    c.get_block.return_value = {"timestamp": int(now[0])}
+    new_auth = c.get_auth_signature()
+    assert new_auth["validUntil"] > auth["validUntil"]
+    assert c.get_block.call_count == 2
+
+
+@enforce_types
+def test_auth_signature_refresh_failure(monkeypatch):
+    now = [1000.0]
+    c = _config(monkeypatch, now)
+    c.get_auth_signature()
+
+    c.get_block.side_effect = Exception("rpc down")
+    c._refresh_auth_signature()  # pylint: disable=protected-access
+    assert not c._auth_refreshing  # pylint: disable=protected-access
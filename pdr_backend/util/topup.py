@@ -4,6 +4,8 @@ from typing import Dict, Tuple
 
 from enforce_typing import enforce_types
 
+from pdr_backend.contract.multicall import Multicall
+from pdr_backend.contract.token import get_balances
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.util.currency_types import Eth
 
@@ -22,8 +24,14 @@ def topup_main(ppss: PPSS):
     OCEAN = web3_pp.OCEAN_Token
     ROSE = web3_pp.NativeToken
 
-    owner_OCEAN_bal = OCEAN.balanceOf(owner).to_eth()
-    owner_ROSE_bal = ROSE.balanceOf(owner).to_eth()
+    addresses: Dict[str, str] = ppss.topup_ss.all_topup_addresses(web3_pp.network)
+
+    # all balances, at once
+    accounts = [owner] + list(addresses.values())
+    OCEAN_bals, ROSE_bals = get_balances(Multicall(web3_pp), OCEAN, ROSE, accounts)
+
+    owner_OCEAN_bal = OCEAN_bals[0].to_eth()
+    owner_ROSE_bal = ROSE_bals[0].to_eth()
     logger.info(
         "Topup address %s has %.2f OCEAN and %.2f ROSE",
         owner,
@@ -31,11 +39,9 @@ def topup_main(ppss: PPSS):
         owner_ROSE_bal,
     )
 
-    addresses: Dict[str, str] = ppss.topup_ss.all_topup_addresses(web3_pp.network)
-
-    for addr_label, address in addresses.items():
-        OCEAN_bal = OCEAN.balanceOf(address).to_eth()
-        ROSE_bal = ROSE.balanceOf(address).to_eth()
+    for i, (addr_label, address) in enumerate(addresses.items()):
+        OCEAN_bal = OCEAN_bals[i + 1].to_eth()
+        ROSE_bal = ROSE_bals[i + 1].to_eth()
 
         logger.info("%s: %.2f OCEAN, %.2f ROSE", addr_label, OCEAN_bal, ROSE_bal)
 
@@ -43,7 +49,7 @@ def topup_main(ppss: PPSS):
         topup_bal = topup_ss.get_topup_bal(OCEAN, addr_label)
 
         OCEAN_transferred, failed_OCEAN = do_transfer(
-            OCEAN, address, owner, owner_OCEAN_bal, min_bal, topup_bal
+            OCEAN, address, owner, owner_OCEAN_bal, min_bal, topup_bal, OCEAN_bal
         )
 
         owner_OCEAN_bal = owner_OCEAN_bal - OCEAN_transferred
@@ -52,7 +58,7 @@ def topup_main(ppss: PPSS):
         topup_bal = topup_ss.get_topup_bal(ROSE, addr_label)
 
         ROSE_transferred, failed_ROSE = do_transfer(
-            ROSE, address, owner, owner_ROSE_bal, min_bal, topup_bal
+            ROSE, address, owner, owner_ROSE_bal, min_bal, topup_bal, ROSE_bal
         )
 
         owner_ROSE_bal = owner_ROSE_bal - ROSE_transferred
@@ -66,10 +72,17 @@ def topup_main(ppss: PPSS):
     sys.exit(0)
 
 
+# pylint: disable=too-many-positional-arguments
 def do_transfer(
-    token, address, owner, owner_bal, min_bal: Eth, topup_bal: Eth
+    token,
+    address,
+    owner,
+    owner_bal,
+    min_bal: Eth,
+    topup_bal: Eth,
+    bal: Eth,
 ) -> Tuple[Eth, bool]:
-    bal = token.balanceOf(address).to_eth()
+    """Top up address's balance in token, if its balance 'bal' < min_bal"""
 
     symbol = "ROSE" if token.name == "ROSE" else "OCEAN"
 
@@ -1,7 +1,8 @@
 import logging
+import threading
 import time
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from enforce_typing import enforce_types
 from eth_account.signers.local import LocalAccount
@@ -25,6 +26,14 @@ from pdr_backend.util.time_types import UnixTimeS
 _KEYS = KeyAPI(NativeECCBackend)
 logger = logging.getLogger("web3_config")
 
+AUTH_VALID_S = 3600  # signed auth is valid this long after its head block
+AUTH_EXPIRY_MARGIN_S = 60  # stop using a cached auth this long before expiry
+AUTH_REFRESH_AHEAD_S = 300  # re-sign in the background this long before expiry
+
+# guards the auth caches of all Web3Config objects. A module-level lock,
+# since a Web3Config gets deepcopied and locks can't be
+_AUTH_LOCK = threading.Lock()
+
 
 @enforce_types
 class Web3Config:
@@ -41,6 +50,10 @@ class Web3Config:
             )
             self.w3.middleware_onion.add(http_retry_request_middleware)
 
+        # owner : (auth, its validUntil, as a unix time in s)
+        self._auth_cache: Dict[str, Tuple[dict, float]] = {}
+        self._auth_refreshing: bool = False
+
     def copy_with_pk(self, pk: str):
         return Web3Config(self.rpc_url, pk)
 
@@ -60,15 +73,73 @@ class Web3Config:
                 return self.get_block(block, full_transactions, tries + 1)
             raise Exception("Couldn't get block") from e
 
-    def get_auth_signature(self):
+    def get_auth_signature(self) -> dict:
         """
         @description
-          Digitally sign
+          Digitally sign, for read calls that need auth.
+
+          The signed auth is cached per owner, and reused until
+          AUTH_EXPIRY_MARGIN_S before its validUntil. Once it's within
+          AUTH_REFRESH_AHEAD_S of that, it's re-signed in a background
+          thread while the cached one is still handed out. So in steady
+          state this makes no RPC calls.
 
         @return
           auth -- dict with keys "userAddress", "v", "r", "s", "validUntil"
         """
-        valid_until = self.get_block("latest").timestamp + 3600
+        owner = self.owner
+        now = time.time()
+        with _AUTH_LOCK:
+            cached = self._auth_cache.get(owner)
+            if cached is not None:
+                auth, expires_at = cached
+                s_left = expires_at - now
+                if s_left > AUTH_EXPIRY_MARGIN_S:
+                    if s_left <= AUTH_REFRESH_AHEAD_S and not self._auth_refreshing:
+                        self._auth_refreshing = True
+                        threading.Thread(
+                            target=self._refresh_auth_signature,
+                            name="auth-refresh",
+                            daemon=True,
+                        ).start()
+                    return dict(auth)
+
+        auth = self._sign_auth_and_cache()
+        return dict(auth)
+
+    def _refresh_auth_signature(self):
+        """Re-sign the auth ahead of expiry. Runs in a background thread"""
+        try:
+            self._sign_auth_and_cache()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # the next get_auth_signature() re-signs in the foreground
+            logger.warning("Couldn't refresh auth signature, error: {%s}", e)
+        finally:
+            with _AUTH_LOCK:
+                self._auth_refreshing = False
+
+    def _sign_auth_and_cache(self) -> dict:
+        """Sign a fresh auth, cache it for self.owner, and return it"""
+        owner = self.owner
+        # validUntil is in chain time, which tracks local time closely
+        # enough. Using it as-is means a stale head block can't make us
+        # think the auth is valid for longer than it is
+        auth, valid_until = self._sign_auth()
+        expires_at = float(valid_until)
+        with _AUTH_LOCK:
+            self._auth_cache[owner] = (auth, expires_at)
+        return auth
+
+    def _sign_auth(self) -> Tuple[dict, int]:
+        """
+        @description
+          Sign an auth that's valid for AUTH_VALID_S past the head block
+
+        @return
+          auth -- dict with keys "userAddress", "v", "r", "s", "validUntil"
+          valid_until -- the auth's validUntil, as a unix time in s
+        """
+        valid_until = self.get_block("latest")["timestamp"] + AUTH_VALID_S
         message_hash = self.w3.solidity_keccak(
             ["address", "uint256"],
             [self.owner, valid_until],
@@ -90,7 +161,7 @@ class Web3Config:
             "s": self.w3.to_hex(self.w3.to_bytes(signed.s).rjust(32, b"\0")),
             "validUntil": valid_until,
         }
-        return auth
+        return auth, valid_until
 
     @property
     def is_sapphire(self):
@@ -13,7 +13,7 @@ from pdr_backend.util.web3_config import Web3Config
 
 @patch("pdr_backend.trueval.trueval_agent.wait_until_subgraph_syncs")
 @patch("pdr_backend.trueval.trueval_agent.time.sleep")
-@patch("pdr_backend.trueval.trueval_agent.TruevalAgent.process_trueval_slot")
+@patch("pdr_backend.trueval.trueval_agent.TruevalAgent.process_trueval_slots")
 def test_trueval_batch(
     mock_wait_until_subgraph_syncs, mock_time_sleep, mock_process, caplog
 ):
@@ -53,7 +53,8 @@ def test_trueval_batch(
         "pdr_backend.trueval.trueval_agent.PredictoorBatcher",
         return_value=mock_predictoor_batcher,
     ), patch(
-        "pdr_backend.trueval.trueval_agent.TruevalAgent.process_trueval_slot"
+        "pdr_backend.trueval.trueval_agent.TruevalAgent.process_trueval_slots",
+        side_effect=lambda slots: [slot.set_trueval(True) for slot in slots],
     ), patch(
         "pdr_backend.trueval.trueval_agent.TruevalAgent.batch_submit_truevals",
         return_value="0xbatch_submit_tx",